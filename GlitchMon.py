@@ -1,21 +1,34 @@
 """
 Class for a glitch pokemon object with its stats and methods
 Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
-Last Modified: 29.04.2022
+Last Modified: 17.10.2026
 """
 from pokemon_base import PokemonBase
-from random import randint
+import random
 
 
 class GlitchMon(PokemonBase):
-    def __init__(self, hp: int, poke_type: str) -> None:
+    SUPERPOWER_CHANCE = 25
+    # Codes of the last superpower result
+    SUPERPOWER_NONE = 0  # Superpower hasn't been rolled
+    SUPERPOWER_FAILED = 1
+    SUPERPOWER_LEVEL = 2
+    SUPERPOWER_HP = 3
+    SUPERPOWER_HP_AND_LEVEL = 4
+    __slots__ = ("rng", "last_superpower")
+
+    def __init__(self, hp: int, poke_type: str, rng=None) -> None:
         """
         Constructor for GlitchMon class
         :param hp: An integer of GlitchMon's HP value
         :param poke_type: A string of GlitchMon's pokemon type
+        :param rng: An object with a randint(a, b) method, such as a RandomStream, used for every random roll of
+                    this pokemon. The random module is used if None
         :complexity: Best and worst is O(1) as local variables are initialised
         """
         PokemonBase.__init__(self, hp, poke_type)
+        self.rng = random if rng is None else rng
+        self.last_superpower = GlitchMon.SUPERPOWER_NONE  # Code of the last superpower result, for battle logs
 
     def increase_health(self, health: int) -> None:
         """
@@ -40,30 +53,34 @@ class GlitchMon(PokemonBase):
 
     def superpower(self) -> str:
         """
-        Decides whether pokemon benefits from its superpower
+        Decides whether pokemon benefits from its superpower, keeping the code of the result in last_superpower
         :return: A string description of gained benefits
         :complexity: Best and worst is O(1) as it randomises, selects an effect then increases a level, hp or not
         """
-        if randint(1, 100) <= 25:
+        if self.rng.randint(1, 100) <= GlitchMon.SUPERPOWER_CHANCE:
             # Check if this pokemon benefits from its superpower.
             # Generate value between 1 and 100, if less or equal to 25. This pokemon will benefit from its superpower.
-            effect = randint(0, 2)
+            effect = self.rng.randint(0, 2)
             # Generate a random number between 0 and 2.
             # Utilized in deciding the effect the pokemon will benefit from.
             if effect == 0:
                 # If generated value is 0, pokemon will benefit from an increase in its level by 1.
                 self.set_level(self.get_level() + 1)
+                self.last_superpower = GlitchMon.SUPERPOWER_LEVEL
                 result = "It leveled up"
             elif effect == 1:
                 # If generated value is 1, pokemon will benefit from an increase in its hp by 1.
                 self.increase_health(1)
+                self.last_superpower = GlitchMon.SUPERPOWER_HP
                 result = "It gained 1 HP"
             else:
                 # Else, for any other value, pokemon will benefit from an increase in its level and hp by 1.
                 self.increase_health(1)
                 self.set_level(self.get_level() + 1)
+                self.last_superpower = GlitchMon.SUPERPOWER_HP_AND_LEVEL
                 result = "It gained 1 HP and leveled up"
             return result # A string description of gained benefits
         else:
             # If pokemon did not benefit from its superpower.
+            self.last_superpower = GlitchMon.SUPERPOWER_FAILED
             return "Superpower not achieved" # A string description of the pokemon's failure to utilize superpower.
@@ -1,28 +1,41 @@
 """
 Class for a MissingNo object with its stats and methods from the GlitchMon and PokeBase classes
 Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
-Last Modified: 29.04.2022
+Last Modified: 17.10.2026
 """
 from GlitchMon import GlitchMon
 from pokemon_base import PokemonBase
-from random import randint
 
-dsdsdsdsdsds #gaysdsdsdsdsdsdsds
+
 class MissingNo(GlitchMon):
     NAME = "MissingNo"
+    SPECIES_ID = 3
+    HP = (7 + 9 + 8) // 3  # Average hp of Charmander, Bulbasaur and Squirtle
+    __slots__ = ("attack", "defence", "speed", "battled")
 
-    def __init__(self):
+    def __init__(self, rng=None):
         """
         Constructor for MissingNo class
+        :param rng: An object with a randint(a, b) method used for every random roll, the random module if None
         :complexity: Best and worst is O(1) as local variables are initialised
         """
         # values of hp, attack, defence and speed derieves from the average of the 3 classes, Charmander, Squirtle, Bulbasaur.
-        GlitchMon.__init__(self, (7+9+8)//3, "None")
+        GlitchMon.__init__(self, MissingNo.HP, "None", rng)
         self.attack = int((6 + self.get_level() + 5 + 4 + self.get_level() // 2) / 3)
         self.defence = int((4 + 5 + 6 + self.get_level()) / 3)
         self.speed = int((7 + self.get_level() + 7 + 7 + self.get_level() // 2) / 3)
         self.battled = False
 
+    def reset(self) -> None:
+        """
+        Restores the pokemon's base hp, level and battled status, as it was constructed.
+        Attack, defence and speed are only worked out from the level when constructed, so they are kept
+        :complexity: Best and worst is O(1) following PokemonBase.reset()
+        """
+        PokemonBase.reset(self)
+        self.battled = False
+        self.last_superpower = GlitchMon.SUPERPOWER_NONE
+
     def get_name(self) -> str:
         """
         Returns the pokemon's name
@@ -100,7 +113,7 @@ class MissingNo(GlitchMon):
             raise ValueError("Damage cannot be a negative value")
         else:
             # If all checks passed.
-            chance = randint(0,2)
+            chance = self.rng.randint(0,2)
             # Generate random num between 0 to 2 inclusive.
             # Utilised in deciding the defence scenario in which this MissingNo object will utilise for its current battle.
             if chance == 0:
@@ -0,0 +1,156 @@
+"""
+    Array-based implementation of SortedList ADT.
+    Items to store should be of type ListItem.
+"""
+
+from referential_array import ArrayR
+from sorted_list import *
+
+__author__ = 'Maria Garcia de la Banda and Brendon Taylor. Modified by Alexey Ignatiev'
+__docformat__ = 'reStructuredText'
+
+
+class ArraySortedList(SortedList[T]):
+    """ SortedList ADT implemented with arrays. Items are kept in ascending order of their keys. """
+    MIN_CAPACITY = 1
+
+    def __init__(self, max_capacity: int) -> None:
+        """ ArraySortedList object initialiser. """
+
+        # first, calling the basic initialiser
+        SortedList.__init__(self)
+
+        # initialising the internal array
+        size = max(self.MIN_CAPACITY, max_capacity)
+        self.array = ArrayR(size)
+
+    def reset(self):
+        """ Reset the list. """
+        SortedList.__init__(self)
+
+    def __getitem__(self, index: int) -> T:
+        """ Magic method. Return the element at a given position. """
+        return self.array[index]
+
+    def __setitem__(self, index: int, item: ListItem) -> None:
+        """ Magic method. Insert the item at a given position,
+            if possible (!). Shift the following elements to the right.
+        """
+        if self.is_empty() or \
+                (index == 0 and item.key <= self[index].key) or \
+                (index == len(self) and self[index - 1].key <= item.key) or \
+                (index > 0 and self[index - 1].key <= item.key <= self[index].key):
+
+            if self.is_full():
+                self._resize()
+
+            self._shuffle_right(index)
+            self.array[index] = item
+            self.length += 1
+        else:
+            # the list isn't empty and the item's position is wrong wrt. its neighbourghs
+            raise IndexError('Element should be inserted in sorted order')
+
+    def __contains__(self, item: ListItem):
+        """ Checks if value is in the list. """
+        for i in range(len(self)):
+            if self.array[i] == item:
+                return True
+        return False
+
+    def _shuffle_right(self, index: int) -> None:
+        """ Shuffle items to the right up to a given position. """
+        # one block copy rather than an assignment per item
+        self.array[index + 1:len(self) + 1] = self.array[index:len(self)]
+
+    def _shuffle_left(self, index: int) -> None:
+        """ Shuffle items starting at a given position to the left. """
+        self.array[index:len(self)] = self.array[index + 1:len(self) + 1]
+
+    def _resize(self) -> None:
+        """ Resize the list. """
+        # doubling the size of our list and copying the contents
+        self.array = self.array.copy(2 * len(self.array), self.length)
+
+    def delete_at_index(self, index: int) -> ListItem:
+        """ Delete item at a given position. """
+        if index >= len(self):
+            raise IndexError('No such index in the list')
+        item = self.array[index]
+        self.length -= 1
+        self._shuffle_left(index)
+        return item
+
+    def index(self, item: ListItem) -> int:
+        """ Find the position of a given item in the list. """
+        pos = self._index_to_add(item)
+        if pos < len(self) and self[pos] == item:
+            return pos
+        raise ValueError('item not in list')
+
+    def is_full(self):
+        """ Check if the list is full. """
+        return len(self) >= len(self.array)
+
+    def add(self, item: ListItem) -> None:
+        """ Add new element to the list. """
+        if self.is_full():
+            self._resize()
+
+        # find where to place it
+        position = self._index_to_add(item)
+
+        self[position] = item
+
+    def _index_to_add(self, item: ListItem) -> int:
+        """ Find the position where the new item should be placed. """
+        low = 0
+        high = len(self) - 1
+
+        while low <= high:
+            mid = (low + high) // 2
+            if self[mid].key < item.key:
+                low = mid + 1
+            elif self[mid].key > item.key:
+                high = mid - 1
+            else:
+                return mid
+
+        return low
+
+    # self added
+    def modified_add(self, item: ListItem) -> None:
+        """
+        Adds an item to the list, placing it before every item that has the same key.
+        As items are withdrawn from the back of the list, an item added later is withdrawn after the items
+        that already share its key.
+        :param item: A ListItem to be added to the list
+        :complexity: Best is O(log N) when the item is added to the back with a unique key.
+                     Worst is O(N), where N is len(self), when the key is not unique and the search has to loop
+                     through the items sharing the key, or when the item is added at the first position
+        """
+        if self.is_full():
+            self._resize()
+
+        # find where to place it, then move in front of the items with the same key
+        position = self._index_to_add(item)
+        while position > 0 and self[position - 1].key == item.key:
+            position -= 1
+
+        self._shuffle_right(position)
+        self.array[position] = item
+        self.length += 1
+
+    # self added
+    def withdraw(self) -> ListItem:
+        """
+        Removes and returns the item with the largest key.
+        Out of the items sharing the largest key, the one that has been in the list the longest is returned.
+        :return: The ListItem with the largest key
+        :raises Exception: If the list is empty
+        :complexity: Best and worst is O(1) as the item is taken from the back of the list
+        """
+        if self.is_empty():
+            raise Exception("List is empty")
+        self.length -= 1
+        return self.array[self.length]
@@ -0,0 +1,149 @@
+"""
+Class where many battles between 2 fixed team compositions are run back to back without user input
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from battle import Battle
+from poke_team import PokeTeam
+from pokemon_pool import PokemonPool
+from time import perf_counter
+
+
+class BattleRecord:
+    def __init__(self, winner: str, exchanges: int, team1_remaining: int, team2_remaining: int) -> None:
+        """
+        Constructor for BattleRecord, the result of a single battle in a batch
+        :param winner: A string of the winner's name, or "Draw"
+        :param exchanges: An integer of how many times 2 pokemons were sent out against each other
+        :param team1_remaining: An integer of how many pokemons are left in team 1 after the battle
+        :param team2_remaining: An integer of how many pokemons are left in team 2 after the battle
+        :complexity: Best and worst is O(1) as local variables are initialised
+        """
+        self.winner = winner
+        self.exchanges = exchanges
+        self.team1_remaining = team1_remaining
+        self.team2_remaining = team2_remaining
+
+    def __str__(self) -> str:
+        """
+        Returns the battle record
+        :return: A string of the winner, exchanges and remaining pokemons of both teams
+        :complexity: Best and worst is O(1) as it returns the record in string format
+        """
+        return "Winner = {} after {} exchanges ({} vs {} remaining)".format(
+            self.winner, self.exchanges, self.team1_remaining, self.team2_remaining)
+
+
+class BatchResult:
+    def __init__(self, records: list, elapsed: float) -> None:
+        """
+        Constructor for BatchResult, the results of all battles in a batch
+        :param records: A list of BattleRecord, one per battle in the order they were run
+        :param elapsed: A float of the seconds taken to run the batch
+        :complexity: Best and worst is O(len(records)) as every winner is tallied
+        """
+        self.records = records
+        self.elapsed = elapsed
+        self.wins = {}
+        for record in records:
+            # Tally the number of wins of each trainer, draws are tallied under "Draw"
+            self.wins[record.winner] = self.wins.get(record.winner, 0) + 1
+
+    def __len__(self) -> int:
+        """
+        Returns the number of battles in the batch
+        :return: An integer of the number of battles
+        :complexity: Best and worst is O(1)
+        """
+        return len(self.records)
+
+    def get_wins(self, winner: str) -> int:
+        """
+        Returns how many battles were won by the passed trainer
+        :param winner: A string of a trainer's name, or "Draw"
+        :return: An integer of the number of battles won
+        :complexity: Best and worst is O(1) as it looks up the tally
+        """
+        return self.wins.get(winner, 0)
+
+    def throughput(self) -> float:
+        """
+        Returns the number of battles run per second
+        :return: A float of the battles per second
+        :complexity: Best and worst is O(1)
+        """
+        if self.elapsed <= 0:
+            return float("inf")
+        return len(self) / self.elapsed
+
+
+class BatchBattle:
+    def __init__(self, trainer_one_name: str, trainer_two_name: str, trusted: bool = False, rng=None) -> None:
+        """
+        Constructor for BatchBattle
+        :param trainer_one_name: A string of the trainer's name
+        :param trainer_two_name: A string of the trainer's name
+        :param trusted: A boolean of whether the battles are run in trusted mode, see Battle
+        :param rng: An object with a randint(a, b) method, such as a RandomStream, shared by every battle of the batch.
+                    The random module is used if None
+        :raises TypeError: If both inputs aren't string
+        :complexity: Best and worst is O(1) as local variables are initialised
+        """
+        if type(trainer_one_name) != str:
+            raise TypeError("Trainer 1's name must be a string")
+        elif type(trainer_two_name) != str:
+            raise TypeError("Trainer 2's name must be a string")
+        else:
+            self.trainer_one_name = trainer_one_name
+            self.trainer_two_name = trainer_two_name
+            self.trusted = trusted
+            self.rng = rng
+            self.pool = PokemonPool()  # Shared by every battle this batch runs
+
+    def run(self, battle_mode: int, team1_head_count: list, team2_head_count: list, battles: int = 1,
+            criterion_team1: str = None, criterion_team2: str = None) -> BatchResult:
+        """
+        Runs a number of battles back to back between 2 team compositions, with teams reassigned for every battle
+        from pokemons recycled through the batch's PokemonPool
+        :param battle_mode: An integer that determines the type of battle
+        :param team1_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+                                 for team 1
+        :param team2_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+                                 for team 2
+        :param battles: An integer of how many battles to run
+        :param criterion_team1: A string of the criterion chosen for team 1, only used when battle mode is 2
+        :param criterion_team2: A string of the criterion chosen for team 2, only used when battle mode is 2
+        :return: A BatchResult with a BattleRecord for every battle
+        :raises TypeError: If battles isn't an integer
+        :raises ValueError: If battles is lesser than or equal to 0,
+                            or if either teams' head count isn't a valid team
+        :complexity: Best and worst is O(battles * B), where B is the complexity of Battle.headless_battle()
+        """
+        if type(battles) != int:
+            raise TypeError("Number of battles must be an integer")
+        elif battles <= 0:
+            raise ValueError("Number of battles must be above 0")
+        # Both compositions are checked once for the whole batch instead of failing on the first battle
+        elif not PokeTeam(self.trainer_one_name).is_valid_head_count(team1_head_count):
+            raise ValueError("Team 1's input is invalid")
+        elif not PokeTeam(self.trainer_two_name).is_valid_head_count(team2_head_count):
+            raise ValueError("Team 2's input is invalid")
+        else:
+            records = []
+            start = perf_counter()
+            # One battle is reset and fought again, with both teams recycling their pokemons and containers
+            battle = Battle(self.trainer_one_name, self.trainer_two_name, self.trusted, self.rng, self.pool)
+            for i in range(battles):
+                battle.reset()
+                winner = battle.headless_battle(battle_mode, team1_head_count, team2_head_count,
+                                                criterion_team1, criterion_team2)
+                records.append(BattleRecord(winner, battle.exchanges,
+                                            len(battle.team1.team), len(battle.team2.team)))
+            return BatchResult(records, perf_counter() - start)
+
+
+if __name__ == '__main__':
+    batch = BatchBattle("Ash", "Gary")
+    for mode in range(3):
+        result = batch.run(mode, [2, 2, 1, 1], [1, 2, 3], 10000, "lvl", "spd")
+        print("Mode {}: {:.0f} battles/s, wins = {}".format(mode, result.throughput(), result.wins))
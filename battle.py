@@ -1,10 +1,15 @@
 """
 Class where the battle between pokemons commence and a winner is selected
 Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
-Last Modified: 30.04.2022
+Last Modified: 17.10.2026
 """
 from pokemon_base import PokemonBase
 from poke_team import PokeTeam
+from pokemon_pool import PokemonPool
+from battle_log import BattleLog
+from profiler import BattleProfiler
+from observer import BattleObserver, BattleDispatcher
+from matchup_cache import MatchupCache
 from sorted_list import ListItem
 from array_sorted_list import ArraySortedList
 from pokemon import Charmander, Bulbasaur, Squirtle
@@ -14,12 +19,34 @@ T = TypeVar('T', Charmander, Bulbasaur, Squirtle, MissingNo, PokeTeam, PokemonBa
 
 
 class Battle:
-    def __init__(self, trainer_one_name: str, trainer_two_name: str) -> None:
+    CRITERION_LIST = ["lvl", "hp", "atk", "def", "spd"]
+
+    def __init__(self, trainer_one_name: str, trainer_two_name: str, trusted: bool = False, rng=None,
+                 pool: PokemonPool = None, log: BattleLog = None, profiler: BattleProfiler = None,
+                 cache: MatchupCache = None, team_limit: int = PokeTeam.LIMIT) -> None:
         """
         Constructor for battle class
         :param trainer_one_name: A string of the trainer's name
         :param trainer_two_name: A string of the trainer's name
-        :raises TypeError: If both inputs aren't string
+        :param trusted: A boolean of whether the teams are validated once when the fight starts, after which
+                        the unchecked versions of compare_speed(), match(), match_same_speed(), returning() and the
+                        methods they call are used. Battle mode 2 keys are then only updated by the pokemons'
+                        on_change hooks
+        :param rng: An object with a randint(a, b) method, such as a RandomStream, owned by this battle and used for
+                    every MissingNo roll. The random module is used if None
+        :param pool: A PokemonPool both teams take their pokemons from, so the battle can be reset and fought again
+                     without constructing new pokemons. Pokemons are constructed for every team if None
+        :param log: A BattleLog every exchange fought is appended to, nothing is logged if None
+        :param profiler: A BattleProfiler timing the phases of every fight, nothing is timed if None. It can be
+                         attached or detached later with BattleProfiler.attach() and detach()
+        :param cache: A MatchupCache the result of every battle fought with battling() or headless_battle() is
+                      stored in, for MatchupCache.lookup() and play() to answer without fighting. Nothing is stored
+                      if None
+        :param team_limit: An integer of the maximum number of pokemons in each team, PokeTeam.LIMIT by default.
+                           Battle mode 2 teams of at least PokeTeam.HEAP_MIN_SIZE pokemons are kept in a
+                           HeapSortedList
+        :raises TypeError: If both names aren't string, trusted isn't a boolean or team_limit isn't an integer
+        :raises ValueError: If team_limit is lesser than or equal to 0
         :complexity: Best and worst is O(1) as local variables are initialised
         """
         # Checks if both inputs are string or not
@@ -27,16 +54,103 @@ class Battle:
             raise TypeError("Trainer 1's name must be a string")
         elif type(trainer_two_name) != str:
             raise TypeError("Trainer 2's name must be a string")
+        elif type(trusted) != bool:
+            raise TypeError("Trusted must be a boolean")
         else:
-            self.team1 = PokeTeam(trainer_one_name)  # Creates a Pokemon Team object for Trainer One
-            self.team2 = PokeTeam(trainer_two_name)  # Creates a Pokemon Team object for Trainer Two
-            self.battle_mode = None
-            self.pokemon1 = None
-            self.pokemon2 = None
-            self.criterion_team1 = None
-            self.criterion_team2 = None
-            self.missingno1 = None
-            self.missingno2 = None
+            self.trusted = trusted
+            self.rng = rng
+            self.log = log
+            self.cache = cache
+            self.team1 = PokeTeam(trainer_one_name, rng, pool, team_limit)  # Creates a Pokemon Team object for Trainer One
+            self.team2 = PokeTeam(trainer_two_name, rng, pool, team_limit)  # Creates a Pokemon Team object for Trainer Two
+            self.hooks = []  # Objects wrapping the methods of this battle and its teams, innermost first
+            self.hooked = []  # The (object, method name) pairs of the wrappers the hooks have set
+            self.dispatcher = None  # Fires the events of every exchange to the observers subscribed, if there are any
+            self.profiler = None
+            if log is not None:
+                # The log observes the battle to record the damage of every attack
+                self.subscribe(log)
+            if profiler is not None:
+                profiler.attach(self)
+            self.reset()
+
+    def reset(self) -> None:
+        """
+        Clears the state of the last fight so the battle can be set up and fought again.
+        Both teams keep their pokemons until they are assigned again, when pooled pokemons are released
+        :complexity: Best and worst is O(1) as local variables are initialised
+        """
+        self.battle_mode = None
+        self.pokemon1 = None
+        self.pokemon2 = None
+        self.criterion_team1 = None
+        self.criterion_team2 = None
+        self.missingno1 = None
+        self.missingno2 = None
+        self.exchanges = 0
+
+    def subscribe(self, observer: BattleObserver) -> None:
+        """
+        Subscribes an observer to the events of every exchange fought from now on
+        :param observer: A BattleObserver, whose callbacks are called in the order the observers subscribed
+        :raises TypeError: If the observer isn't a BattleObserver
+        :complexity: Best and worst is O(1)
+        """
+        if not isinstance(observer, BattleObserver):
+            raise TypeError("Observer must be a BattleObserver")
+        if self.dispatcher is None:
+            # The exchange methods are only wrapped while there are observers, so unobserved battles don't pay for it
+            self.dispatcher = BattleDispatcher(self)
+            self.add_hook(self.dispatcher)
+        self.dispatcher.observers.append(observer)
+
+    def unsubscribe(self, observer: BattleObserver) -> None:
+        """
+        Stops calling an observer's callbacks
+        :param observer: A BattleObserver that is subscribed
+        :raises ValueError: If the observer isn't subscribed
+        :complexity: Best and worst is O(S), where S is the number of observers
+        """
+        if self.dispatcher is None or observer not in self.dispatcher.observers:
+            raise ValueError("Observer isn't subscribed")
+        self.dispatcher.observers.remove(observer)
+        if not self.dispatcher.observers:
+            self.remove_hook(self.dispatcher)
+            self.dispatcher = None
+
+    def add_hook(self, hook) -> None:
+        """
+        Adds a hook wrapping the methods of this battle and its teams, such as a BattleProfiler or BattleDispatcher.
+        Hooks are the only way methods are wrapped on a battle, so any of them can be removed in any order
+        :param hook: An object with an install(battle) method, which sets its wrappers on the battle and its teams on
+                     top of the methods they have and returns a list of the (object, method name) pairs it has set
+        :complexity: Best and worst is O(H * M), where H is the number of hooks and M the number of methods each sets
+        """
+        self.hooks.append(hook)  # Goes over every other hook
+        self.install_hooks()
+
+    def remove_hook(self, hook) -> None:
+        """
+        Removes a hook, keeping the wrappers of every other hook
+        :param hook: An object added with add_hook()
+        :raises ValueError: If the hook wasn't added
+        :complexity: Best and worst is O(H * M), where H is the number of hooks and M the number of methods each sets
+        """
+        self.hooks.remove(hook)
+        self.install_hooks()
+
+    def install_hooks(self) -> None:
+        """
+        Sets the wrappers of every hook again from the class's methods, innermost first, so each wraps those of the
+        hooks under it
+        :complexity: Best and worst is O(H * M), where H is the number of hooks and M the number of methods each sets
+        """
+        for owner, method in self.hooked:
+            if method in owner.__dict__:
+                delattr(owner, method)
+        self.hooked = []
+        for hook in self.hooks:
+            self.hooked.extend(hook.install(self))
 
     def set_mode_battle(self) -> str:
         """
@@ -84,16 +198,78 @@ class Battle:
             raise TypeError("Team 2's criterion must be a string")
         else:
             self.battle_mode = 2  # Sets battle mode to 1
-            criterion_list = ["lvl", "hp", "atk", "def", "spd"]
 
             # Checks whether input criterion for both teams are one of those in the list
-            if criterion_team1 in criterion_list and criterion_team2 in criterion_list:
+            if criterion_team1 in Battle.CRITERION_LIST and criterion_team2 in Battle.CRITERION_LIST:
                 self.criterion_team1 = criterion_team1  # If yes assign both to the object's variables
                 self.criterion_team2 = criterion_team2
                 return self.battling()  # Start the battle between the 2 trainers
             else:
                 raise ValueError("Input criterion(s) is/are invalid. Choose lvl, hp, atk, def or spd")
 
+    def headless_battle(self, battle_mode: int, team1_head_count: list, team2_head_count: list,
+                        criterion_team1: str = None, criterion_team2: str = None) -> str:
+        """
+        Sets the battle mode and both teams from the passed head counts with set_up(), then have the 2 pokemon teams
+        battle without asking for user input
+        :param battle_mode: An integer that determines the type of battle
+        :param team1_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+                                 for team 1
+        :param team2_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+                                 for team 2
+        :param criterion_team1: A string of the criterion chosen for team 1, only used when battle mode is 2
+        :param criterion_team2: A string of the criterion chosen for team 2, only used when battle mode is 2
+        :return: A string of the winner's name
+        :raises TypeError: If battle_mode isn't an integer
+        :raises ValueError: If battle_mode isn't 0, 1 or 2,
+                            or if either teams' head count isn't a valid team,
+                            or if battle mode is 2 and one/ both of the teams' criterion(s) isn't/ aren't lvl, hp,
+                            atk, def or spd
+        :complexity: Best is O(min(len(self.team1.team), len(self.team2.team)).
+                     Worst is O((len(self.team1.team) + len(self.team2.team)) * N^2), following the fight() method
+        """
+        self.set_up(battle_mode, team1_head_count, team2_head_count, criterion_team1, criterion_team2)
+        winner = self.fight()  # Start the battle between the 2 trainers
+        if self.cache is not None:
+            self.cache.record(self)
+        return winner
+
+    def set_up(self, battle_mode: int, team1_head_count: list, team2_head_count: list,
+               criterion_team1: str = None, criterion_team2: str = None) -> None:
+        """
+        Sets the battle mode and both teams from the passed head counts without asking for user input, ready to
+        fight() or to be fought one exchange at a time
+        :param battle_mode: An integer that determines the type of battle
+        :param team1_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+                                 for team 1
+        :param team2_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+                                 for team 2
+        :param criterion_team1: A string of the criterion chosen for team 1, only used when battle mode is 2
+        :param criterion_team2: A string of the criterion chosen for team 2, only used when battle mode is 2
+        :raises TypeError: If battle_mode isn't an integer
+        :raises ValueError: If battle_mode isn't 0, 1 or 2,
+                            or if either teams' head count isn't a valid team,
+                            or if battle mode is 2 and one/ both of the teams' criterion(s) isn't/ aren't lvl, hp,
+                            atk, def or spd
+        :complexity: Best and worst is O(len(self.team1.team) + len(self.team2.team)) to assign both teams
+        """
+        if type(battle_mode) != int:
+            raise TypeError("Battle mode input must be an integer")
+        elif not 0 <= battle_mode <= 2:
+            raise ValueError("Battle mode input must be 0, 1 or 2")
+        elif battle_mode == 2 and not (criterion_team1 in Battle.CRITERION_LIST and
+                                       criterion_team2 in Battle.CRITERION_LIST):
+            raise ValueError("Input criterion(s) is/are invalid. Choose lvl, hp, atk, def or spd")
+        else:
+            self.battle_mode = battle_mode
+            if battle_mode == 2:
+                # Criterions are only kept for the optimised mode, as in optimised_mode_battle()
+                self.criterion_team1 = criterion_team1
+                self.criterion_team2 = criterion_team2
+            # Assign the teams for both trainers from the passed head counts
+            self.team1.set_team(self.battle_mode, team1_head_count, self.criterion_team1)
+            self.team2.set_team(self.battle_mode, team2_head_count, self.criterion_team2)
+
     def battling(self) -> str:
         """
         Allows user to input pokemon teams for both trainers and battle it out
@@ -113,57 +289,129 @@ class Battle:
         print("For", self.team2.trainer)
         # Allow user input to choose and assign the team for Trainer Two
         self.team2.choose_team(self.battle_mode, self.criterion_team2)
+        winner = self.fight()  # Start the battle between the 2 trainers
+        if self.cache is not None:
+            self.cache.record(self)
+        return winner
 
+    def fight(self) -> str:
+        """
+        Battles the 2 assigned pokemon teams until one or both of them are empty
+        :return: A string of the winner's name
+        :raises ValueError: If battle mode set wasn't 0, 1 or 2,
+                            or if winner's name is not one of the trainers
+        :pre: both teams have been assigned
+        :complexity: Best is O(min(len(self.team1.team), len(self.team2.team)). When 1 team has all its pokemon fainted,
+                     it returns the winner which is the other team. So it loops until 1 team is empty.
+                     Worst is O((len(self.team1.team) + len(self.team2.team)) * N^2), where N is len(self) and
+                     if it's an array sorted list.
+        """
+        self.exchanges = 0
+        compare_speed = self.start_fight()
         # If one of the team is empty, loop out and proceed to the next code block.
-        # Otherwise continue looping until one team is empty
-        while not(self.team1.team.is_empty() or self.team2.team.is_empty()):
-            round_finished = False
-            # If round_finished is set to True, it goes back and checks whether if one of the team is empty to prepare
-            # the battle between 2 other pokemons
-            # If it's False, it means neither pokemons battling has fainted. So both return back to their respective
-            # teams and allow the next battle to commence
-            while not round_finished:
-                self.pokemon1 = self.team1.get_pokemon(self.battle_mode)  # Choose the pokemon ready for battle from Trainer One's team
-                self.pokemon2 = self.team2.get_pokemon(self.battle_mode)  # Choose the pokemon ready for battle from Trainer Two's team
-
-                # Checks which battle mode to determine how the battling style would occur
-                if self.battle_mode == 0:
-                    round_finished = self.compare_speed(self.pokemon1, self.pokemon2)  # Enters battle between the 2 chosen pokemons
-                elif self.battle_mode == 1:
-                    round_finished = self.compare_speed(self.pokemon1, self.pokemon2)  # Enters battle between the 2 chosen pokemons
-                elif self.battle_mode == 2:
-                    cond1 = isinstance(self.pokemon1.value, MissingNo) and not (self.pokemon1.value.has_battled() or self.team1.team.is_empty())
-                    cond2 = isinstance(self.pokemon2.value, MissingNo) and not (self.pokemon2.value.has_battled() or self.team2.team.is_empty())
-                    # Checks whether is chosen pokemon from Trainer One's team a MissingNo that hasn't battled
-                    # If it has battled, in an empty team or is not a MissingNo, goto the else
-                    if cond1:
-                        # If it is, place the MissingNo into another Array Sorted List and return the other pokemon
-                        # back into Trainer Two's team
-                        self.missingno1 = self.get_missingno(self.pokemon1.value, self.team1)
-                        self.returning(self.pokemon2.value, 2)
-                    # Checks whether is chosen pokemon from Trainer Two's team a MissingNo that hasn't battled
-                    # If it has battled, in an empty team or is not a MissingNo, goto the else
-                    elif cond2:
-                        # If it is, place the MissingNo into another Array Sorted List and return the other pokemon
-                        # back into Trainer One's team
-                        self.missingno2 = self.get_missingno(self.pokemon2.value, self.team2)
-                        self.returning(self.pokemon1.value, 1)
-                    # Checks whether both chosen pokemons from Trainer's One team and Trainer Two's team
-                    # are MissingNos that hadn't battled
-                    # If both has battled, in an empty team or are not a MissingNos, goto the else
-                    elif cond1 and cond2:
-                        # If both are MissingNos that hadn't battled, place both MissingNo into separate Array Sorted List
-                        self.missingno1 = self.get_missingno(self.pokemon1.value, self.team1)
-                        self.missingno2 = self.get_missingno(self.pokemon2.value, self.team2)
-                    else:
-                        # Since the pokemons chosen aren't MissingNos, set their battled status to True
-                        # This means that they have already battled
-                        self.pokemon1.value.battled = True
-                        self.pokemon2.value.battled = True
-                        round_finished = self.compare_speed(self.pokemon1.value, self.pokemon2.value) # Enters battle between the 2 chosen pokemons
+        # Otherwise continue battling until one team is empty
+        while not self.is_over():
+            self.next_exchange(compare_speed)
+        return self.get_result()
+
+    def start_fight(self):
+        """
+        Prepares the assigned teams to be fought one exchange at a time with next_exchange(), keeping the count of
+        exchanges already fought so a restored battle can carry on
+        :return: The compare_speed() method to pass to next_exchange(), the unchecked one for trusted battles and
+                 recording every exchange if the battle has a log
+        :raises TypeError: If the battle is trusted and a team isn't valid, see validate_team()
+        :raises ValueError: If the battle is trusted and a pokemon's hp or level isn't above 0
+        :complexity: Best is O(1). Worst is O(len(self.team1.team) + len(self.team2.team)) for trusted battles,
+                     as both teams are validated
+        """
+        if self.trusted:
+            # Both teams are validated once here, so the unchecked methods can be used for the rest of the fight
+            self.validate_team(self.team1)
+            self.validate_team(self.team2)
+            compare_speed = self._compare_speed
+        else:
+            compare_speed = self.compare_speed
+        if self.log is not None:
+            # Exchanges are only recorded when the battle has a log, so other battles don't pay for it
+            self.log.start_battle()
+            compare_speed = self.log.wrap(compare_speed)
+        return compare_speed
+
+    def is_over(self) -> bool:
+        """
+        Checks whether one or both teams are empty
+        :return: A True if the fight is over and False if both teams have pokemons left
+        :complexity: Best and worst is O(1)
+        """
+        return self.team1.team.is_empty() or self.team2.team.is_empty()
+
+    def next_exchange(self, compare_speed) -> bool:
+        """
+        Sends out pokemons from both teams until they fight an exchange, or a team is empty
+        :param compare_speed: The method returned by start_fight()
+        :return: A True if a pokemon has fainted in the exchange and False if neither has, or no exchange was fought
+        :raises ValueError: If battle mode set wasn't 0, 1 or 2
+        :complexity: Best is O(1). Worst is O(N) following compare_speed(), where N is len(self) and if it's an
+                     array sorted list
+        """
+        exchanges = self.exchanges
+        round_finished = False
+        # If it's False, it means neither pokemons battling has fainted, or a MissingNo was held back. So both teams
+        # still have pokemons and the next pokemons are chosen, until an exchange is fought
+        while self.exchanges == exchanges and not self.is_over():
+            self.pokemon1 = self.team1.get_pokemon(self.battle_mode)  # Choose the pokemon ready for battle from Trainer One's team
+            self.pokemon2 = self.team2.get_pokemon(self.battle_mode)  # Choose the pokemon ready for battle from Trainer Two's team
+
+            # Checks which battle mode to determine how the battling style would occur
+            if self.battle_mode == 0:
+                self.exchanges += 1
+                round_finished = compare_speed(self.pokemon1, self.pokemon2)  # Enters battle between the 2 chosen pokemons
+            elif self.battle_mode == 1:
+                self.exchanges += 1
+                round_finished = compare_speed(self.pokemon1, self.pokemon2)  # Enters battle between the 2 chosen pokemons
+            elif self.battle_mode == 2:
+                cond1 = isinstance(self.pokemon1.value, MissingNo) and not (self.pokemon1.value.has_battled() or self.team1.team.is_empty())
+                cond2 = isinstance(self.pokemon2.value, MissingNo) and not (self.pokemon2.value.has_battled() or self.team2.team.is_empty())
+                # Checks whether is chosen pokemon from Trainer One's team a MissingNo that hasn't battled
+                # If it has battled, in an empty team or is not a MissingNo, goto the else
+                if cond1:
+                    # If it is, place the MissingNo into another Array Sorted List and return the other pokemon
+                    # back into Trainer Two's team
+                    self.missingno1 = self.get_missingno(self.pokemon1.value, self.team1)
+                    self.returning(self.pokemon2.value, 2)
+                # Checks whether is chosen pokemon from Trainer Two's team a MissingNo that hasn't battled
+                # If it has battled, in an empty team or is not a MissingNo, goto the else
+                elif cond2:
+                    # If it is, place the MissingNo into another Array Sorted List and return the other pokemon
+                    # back into Trainer One's team
+                    self.missingno2 = self.get_missingno(self.pokemon2.value, self.team2)
+                    self.returning(self.pokemon1.value, 1)
+                # Checks whether both chosen pokemons from Trainer's One team and Trainer Two's team
+                # are MissingNos that hadn't battled
+                # If both has battled, in an empty team or are not a MissingNos, goto the else
+                elif cond1 and cond2:
+                    # If both are MissingNos that hadn't battled, place both MissingNo into separate Array Sorted List
+                    self.missingno1 = self.get_missingno(self.pokemon1.value, self.team1)
+                    self.missingno2 = self.get_missingno(self.pokemon2.value, self.team2)
                 else:
-                    raise ValueError("Input battle mode is invalid")
+                    # Since the pokemons chosen aren't MissingNos, set their battled status to True
+                    # This means that they have already battled
+                    self.team1.mark_battled(self.pokemon1.value)
+                    self.team2.mark_battled(self.pokemon2.value)
+                    self.exchanges += 1
+                    round_finished = compare_speed(self.pokemon1.value, self.pokemon2.value) # Enters battle between the 2 chosen pokemons
+            else:
+                raise ValueError("Input battle mode is invalid")
+        return round_finished
 
+    def get_result(self) -> str:
+        """
+        Returns the result of a fight that is over
+        :return: A string of the winner's name, or "Draw" if both teams are empty
+        :raises ValueError: If neither team is empty
+        :complexity: Best and worst is O(1)
+        """
         # If both teams are empty after the battle, it is a Draw
         if self.team1.team.is_empty() and self.team2.team.is_empty():
             battle_result = "Draw"
@@ -262,45 +510,41 @@ class Battle:
             raise ValueError("Choose 1 or 2 for team 2")
         else:
             # Slow pokemon gets attacked by the fast pokemon since it's faster
-            slow_pokemon.get_damage(fast_pokemon)
+            self.strike(fast_pokemon, slow_pokemon, faster_team, slower_team)
             # If slow pokemon faints from the attack, the fast pokemon levels up and returns to its team
             if slow_pokemon.has_fainted():
-                fast_pokemon.level_up()
-                # If battle mode is set to 2, update the pokemon's key criterion to what it is
-                self.update_criterion(fast_pokemon, faster_team)
+                # Levels up and, if battle mode is set to 2, updates the pokemon's key criterion to what it is
+                self.level_up(fast_pokemon, faster_team)
                 self.returning(fast_pokemon, faster_team)
                 return True
             else:
                 # If slow pokemon doesn't faint from the attack, it attacks the fast pokemon
-                fast_pokemon.get_damage(slow_pokemon)
+                self.strike(slow_pokemon, fast_pokemon, slower_team, faster_team)
                 # If fast pokemon faints from the attack, the slow pokemon levels up and returns to its team
                 if fast_pokemon.has_fainted():
-                    slow_pokemon.level_up()
-                    # If battle mode is set to 2, update the pokemon's key criterion to what it is
-                    self.update_criterion(slow_pokemon, slower_team)
+                    # Levels up and, if battle mode is set to 2, updates the pokemon's key criterion to what it is
+                    self.level_up(slow_pokemon, slower_team)
                     self.returning(slow_pokemon, slower_team)
                     return True
                 else:
                     # If fast pokemon doesn't faint from the attack, both pokemons lose 1 HP
-                    fast_pokemon.set_hp(fast_pokemon.get_hp() - 1)
-                    slow_pokemon.set_hp(slow_pokemon.get_hp() - 1)
+                    self.lose_hp(fast_pokemon, faster_team)
+                    self.lose_hp(slow_pokemon, slower_team)
                     # If both pokemons faint from losing HP
                     if fast_pokemon.has_fainted() and slow_pokemon.has_fainted():
                         return True
                     # If slow pokemon faints from losing HP and the fast pokemon remains alive,
                     # the fast pokemon levels up and returns to its team
                     elif slow_pokemon.has_fainted():
-                        fast_pokemon.level_up()
-                        # If battle mode is set to 2, update the pokemon's key criterion to what it is
-                        self.update_criterion(fast_pokemon, faster_team)
+                        # Levels up and, if battle mode is set to 2, updates the pokemon's key criterion to what it is
+                        self.level_up(fast_pokemon, faster_team)
                         self.returning(fast_pokemon, faster_team)
                         return True
                     # If fast pokemon faints from losing HP and the fast pokemon remains alive,
                     # the slow pokemon levels up and returns to its team
                     elif fast_pokemon.has_fainted():
-                        slow_pokemon.level_up()
-                        # If battle mode is set to 2, update the pokemon's key criterion to what it is
-                        self.update_criterion(slow_pokemon, slower_team)
+                        # Levels up and, if battle mode is set to 2, updates the pokemon's key criterion to what it is
+                        self.level_up(slow_pokemon, slower_team)
                         self.returning(slow_pokemon, slower_team)
                         return True
                     # If neither faints from losing HP, they return to their respective teams
@@ -349,48 +593,44 @@ class Battle:
             raise ValueError("Choose 1 or 2 for team 2")
         else:
             # Both pokemons deal damage to each other as both have same speed
-            pokemon_1.get_damage(pokemon_2)
-            pokemon_2.get_damage(pokemon_1)
+            self.strike(pokemon_2, pokemon_1, team_2, team_1)
+            self.strike(pokemon_1, pokemon_2, team_1, team_2)
             # If both pokemons faint from the attacks
             if pokemon_1.has_fainted() and pokemon_2.has_fainted():
                 return True
             # If Trainer One's pokemon faint from the attacks and Trainer Two's pokemon remain alive,
             # Trainer Two's pokemon levels up and returns to its team
             elif pokemon_1.has_fainted():
-                pokemon_2.level_up()
-                # If battle mode is set to 2, update the pokemon's key criterion to what it is
-                self.update_criterion(pokemon_2, team_2)
+                # Levels up and, if battle mode is set to 2, updates the pokemon's key criterion to what it is
+                self.level_up(pokemon_2, team_2)
                 self.returning(pokemon_2, team_2)
                 return True
             # If Trainer Two's pokemon faint from the attacks and Trainer One's pokemon remain alive,
             # Trainer One's pokemon levels up and returns to its team
             elif pokemon_2.has_fainted():
-                pokemon_1.level_up()
-                # If battle mode is set to 2, update the pokemon's key criterion to what it is
-                self.update_criterion(pokemon_1, team_1)
+                # Levels up and, if battle mode is set to 2, updates the pokemon's key criterion to what it is
+                self.level_up(pokemon_1, team_1)
                 self.returning(pokemon_1, team_1)
                 return True
             else:
                 # If neither pokemons faint from the attack, both pokemons lose 1 HP
-                pokemon_1.set_hp(pokemon_1.get_hp() - 1)
-                pokemon_2.set_hp(pokemon_2.get_hp() - 1)
+                self.lose_hp(pokemon_1, team_1)
+                self.lose_hp(pokemon_2, team_2)
                 # If both pokemons faint from losing HP
                 if pokemon_1.has_fainted() and pokemon_2.has_fainted():
                     return True
                 # If Trainer One's pokemon faint from losing HP and Trainer Two's pokemon remain alive,
                 # Trainer Two's pokemon levels up and returns to its team
                 elif pokemon_1.has_fainted():
-                    pokemon_2.level_up()
-                    # If battle mode is set to 2, update the pokemon's key criterion to what it is
-                    self.update_criterion(pokemon_2, team_2)
+                    # Levels up and, if battle mode is set to 2, updates the pokemon's key criterion to what it is
+                    self.level_up(pokemon_2, team_2)
                     self.returning(pokemon_2, team_2)
                     return True
                 # If Trainer Two's pokemon faint from losing HP and Trainer One's pokemon remain alive,
                 # Trainer One's pokemon levels up and returns to its team
                 elif pokemon_2.has_fainted():
-                    pokemon_1.level_up()
-                    # If battle mode is set to 2, update the pokemon's key criterion to what it is
-                    self.update_criterion(pokemon_1, team_1)
+                    # Levels up and, if battle mode is set to 2, updates the pokemon's key criterion to what it is
+                    self.level_up(pokemon_1, team_1)
                     self.returning(pokemon_1, team_1)
                     return True
                 # If neither pokemon faints from losing HP, both return to their respective teams
@@ -413,9 +653,9 @@ class Battle:
                             or if battle mode isn't set to 0, 1 or 2
         :pre: 1 <= team <= 2
         :complexity: Best is O(1) if it's a stack or circular queue as it adds back the element.
-                     Worst is O(N^2), where N is len(self) and if it's an array sorted list. When item's key is not unique,
-                     will have to loop through sorted list during search to derive index position to append
-                     and if position is first
+                     Worst is O(N), where N is len(self) and if it's an array sorted list, as items are shifted to
+                     make room. It is O(log N) for the heap sorted list of a large team, as the item rises
+                     through the heap
         """
         # Checks if pokemon input are an object derived from the PokemonBase and team input is an integer
         if not isinstance(pokemon, PokemonBase):
@@ -439,7 +679,7 @@ class Battle:
                     self.team1.team.append(pokemon)
                 elif team == 2:
                     self.team2.team.append(pokemon)
-            # Use modified_add() as it is an array sorted list
+            # Use modified_add() as it is an array or heap sorted list
             elif self.battle_mode == 2:
                 if team == 1:
                     self.team1.team.modified_add(self.pokemon1)
@@ -448,6 +688,39 @@ class Battle:
             else:
                 raise ValueError("Input battle mode is invalid")
 
+    def strike(self, attacker: T, defender: T, attacker_team: int, defender_team: int) -> None:
+        """
+        The defender takes the damage of the attacker's attack, used by match() and match_same_speed() for every
+        attack, so observers are told of each one by wrapping this method
+        :param attacker: A pokemon object from either classes from pokemon.py or MissingNo.py
+        :param defender: A pokemon object from either classes from pokemon.py or MissingNo.py
+        :param attacker_team: An integer telling which team has the attacker
+        :param defender_team: An integer telling which team has the defender
+        :raises TypeError: If the attacker isn't Charmander, Bulbasaur, Squirtle or MissingNo
+        :complexity: Best and worst is O(1) following the defender's get_damage() method
+        """
+        defender.get_damage(attacker)
+
+    def lose_hp(self, pokemon: T, team: int) -> None:
+        """
+        Takes the 1 HP both pokemons lose when neither faints from the attacks
+        :param pokemon: A pokemon object from either classes from pokemon.py or MissingNo.py
+        :param team: An integer telling which team has the pokemon
+        :complexity: Best and worst is O(1) as it sets the pokemon's hp
+        """
+        pokemon.set_hp(pokemon.get_hp() - 1)
+
+    def level_up(self, pokemon: T, team: int) -> None:
+        """
+        Levels up the pokemon left standing after an exchange and, if battle mode is set to 2, updates its key
+        criterion to what it is
+        :param pokemon: A pokemon object from either classes from pokemon.py or MissingNo.py
+        :param team: An integer telling which team has the pokemon
+        :complexity: Best and worst is O(1) following update_criterion()
+        """
+        pokemon.level_up()
+        self.update_criterion(pokemon, team)
+
     def update_criterion(self, pokemon: T, team: int) -> None:
         """
         Sets and updates the pokemon's key so the Array Sorted List will sort the pokemons according to its
@@ -458,7 +731,8 @@ class Battle:
                            or if team input isn't an integer
         :raises ValueError: If team input aren't 1 or 2
         :pre: 1 <= team <= 2
-        :complexity: Best and Worst is O(1) as it sets the pokemon's key to an updated value
+        :complexity: Best and Worst is O(1) as it sets the pokemon's key to an updated value, using the team's
+                     criterion getter resolved when the team was assigned
         """
         # Checks if pokemon input are an object derived from the PokemonBase and team input is an integer
         if not isinstance(pokemon, PokemonBase):
@@ -472,9 +746,9 @@ class Battle:
             # Gets the key criterion of the pokemon and set it to its key on the Array Sorted List item
             if self.battle_mode == 2:
                 if team == 1:
-                    self.pokemon1.key = self.team1.get_criterion(pokemon, self.criterion_team1)
+                    self.pokemon1.key = self.team1.key_function(pokemon)
                 elif team == 2:
-                    self.pokemon2.key = self.team2.get_criterion(pokemon, self.criterion_team2)
+                    self.pokemon2.key = self.team2.key_function(pokemon)
             else:
                 pass
 
@@ -484,29 +758,22 @@ class Battle:
         :param team: A PokeTeam object that contains the Pokemon objects
         :return: A True if every pokemon int the has battled or False if one pokemon hasn't battled
         :raises TypeError: If the input isn't a PokeTeam object
-        :complexity: Best is O(1) if the first pokemon in the array sorted list hasn't battled.
-                     Worst is O(len(self)) if all pokemons in the array sorted has battled
+        :complexity: Best and worst is O(1) as the team keeps count of its pokemons that haven't battled
         """
         # Checks if team input is an object from the PokeTeam
         if not isinstance(team, PokeTeam):
             raise TypeError("Input is not a PokeTeam object")
         else:
-            i = 0
-            is_valid = True
-            while is_valid and i < len(team.team):  # Loops through the pokemon team and break out if one hasn't battled
-                if not team.team[i].value.has_battled():  # Checks if a pokemon has already battled or not
-                    is_valid = False
-                i += 1
-            return is_valid
+            return team.unbattled == 0
 
     def get_missingno(self, pokemon: T, team: T) -> ArraySortedList:
         """
-        Creates a new Array Sorted List and adds MissingNo into the list
+        Adds MissingNo into the team's holding slot, an Array Sorted List allocated once with the team
         :param pokemon: A MissingNo object
         :param team: A PokeTeam object that contains the Pokemon objects
         :return: An Array Sorted List containing the MissingNo object removed from its team
         :raises TypeError: If the input isn't a MissingNo object or PokeTeam object
-        :complexity: Best and worst is O(len(self)) as it has to traverse len(self) to insert an element
+        :complexity: Best and worst is O(1) as the slot is empty when MissingNo is added
         """
         # Checks if pokemon input is a MissingNo object and team input is an object from the PokeTeam
         if not isinstance(pokemon, MissingNo):
@@ -514,8 +781,138 @@ class Battle:
         elif not isinstance(team, PokeTeam):
             raise TypeError("Input team is not a PokeTeam object")
         else:
-            sorted_lst = ArraySortedList(1)  # Create a new array sorted list with length of 1
+            # Adds the chosen pokemon into the team's slot
+            return team.hold_missingno(team.get_item(pokemon, team.get_criterion(pokemon, self.criterion_team1)))
+
+    def validate_team(self, team: PokeTeam) -> None:
+        """
+        Checks every pokemon in the team once before a trusted fight, so the unchecked methods can rely on it
+        :param team: A PokeTeam object that contains the Pokemon objects
+        :raises TypeError: If the input isn't an assigned PokeTeam object,
+                           or if a pokemon isn't Charmander, Bulbasaur, Squirtle or MissingNo,
+                           or if a pokemon's hp or level isn't an integer
+        :raises ValueError: If a pokemon's hp or level isn't above 0
+        :complexity: Best and worst is O(len(team.team)) as every pokemon in the team is checked
+        """
+        if not isinstance(team, PokeTeam) or team.team is None:
+            raise TypeError("Input is not an assigned PokeTeam object")
+        for pokemon in team.get_members():
+            if not isinstance(pokemon, PokemonBase):
+                raise TypeError("Pokemon is not Charmander, Bulbasaur, Squirtle or MissingNo")
+            elif type(pokemon.hp) != int or type(pokemon.level) != int:
+                raise TypeError("HP and level must be integers")
+            elif pokemon.hp <= 0 or pokemon.level <= 0:
+                raise ValueError("HP and level must be above 0")
+
+    def _compare_speed(self, pokemon_1: T, pokemon_2: T) -> bool:
+        """
+        Unchecked version of compare_speed() for trusted battles
+        :complexity: Same as compare_speed()
+        """
+        if self.battle_mode == 2:
+            # MissingNo is added back to its team once every other pokemon in its team has battled
+            if self.can_play(self.team1) and not (self.missingno1 is None or self.missingno1.is_empty()):
+                m = self.missingno1.withdraw()
+                m.value.battled = True
+                self.team1.team.modified_add(m)
+            elif self.can_play(self.team2) and not (self.missingno2 is None or self.missingno2.is_empty()):
+                m = self.missingno2.withdraw()
+                m.value.battled = True
+                self.team2.team.modified_add(m)
+
+        speed_1 = pokemon_1.get_speed()
+        speed_2 = pokemon_2.get_speed()
+        if speed_1 > speed_2:
+            return self._match(pokemon_1, pokemon_2, 1, 2)
+        elif speed_2 > speed_1:
+            return self._match(pokemon_2, pokemon_1, 2, 1)
+        else:
+            return self._match_same_speed(pokemon_1, pokemon_2, 1, 2)
+
+    def _match(self, fast_pokemon: T, slow_pokemon: T, faster_team: int, slower_team: int) -> bool:
+        """
+        Unchecked version of match() for trusted battles
+        :complexity: Same as match()
+        """
+        self._strike(fast_pokemon, slow_pokemon, faster_team, slower_team)
+        if slow_pokemon.hp > 0:
+            # Slow pokemon only strikes back if it didn't faint
+            self._strike(slow_pokemon, fast_pokemon, slower_team, faster_team)
+            if fast_pokemon.hp > 0:
+                # If neither faints from the attacks, both pokemons lose 1 HP
+                self._lose_hp(fast_pokemon, faster_team)
+                self._lose_hp(slow_pokemon, slower_team)
+        return self._finish_match(fast_pokemon, slow_pokemon, faster_team, slower_team)
+
+    def _match_same_speed(self, pokemon_1: T, pokemon_2: T, team_1: int, team_2: int) -> bool:
+        """
+        Unchecked version of match_same_speed() for trusted battles
+        :complexity: Same as match_same_speed()
+        """
+        # Pokemon 1 takes its damage first, which matters when a defending GlitchMon's superpower raises its attack
+        self._strike(pokemon_2, pokemon_1, team_2, team_1)
+        self._strike(pokemon_1, pokemon_2, team_1, team_2)
+        if pokemon_1.hp > 0 and pokemon_2.hp > 0:
+            # If neither faints from the attacks, both pokemons lose 1 HP
+            self._lose_hp(pokemon_1, team_1)
+            self._lose_hp(pokemon_2, team_2)
+        return self._finish_match(pokemon_1, pokemon_2, team_1, team_2)
+
+    def _finish_match(self, pokemon_1: T, pokemon_2: T, team_1: int, team_2: int) -> bool:
+        """
+        Levels up the pokemon that is left standing and returns the pokemons that didn't faint to their teams,
+        as both match() and match_same_speed() do once the attacks are over
+        :return: A True if a pokemon has fainted and False if neither has
+        :complexity: Same as _returning()
+        """
+        if pokemon_1.hp > 0 and pokemon_2.hp > 0:
+            # Neither fainted, both return to their respective teams. In battle mode 2 their keys were already
+            # updated by the pokemons' on_change hooks as their hp and level changed
+            self._returning(pokemon_1, team_1)
+            self._returning(pokemon_2, team_2)
+            return False
+        elif pokemon_1.hp > 0:
+            # Only the second pokemon fainted, the first one levels up and returns to its team
+            self._level_up(pokemon_1, team_1)
+            self._returning(pokemon_1, team_1)
+        elif pokemon_2.hp > 0:
+            # Only the first pokemon fainted, the second one levels up and returns to its team
+            self._level_up(pokemon_2, team_2)
+            self._returning(pokemon_2, team_2)
+        return True
 
-            # Adds the chosen pokemon into the list
-            sorted_lst.add(ListItem(pokemon, team.get_criterion(pokemon, self.criterion_team1)))
-            return sorted_lst
+    def _strike(self, attacker: T, defender: T, attacker_team: int, defender_team: int) -> None:
+        """
+        Unchecked version of strike() for trusted battles
+        :complexity: Same as strike()
+        """
+        defender._get_damage(attacker)
+
+    def _lose_hp(self, pokemon: T, team: int) -> None:
+        """
+        Unchecked version of lose_hp() for trusted battles
+        :complexity: Same as lose_hp()
+        """
+        pokemon._set_hp(pokemon.hp - 1)
+
+    def _level_up(self, pokemon: T, team: int) -> None:
+        """
+        Unchecked version of level_up() for trusted battles. In battle mode 2 the key is updated by the pokemon's
+        on_change hook
+        :complexity: Best and worst is O(1) as it sets the pokemon's level
+        """
+        pokemon._set_level(pokemon.level + 1)
+
+    def _returning(self, pokemon: T, team: int) -> None:
+        """
+        Unchecked version of returning() for trusted battles
+        :complexity: Same as returning()
+        """
+        if self.battle_mode == 0:
+            (self.team1 if team == 1 else self.team2).team.push(pokemon)
+        elif self.battle_mode == 1:
+            (self.team1 if team == 1 else self.team2).team.append(pokemon)
+        elif team == 1:
+            self.team1.team.modified_add(self.pokemon1)
+        else:
+            self.team2.team.modified_add(self.pokemon2)
@@ -0,0 +1,419 @@
+"""
+Columnar log of every exchange fought, stored in memory-mapped files so it can be scanned without loading the
+exchanges into Python objects. Every column is its own file of fixed-width values, readable as a memoryview or,
+if NumPy is installed, as a NumPy array sharing the file's memory
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from GlitchMon import GlitchMon
+from observer import BattleObserver
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is only needed for BattleLogReader.array() and damage_histograms()
+    np = None
+
+VERSION = 2
+META_FILE = "log.json"
+# Name and struct format of every column, in the order of a record. "First" is the pokemon that attacks first,
+# the faster one or team 1's pokemon when both are as fast
+COLUMNS = (("battle", "I"),  # Number of the battle in the log, from 0
+           ("exchange", "I"),  # Number of the exchange in its battle, from 0
+           ("first_species", "B"),  # SPECIES_ID of the first pokemon
+           ("second_species", "B"),
+           ("same_speed", "B"),  # 1 if both pokemons were as fast and attacked at the same time
+           ("first_attacked", "B"),  # 1 if the first pokemon attacked, 0 if it fainted before its turn
+           ("second_attacked", "B"),
+           ("first_attack_damage", "i"),  # HP the first pokemon's attack took from the second, after any superpower
+           # HP the second gained when defending. 0 if the first pokemon didn't attack
+           ("second_attack_damage", "i"),
+           ("first_damage", "i"),  # HP the first pokemon lost over the exchange, including the 1 HP lost by both.
+           # Negative if a superpower added more HP than it lost
+           ("second_damage", "i"),
+           ("first_hp", "i"),  # HP of the first pokemon after the exchange
+           ("second_hp", "i"),
+           ("first_level_ups", "B"),  # Levels the first pokemon gained over the exchange
+           ("second_level_ups", "B"),
+           ("first_superpower", "B"),  # GlitchMon superpower result code of the first pokemon, if it defended
+           ("second_superpower", "B"))
+FORMATS = dict(COLUMNS)
+SIZES = {"B": 1, "i": 4, "I": 4}
+
+
+class BattleLog(BattleObserver):
+    GROWTH_FACTOR = 2
+    MIN_CAPACITY = 4096  # Records the files are sized for when created
+
+    def __init__(self, path: str, capacity: int = MIN_CAPACITY) -> None:
+        """
+        Constructor for BattleLog, which appends to the log in a directory, creating it if it doesn't exist. A
+        Battle given the log subscribes it as an observer, which is how the damage of every attack is recorded
+        :param path: A string of the log's directory
+        :param capacity: An integer of how many records the files are sized for before they are grown
+        :raises ValueError: If the directory holds a log of another version
+        :complexity: Best and worst is O(capacity) to size the files
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.length = 0
+        self.battles = 0
+        meta = os.path.join(path, META_FILE)
+        if os.path.exists(meta):
+            with open(meta) as file:
+                state = json.load(file)
+            if state["version"] != VERSION:
+                raise ValueError("Log is version {}, not {}".format(state["version"], VERSION))
+            self.length = state["length"]
+            self.battles = state["battles"]
+        self.capacity = max(capacity, self.length, self.MIN_CAPACITY)
+        self.files = {}
+        self.maps = {}
+        self.views = ()  # Values of every column in the order of COLUMNS, as memoryviews cast to its format
+        for name, fmt in COLUMNS:
+            self.files[name] = open(os.path.join(path, name), "a+b")
+        self._map()
+        self.exchange = 0  # Number of the next exchange in the current battle
+        # Damage of the attack made by team 1's and team 2's pokemon in the current exchange, None if it didn't attack
+        self.attacks = [None, None]
+        self.attacker = 0  # Team of the pokemon whose attack is being applied, 0 between attacks
+        self.healed = 0  # HP the defender gained from its superpower before the attack's damage was applied
+
+    def _map(self) -> None:
+        """
+        Sizes every column file for the capacity and maps it into memory
+        :complexity: Best and worst is O(capacity) to size the files
+        """
+        for name, fmt in COLUMNS:
+            file = self.files[name]
+            size = self.capacity * SIZES[fmt]
+            if os.fstat(file.fileno()).st_size < size:
+                file.truncate(size)
+            self.maps[name] = mmap.mmap(file.fileno(), size)
+        self.views = tuple(memoryview(self.maps[name]).cast(fmt) for name, fmt in COLUMNS)
+
+    def _unmap(self) -> None:
+        """
+        Releases every view and map, which must be done before a file is resized or closed
+        :complexity: Best and worst is O(1) as there is a fixed number of columns
+        """
+        for view in self.views:
+            view.release()
+        for name, fmt in COLUMNS:
+            self.maps[name].close()
+
+    def _grow(self) -> None:
+        """
+        Multiplies the capacity by the growth factor and maps the larger files
+        :complexity: Best and worst is O(capacity) to size the files
+        """
+        self._unmap()
+        self.capacity *= self.GROWTH_FACTOR
+        self._map()
+
+    def append(self, record: tuple) -> None:
+        """
+        Appends a record to the log
+        :param record: A tuple of integers with a value for every column, in the order of COLUMNS
+        :complexity: Best is O(1). Worst is O(capacity) when the files are grown
+        """
+        if self.length >= self.capacity:
+            self._grow()
+        index = self.length
+        for view, value in zip(self.views, record):
+            view[index] = value
+        self.length += 1
+
+    def start_battle(self) -> None:
+        """
+        Starts numbering the exchanges of a new battle
+        :complexity: Best and worst is O(1)
+        """
+        if self.exchange > 0:
+            self.battles += 1
+        self.exchange = 0
+
+    def wrap(self, compare_speed):
+        """
+        Returns a function that calls compare_speed() and appends a record of the exchange, so a battle only pays
+        for logging when it has a log. The battle must have the log subscribed, for the attacks to be recorded
+        :param compare_speed: A Battle's compare_speed() or _compare_speed() method
+        :return: A function with the same parameters and return value as compare_speed
+        :complexity: Best and worst is O(1) on top of compare_speed
+        """
+        def record_exchange(pokemon_1, pokemon_2) -> bool:
+            # Same order as compare_speed(), read before the exchange changes their levels
+            speed_1 = pokemon_1.get_speed()
+            speed_2 = pokemon_2.get_speed()
+            first, second = (pokemon_2, pokemon_1) if speed_2 > speed_1 else (pokemon_1, pokemon_2)
+            hp_1, hp_2 = first.hp, second.hp
+            level_1, level_2 = first.level, second.level
+            for pokemon in (first, second):
+                if isinstance(pokemon, GlitchMon):
+                    pokemon.last_superpower = GlitchMon.SUPERPOWER_NONE
+            self.attacks = [None, None]
+            finished = compare_speed(pokemon_1, pokemon_2)
+            attack_1, attack_2 = self.attacks[::-1] if speed_2 > speed_1 else self.attacks
+            self.append((self.battles, self.exchange, first.SPECIES_ID, second.SPECIES_ID, int(speed_1 == speed_2),
+                         int(attack_1 is not None), int(attack_2 is not None), attack_1 or 0, attack_2 or 0,
+                         hp_1 - first.hp, hp_2 - second.hp, first.hp, second.hp,
+                         first.level - level_1, second.level - level_2,
+                         getattr(first, "last_superpower", GlitchMon.SUPERPOWER_NONE),
+                         getattr(second, "last_superpower", GlitchMon.SUPERPOWER_NONE)))
+            self.exchange += 1
+            return finished
+        return record_exchange
+
+    def attack(self, attacker_team: int, attacker_species: int, defender_team: int, defender_species: int) -> None:
+        """
+        Notes which team's pokemon the damage applied next comes from
+        :complexity: Best and worst is O(1)
+        """
+        self.attacker = attacker_team
+        self.healed = 0
+
+    def superpower(self, team: int, species: int, result: int) -> None:
+        """
+        Notes the HP the defender gained before the attack's damage, so it isn't taken off the attack's damage
+        :complexity: Best and worst is O(1)
+        """
+        if result in (GlitchMon.SUPERPOWER_HP, GlitchMon.SUPERPOWER_HP_AND_LEVEL):
+            self.healed = 1
+
+    def damage_applied(self, team: int, species: int, hp_lost: int, hp: int) -> None:
+        """
+        Keeps the damage of the attack being applied, ignoring the 1 HP both pokemons lose at the end of an exchange
+        :complexity: Best and worst is O(1)
+        """
+        if self.attacker:
+            self.attacks[self.attacker - 1] = hp_lost + self.healed
+            self.attacker = 0
+
+    def flush(self) -> None:
+        """
+        Writes the records and the log's length to disk, so a reader sees every record appended so far
+        :complexity: Best and worst is O(capacity) at worst, to write the mapped pages
+        """
+        for name, fmt in COLUMNS:
+            self.maps[name].flush()
+        with open(os.path.join(self.path, META_FILE), "w") as file:
+            json.dump({"version": VERSION, "length": self.length,
+                       "battles": self.battles + (self.exchange > 0)}, file)
+
+    def close(self) -> None:
+        """
+        Flushes the log and closes its files. The log can't be appended to afterwards
+        :complexity: Same as flush()
+        """
+        self.flush()
+        self._unmap()
+        for name, fmt in COLUMNS:
+            self.files[name].close()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of records in the log
+        :complexity: Best and worst is O(1)
+        """
+        return self.length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class BattleLogReader:
+    def __init__(self, path: str) -> None:
+        """
+        Constructor for BattleLogReader, which maps the columns of a flushed log read-only
+        :param path: A string of the log's directory
+        :raises ValueError: If the directory holds a log of another version
+        :complexity: Best and worst is O(1) as the files are mapped, not read
+        """
+        with open(os.path.join(path, META_FILE)) as file:
+            state = json.load(file)
+        if state["version"] != VERSION:
+            raise ValueError("Log is version {}, not {}".format(state["version"], VERSION))
+        self.length = state["length"]
+        self.battles = state["battles"]
+        self.maps = {}
+        for name, fmt in COLUMNS:
+            with open(os.path.join(path, name), "rb") as file:
+                # An empty map isn't allowed, so an empty log maps a single value
+                self.maps[name] = mmap.mmap(file.fileno(), max(self.length, 1) * SIZES[fmt], access=mmap.ACCESS_READ)
+
+    def column(self, name: str) -> memoryview:
+        """
+        Returns the values of a column without copying them
+        :param name: A string of the column's name, one of COLUMNS
+        :return: A memoryview of the column's values, indexed by record
+        :raises KeyError: If there is no such column
+        :complexity: Best and worst is O(1)
+        """
+        return memoryview(self.maps[name]).cast(FORMATS[name])[:self.length]
+
+    def array(self, name: str):
+        """
+        Returns the values of a column as a NumPy array sharing the mapped file's memory
+        :param name: A string of the column's name, one of COLUMNS
+        :return: A read-only NumPy array of the column's values
+        :raises ImportError: If NumPy isn't installed
+        :raises KeyError: If there is no such column
+        :complexity: Best and worst is O(1)
+        """
+        if np is None:
+            raise ImportError("NumPy is needed to read columns as arrays")
+        return np.frombuffer(self.maps[name], dtype=np.dtype(FORMATS[name]), count=self.length)
+
+    def damage_histograms(self) -> dict:
+        """
+        Returns how often each amount of damage was dealt by an attack, for every pairing of attacking and defending
+        species. Only attacks that were made are counted, so a pokemon that fainted before its turn deals nothing
+        :return: A dictionary of NumPy arrays counting each damage from 0, by (attacker SPECIES_ID, defender
+                 SPECIES_ID)
+        :raises ImportError: If NumPy isn't installed
+        :complexity: Best and worst is O(N + S * D), where N is len(self), S the number of pairings and D the
+                     largest damage
+        """
+        first = self.array("first_species")
+        second = self.array("second_species")
+        attacked = np.concatenate((self.array("first_attacked"), self.array("second_attacked"))).astype(bool)
+        # Every attack made is counted, up to 2 for each exchange
+        attackers = np.concatenate((first, second)).astype(np.int64)[attacked]
+        defenders = np.concatenate((second, first)).astype(np.int64)[attacked]
+        damage = np.concatenate((self.array("first_attack_damage"), self.array("second_attack_damage")))[attacked]
+        pairings = attackers * 256 + defenders
+        histograms = {}
+        for pairing in np.unique(pairings):
+            histograms[(int(pairing) // 256, int(pairing) % 256)] = np.bincount(damage[pairings == pairing])
+        return histograms
+
+    def close(self) -> None:
+        """
+        Closes the mapped files. Views returned earlier must be released first
+        :complexity: Best and worst is O(1) as there is a fixed number of columns
+        """
+        for name, fmt in COLUMNS:
+            self.maps[name].close()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of records in the log
+        :complexity: Best and worst is O(1)
+        """
+        return self.length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class DamageRecorder(BattleObserver):
+    """ Observer keeping the (attacker SPECIES_ID, defender SPECIES_ID, damage) of every attack, for the tests."""
+    def __init__(self) -> None:
+        self.damages = []
+        self.pairing = None  # Species of the attack being applied, None between attacks
+        self.healed = 0
+
+    def attack(self, attacker_team: int, attacker_species: int, defender_team: int, defender_species: int) -> None:
+        self.pairing = (attacker_species, defender_species)
+        self.healed = 0
+
+    def superpower(self, team: int, species: int, result: int) -> None:
+        self.healed = int(result in (GlitchMon.SUPERPOWER_HP, GlitchMon.SUPERPOWER_HP_AND_LEVEL))
+
+    def damage_applied(self, team: int, species: int, hp_lost: int, hp: int) -> None:
+        if self.pairing is not None:
+            self.damages.append(self.pairing + (hp_lost + self.healed,))
+            self.pairing = None
+
+
+class TestBattleLog(unittest.TestCase):
+    """ Tests for the above classes."""
+    # Battle mode, head counts and criteria of the battles logged, fought once before and once after reopening
+    BATTLES = ((0, [2, 2, 1, 1], [1, 2, 3], None, None),
+               (1, [1, 1, 1, 1], [2, 1, 2, 1], None, None),
+               (2, [2, 1, 1, 1], [1, 2, 2, 1], "lvl", "hp"),
+               (2, [1, 2, 3], [3, 2, 1], "spd", "def"))
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "log")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, seed: int, recorder: DamageRecorder) -> list:
+        """ Appends the battles to the log, returning the number of exchanges of each."""
+        from battle import Battle
+        from random_stream import RandomStream
+        exchanges = []
+        with BattleLog(self.path) as log:
+            for battle_mode, team1, team2, criterion1, criterion2 in self.BATTLES:
+                battle = Battle("Ash", "Gary", False, RandomStream(seed), log=log)
+                battle.subscribe(recorder)
+                battle.headless_battle(battle_mode, team1, team2, criterion1, criterion2)
+                exchanges.append(battle.exchanges)
+        return exchanges
+
+    def test_append(self):
+        """ Tests a reopened log is appended to, numbering its battles on from those already logged."""
+        recorder = DamageRecorder()
+        exchanges = self.write(1, recorder) + self.write(2, recorder)
+        with BattleLogReader(self.path) as reader:
+            self.assertEqual(len(reader), sum(exchanges))
+            self.assertEqual(reader.battles, len(exchanges))
+            battles = reader.column("battle")
+            numbers = reader.column("exchange")
+            expected = [(battle, exchange) for battle in range(len(exchanges)) for exchange in range(exchanges[battle])]
+            self.assertEqual(list(zip(battles, numbers)), expected)
+            for name, fmt in COLUMNS:
+                view = reader.column(name)
+                self.assertEqual(reader.array(name).tolist(), view.tolist())
+                view.release()
+            battles.release()
+            numbers.release()
+            # Every attack the observer saw made is recorded, up to 2 for each exchange
+            attacks = int(reader.array("first_attacked").sum()) + int(reader.array("second_attacked").sum())
+        self.assertEqual(attacks, len(recorder.damages))
+
+    def test_damage_histograms(self):
+        """ Tests the histograms count the damage of every attack an observer saw."""
+        recorder = DamageRecorder()
+        self.write(3, recorder)
+        self.write(4, recorder)
+        counts = {}
+        for attacker, defender, damage in recorder.damages:
+            histogram = counts.setdefault((attacker, defender), {})
+            histogram[damage] = histogram.get(damage, 0) + 1
+        with BattleLogReader(self.path) as reader:
+            histograms = reader.damage_histograms()
+        self.assertEqual(sorted(histograms), sorted(counts))
+        for pairing, histogram in histograms.items():
+            self.assertEqual({damage: int(count) for damage, count in enumerate(histogram) if count > 0},
+                             counts[pairing])
+        self.assertEqual(sum(int(histogram.sum()) for histogram in histograms.values()), len(recorder.damages))
+
+    def test_version(self):
+        """ Tests a log of another version isn't opened."""
+        BattleLog(self.path).close()
+        with open(os.path.join(self.path, META_FILE), "w") as file:
+            json.dump({"version": VERSION - 1, "length": 0, "battles": 0}, file)
+        self.assertRaises(ValueError, BattleLog, self.path)
+        self.assertRaises(ValueError, BattleLogReader, self.path)
+
+
+if __name__ == '__main__':
+    testtorun = TestBattleLog()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,372 @@
+"""
+Server hosting many interactive battles at once over a local socket, with asyncio. Every connection is a session
+where the client picks the battle mode and both teams, as Battle.battling() asks a user to, and team selection is
+awaited instead of blocking on input(). Battles are fought on a pool of worker processes, so a long battle doesn't
+hold up the other sessions.
+Every message is a line of text. A session is:
+    client: BATTLE <battle mode> [<criterion team 1> <criterion team 2>]
+    server: TEAM 1
+    client: <C> <B> <S> [<M>]
+    server: TEAM 2
+    client: <C> <B> <S> [<M>]
+    server: RESULT <exchanges> <seed> <winner>
+The server answers ERROR <reason> to a line it can't accept and asks for it again, or instead of RESULT if the
+battle failed, after which the client can start another battle. A client can fight any number
+of battles on a connection and ends it with QUIT. The seed can be given to BattleReplay to replay the battle
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from battle import Battle
+from poke_team import PokeTeam
+from random_stream import RandomStream
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import multiprocessing
+import random
+import unittest
+
+TRAINER_ONE = "Trainer 1"
+TRAINER_TWO = "Trainer 2"
+
+
+def play_battle(seed: int, battle_mode: int, team1_head_count: list, team2_head_count: list,
+                criterion_team1: str, criterion_team2: str, trusted: bool) -> tuple:
+    """
+    Fights a battle with a RandomStream seeded with seed, run by a worker process
+    :return: A tuple of the winner's name, or "Draw", and the number of exchanges
+    :complexity: Best and worst is the complexity of Battle.fight()
+    """
+    battle = Battle(TRAINER_ONE, TRAINER_TWO, trusted, RandomStream(seed))
+    winner = battle.headless_battle(battle_mode, team1_head_count, team2_head_count, criterion_team1,
+                                    criterion_team2)
+    return winner, battle.exchanges
+
+
+class SessionClosed(Exception):
+    """
+    Raised when a client's session is over, as it disconnected, quit or was idle for too long
+    """
+    pass
+
+
+class BattleSession:
+    def __init__(self, server, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Constructor for BattleSession, a client connected to the server
+        :param server: The BattleServer the client connected to
+        :param reader: An asyncio.StreamReader of the client's lines
+        :param writer: An asyncio.StreamWriter of the server's lines
+        :complexity: Best and worst is O(1) as local variables are initialised
+        """
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.checker = PokeTeam(TRAINER_ONE)  # Only used to check head counts
+
+    async def send(self, line: str) -> None:
+        """
+        Sends a line to the client, waiting until it can be written if the client reads slowly
+        :complexity: Best and worst is O(len(line))
+        """
+        self.writer.write((line + "\n").encode())
+        await self.writer.drain()
+
+    async def receive(self) -> list:
+        """
+        Waits for the client's next line that isn't blank
+        :return: A list of the line's words
+        :raises SessionClosed: If the client has disconnected, sent QUIT or sent nothing for the server's idle timeout
+        :complexity: Best and worst is O(L), where L is the length of the line
+        """
+        words = []
+        while not words:
+            try:
+                line = await asyncio.wait_for(self.reader.readline(), self.server.idle_timeout)
+            except asyncio.TimeoutError:
+                raise SessionClosed("Client was idle")
+            if not line:
+                raise SessionClosed("Client disconnected")
+            words = line.decode(errors="replace").split()
+        if words[0].upper() == "QUIT":
+            raise SessionClosed("Client quit")
+        return words
+
+    async def choose_team(self, team: int) -> list:
+        """
+        Awaitable counterpart of PokeTeam.choose_team(), which asks the client for a team until it sends a valid one
+        :param team: An integer of the team asked for, 1 or 2
+        :return: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+        :raises SessionClosed: See receive()
+        :complexity: Best is O(1) when the first team sent is valid. Worst is O(T), where T is the number of teams
+                     sent
+        """
+        while True:
+            await self.send("TEAM {}".format(team))
+            words = await self.receive()
+            try:
+                pokemon_head_count = [int(word) for word in words]
+            except ValueError:
+                pokemon_head_count = None
+            if pokemon_head_count is not None and self.checker.is_valid_head_count(pokemon_head_count):
+                return pokemon_head_count
+            await self.send("ERROR Team must be C B S or C B S M within the team limit of {}".format(
+                PokeTeam.LIMIT))
+
+    async def choose_battle(self) -> tuple:
+        """
+        Asks the client for the battle mode and, for battle mode 2, both teams' criteria until they are valid
+        :return: A tuple of the battle mode and both criteria, None if the battle mode isn't 2
+        :raises SessionClosed: See receive()
+        :complexity: Best is O(1) when the first line sent is valid. Worst is O(L), where L is the number of lines
+                     sent
+        """
+        while True:
+            words = await self.receive()
+            if words[0].upper() != "BATTLE" or len(words) not in (2, 4) or words[1] not in ("0", "1", "2"):
+                await self.send("ERROR Expected BATTLE <0, 1 or 2> [<criterion team 1> <criterion team 2>]")
+                continue
+            battle_mode = int(words[1])
+            if battle_mode != 2:
+                return battle_mode, None, None
+            elif len(words) == 4 and words[2] in Battle.CRITERION_LIST and words[3] in Battle.CRITERION_LIST:
+                return battle_mode, words[2], words[3]
+            await self.send("ERROR Battle mode 2 needs 2 criteria out of {}".format(" ".join(Battle.CRITERION_LIST)))
+
+    async def run(self) -> None:
+        """
+        Hosts the client's battles until it disconnects
+        :complexity: Best and worst is O(N * B), where N is the number of battles and B the complexity of a battle
+        """
+        try:
+            while True:
+                battle_mode, criterion_team1, criterion_team2 = await self.choose_battle()
+                team1_head_count = await self.choose_team(1)
+                team2_head_count = await self.choose_team(2)
+                seed = random.getrandbits(32)
+                try:
+                    winner, exchanges = await self.server.simulate(seed, battle_mode, team1_head_count,
+                                                                   team2_head_count, criterion_team1, criterion_team2)
+                except Exception as error:
+                    # A battle failing on a worker only ends that battle, the client can carry on with another
+                    await self.send("ERROR Battle failed: {}".format(error))
+                    continue
+                await self.send("RESULT {} {} {}".format(exchanges, seed, winner))
+        except (SessionClosed, ConnectionError):
+            pass
+        finally:
+            self.writer.close()
+
+
+class BattleServer:
+    IDLE_TIMEOUT = 300.0  # Seconds a client can send nothing for before it is disconnected
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, path: str = None, processes: int = None,
+                 trusted: bool = True, idle_timeout: float = IDLE_TIMEOUT) -> None:
+        """
+        Constructor for BattleServer, which starts listening when started
+        :param host: A string of the address listened on
+        :param port: An integer of the TCP port listened on, any free port if 0
+        :param path: A string of a Unix socket's path listened on instead of host and port, if not None
+        :param processes: An integer of worker processes battles are fought on, the number of CPUs if None, or
+                          threads of this process if 1
+        :param trusted: A boolean of whether battles are fought in trusted mode
+        :param idle_timeout: A float of the seconds a client can send nothing for before it is disconnected
+        :complexity: Best and worst is O(1) as local variables are initialised
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.processes = processes
+        self.trusted = trusted
+        self.idle_timeout = idle_timeout
+        self.executor = None
+        self.server = None
+        self.sessions = set()  # Tasks of the sessions connected
+
+    async def start(self) -> None:
+        """
+        Starts the worker pool and listening for clients. The port listened on is in self.port once started
+        :complexity: Best and worst is O(P), where P is the number of worker processes
+        """
+        if self.processes != 1:
+            # Battles fought in threads of this process if 1, useful for debugging and profiling
+            self.executor = self.make_executor()
+        if self.path is None:
+            self.server = await asyncio.start_server(self.connect, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]
+        else:
+            self.server = await asyncio.start_unix_server(self.connect, self.path)
+
+    def make_executor(self) -> ProcessPoolExecutor:
+        """
+        Returns a new pool of worker processes
+        :complexity: Best and worst is O(P), where P is the number of worker processes
+        """
+        # Workers aren't forked from the server, or they would hold copies of the connected clients' sockets
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        return ProcessPoolExecutor(self.processes, multiprocessing.get_context(start_method))
+
+    async def connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Hosts the session of a client that has just connected
+        :complexity: Same as BattleSession.run()
+        """
+        task = asyncio.current_task()
+        self.sessions.add(task)
+        try:
+            await BattleSession(self, reader, writer).run()
+        except asyncio.CancelledError:
+            # Sessions are cancelled when the server closes, which ends them as a disconnection would
+            pass
+        finally:
+            self.sessions.discard(task)
+
+    async def simulate(self, seed: int, battle_mode: int, team1_head_count: list, team2_head_count: list,
+                       criterion_team1: str, criterion_team2: str) -> tuple:
+        """
+        Fights a battle on the worker pool, leaving the event loop free for other sessions meanwhile. If a worker has
+        died, which leaves the pool unusable, the pool is made again and the battle fought once more
+        :return: A tuple of the winner's name, or "Draw", and the number of exchanges
+        :raises BrokenProcessPool: If the pool made again has broken too
+        :complexity: Same as play_battle(), on a worker
+        """
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(executor, play_battle, seed, battle_mode, team1_head_count,
+                                              team2_head_count, criterion_team1, criterion_team2, self.trusted)
+        except BrokenProcessPool:
+            if self.executor is executor:
+                # Only the first of the sessions whose battles were on the broken pool replaces it
+                self.executor = self.make_executor()
+                executor.shutdown(wait=False)
+        return await loop.run_in_executor(self.executor, play_battle, seed, battle_mode, team1_head_count,
+                                          team2_head_count, criterion_team1, criterion_team2, self.trusted)
+
+    async def serve_forever(self) -> None:
+        """
+        Serves clients until cancelled
+        :complexity: Best and worst is O(1) per client connected
+        """
+        await self.server.serve_forever()
+
+    async def close(self) -> None:
+        """
+        Stops listening, disconnects every client and shuts the worker pool down
+        :complexity: Best and worst is O(S + P), where S is the number of sessions and P of worker processes
+        """
+        self.server.close()
+        for task in list(self.sessions):
+            task.cancel()
+        await asyncio.gather(*self.sessions, return_exceptions=True)
+        await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+
+class TestBattleServer(unittest.IsolatedAsyncioTestCase):
+    """ Tests for the above class, fighting battles in threads of the test's process."""
+    async def asyncSetUp(self):
+        self.server = BattleServer(processes=1)
+        await self.server.start()
+        self.reader, self.writer = await asyncio.open_connection(self.server.host, self.server.port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.server.close()
+
+    async def request(self, line: str) -> str:
+        """ Sends a line and returns the server's answer."""
+        self.writer.write((line + "\n").encode())
+        await self.writer.drain()
+        return (await asyncio.wait_for(self.reader.readline(), 10)).decode().strip()
+
+    async def test_battle(self):
+        """ Tests a battle's result matches the one replayed from its seed."""
+        self.assertEqual(await self.request("BATTLE 2 hp lvl"), "TEAM 1")
+        self.assertEqual(await self.request("2 2 2"), "TEAM 2")
+        words = (await self.request("1 2 2 1")).split(maxsplit=3)
+        self.assertEqual(words[0], "RESULT")
+        winner, exchanges = play_battle(int(words[2]), 2, [2, 2, 2], [1, 2, 2, 1], "hp", "lvl", True)
+        self.assertEqual(words[1], str(exchanges))
+        self.assertEqual(words[3], winner)
+
+    async def test_bad_input(self):
+        """ Tests lines that can't be accepted are asked for again."""
+        for line in ("FIGHT 0", "BATTLE 3", "BATTLE 2 hp", "BATTLE 2 hp power"):
+            self.assertTrue((await self.request(line)).startswith("ERROR"))
+        self.assertEqual(await self.request("BATTLE 0"), "TEAM 1")
+        for line in ("7 -1 0", "-1 -1 3", "a b c", "1 1", "0 0 0", "4 1 1 1", "1 1 1 2"):
+            self.assertTrue((await self.request(line)).startswith("ERROR"))
+            self.assertEqual(await self.reader.readline(), b"TEAM 1\n")
+        self.assertEqual(await self.request("1 1 1"), "TEAM 2")
+        self.assertTrue((await self.request("1 1 1")).startswith("RESULT"))
+
+    async def test_failed_battle(self):
+        """ Tests a battle failing on a worker answers ERROR and keeps the session open."""
+        async def simulate(*args):
+            raise ValueError("worker crashed")
+        self.server.simulate = simulate
+        self.assertEqual(await self.request("BATTLE 1"), "TEAM 1")
+        self.assertEqual(await self.request("1 1 1"), "TEAM 2")
+        self.assertEqual(await self.request("1 1 1"), "ERROR Battle failed: worker crashed")
+        del self.server.simulate
+        self.assertEqual(await self.request("BATTLE 1"), "TEAM 1")
+        self.assertEqual(await self.request("1 1 1"), "TEAM 2")
+        self.assertTrue((await self.request("1 1 1")).startswith("RESULT"))
+
+    async def test_broken_pool(self):
+        """ Tests the worker pool is made again after a worker dies, so later battles are still fought."""
+        import os
+        server = BattleServer(processes=2)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            broken = server.executor
+            # A worker exiting abruptly breaks the pool for every battle sent to it afterwards
+            with self.assertRaises(BrokenProcessPool):
+                await asyncio.wrap_future(broken.submit(os._exit, 1))
+            for line, answer in (("BATTLE 0", "TEAM 1"), ("2 2 2", "TEAM 2"), ("1 2 3", "RESULT")):
+                writer.write((line + "\n").encode())
+                await writer.drain()
+                received = (await asyncio.wait_for(reader.readline(), 60)).decode()
+                self.assertTrue(received.startswith(answer), received)
+            self.assertIsNot(server.executor, broken)
+            writer.close()
+        finally:
+            await server.close()
+
+    async def test_quit(self):
+        """ Tests the server closes the connection on QUIT."""
+        self.assertEqual(await self.request("QUIT"), "")
+
+
+async def main(host: str, port: int, path: str, processes: int) -> None:
+    """
+    Serves clients until interrupted
+    """
+    async with BattleServer(host, port, path, processes) as server:
+        print("Serving battles on {}".format(path if path is not None else "{}:{}".format(host, server.port)))
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Hosts interactive battles over a local socket")
+    parser.add_argument("--host", default="127.0.0.1", help="Address listened on")
+    parser.add_argument("--port", type=int, default=8642, help="TCP port listened on")
+    parser.add_argument("--path", help="Unix socket listened on instead of a TCP port")
+    parser.add_argument("--processes", type=int, help="Worker processes battles are fought on")
+    arguments = parser.parse_args()
+    try:
+        asyncio.run(main(arguments.host, arguments.port, arguments.path, arguments.processes))
+    except KeyboardInterrupt:
+        pass
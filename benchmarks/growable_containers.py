@@ -0,0 +1,71 @@
+"""
+Benchmark of the memory used and the throughput of the fixed and growable stacks and queues
+Run from the repository's root with: python -m benchmarks.growable_containers
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from stack_adt import ArrayStack, DynamicArrayStack
+from queue_adt import CircularQueue, DynamicCircularQueue
+from time import perf_counter
+import tracemalloc
+
+WORST_CASE = 4096  # Capacity a fixed container must be allocated with to hold any roster
+SIZES = [6, 64, 512, 4096]
+OPERATIONS = 200000
+
+
+def bytes_used(make, size: int) -> float:
+    """
+    Returns the bytes allocated by a container holding a number of items
+    :param make: A function that returns an empty container
+    :param size: An integer of how many items the container holds
+    :return: A float of the bytes allocated, not counting the items themselves
+    :complexity: Best and worst is O(size)
+    """
+    items = list(range(size))
+    # Fills a container once beforehand, as ctypes creates and keeps a new array type the first time a length is used
+    warm_up = make()
+    for item in items:
+        warm_up.push(item) if hasattr(warm_up, "push") else warm_up.append(item)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    container = make()
+    add = container.push if hasattr(container, "push") else container.append
+    for item in items:
+        add(item)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before
+
+
+def operations_per_second(make, size: int, operations: int = OPERATIONS) -> float:
+    """
+    Returns how many adds and removes per second a container manages while filling up to size and emptying
+    :param make: A function that returns an empty container
+    :param size: An integer of how many items the container is filled with before it is emptied
+    :param operations: An integer of at least how many adds and removes to time
+    :return: A float of the adds and removes per second
+    :complexity: Best and worst is O(operations)
+    """
+    container = make()
+    add, remove = (container.push, container.pop) if hasattr(container, "push") else \
+        (container.append, container.serve)
+    rounds = max(1, operations // (2 * size))
+    start = perf_counter()
+    for _ in range(rounds):
+        for item in range(size):
+            add(item)
+        for _ in range(size):
+            remove()
+    return rounds * 2 * size / (perf_counter() - start)
+
+
+if __name__ == '__main__':
+    containers = [("ArrayStack", lambda: ArrayStack(WORST_CASE)),
+                  ("DynamicArrayStack", lambda: DynamicArrayStack()),
+                  ("CircularQueue", lambda: CircularQueue(WORST_CASE)),
+                  ("DynamicCircularQueue", lambda: DynamicCircularQueue())]
+    for size in SIZES:
+        for name, make in containers:
+            print("{:>5} items {:<21} {:>9.0f} bytes {:>12.0f} ops/s".format(
+                size, name, bytes_used(make, size), operations_per_second(make, size)))
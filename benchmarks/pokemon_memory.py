@@ -0,0 +1,49 @@
+"""
+Benchmark of the memory used by every pokemon object and how fast they are constructed
+Run from the repository's root with: python -m benchmarks.pokemon_memory
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from pokemon import Charmander, Bulbasaur, Squirtle
+from MissingNo import MissingNo
+from time import perf_counter
+import tracemalloc
+
+COUNT = 100000
+
+
+def bytes_per_pokemon(pokemon_class, count: int = COUNT) -> float:
+    """
+    Returns the average number of bytes allocated for each constructed pokemon
+    :param pokemon_class: A pokemon class that takes no arguments
+    :param count: An integer of how many pokemons to construct
+    :return: A float of the bytes per pokemon
+    :complexity: Best and worst is O(count)
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    pokemons = [pokemon_class() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the pokemons takes a pointer per pokemon, which isn't part of the pokemon
+    return (after - before) / len(pokemons) - 8
+
+
+def constructions_per_second(pokemon_class, count: int = COUNT) -> float:
+    """
+    Returns how many pokemons can be constructed per second
+    :param pokemon_class: A pokemon class that takes no arguments
+    :param count: An integer of how many pokemons to construct
+    :return: A float of the constructions per second
+    :complexity: Best and worst is O(count)
+    """
+    start = perf_counter()
+    for _ in range(count):
+        pokemon_class()
+    return count / (perf_counter() - start)
+
+
+if __name__ == '__main__':
+    for pokemon_class in (Charmander, Bulbasaur, Squirtle, MissingNo):
+        print("{:<10} {:>6.1f} bytes/pokemon {:>12.0f} constructions/s".format(
+            pokemon_class.NAME, bytes_per_pokemon(pokemon_class), constructions_per_second(pokemon_class)))
@@ -0,0 +1,59 @@
+"""
+Benchmark of the allocations saved by recycling pokemons and team containers through a PokemonPool
+Run from the repository's root with: python -m benchmarks.pooling
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from battle import Battle
+from pokemon_pool import PokemonPool
+from random_stream import RandomStream
+from time import perf_counter
+
+BATTLES = 20000
+PER_MILLION = 1000000
+TEAM1 = [2, 2, 1, 1]
+TEAM2 = [1, 2, 3]
+
+
+def run_battles(battle_mode: int, pooled: bool, battles: int = BATTLES, seed: int = 0) -> dict:
+    """
+    Runs a number of trusted battles, either with a new Battle and new pokemons for every battle, or with one Battle
+    that is reset and takes its pokemons from a pool
+    :param battle_mode: An integer of the battle mode
+    :param pooled: A boolean of whether the pokemons and containers are recycled
+    :param battles: An integer of how many battles to run
+    :param seed: An integer to seed the RandomStream with, so pooled and unpooled runs play the same battles
+    :return: A dictionary of the pokemons and team containers constructed per million battles, and the battles per
+             second
+    :complexity: Best and worst is O(battles * B), where B is the complexity of a single battle
+    """
+    rng = RandomStream(seed)
+    criterion = "lvl" if battle_mode == 2 else None
+    pool = PokemonPool() if pooled else None
+    battle = Battle("Ash", "Gary", True, rng, pool)
+    containers = set()
+    elapsed = 0.0
+    for _ in range(battles):
+        start = perf_counter()
+        if pooled:
+            battle.reset()
+        else:
+            battle = Battle("Ash", "Gary", True, rng)
+        battle.headless_battle(battle_mode, TEAM1, TEAM2, criterion, criterion)
+        elapsed += perf_counter() - start
+        # Containers are kept alive in the set so a new one can't reuse the id of a freed one
+        containers.add(battle.team1.team)
+        containers.add(battle.team2.team)
+    constructed = pool.created if pooled else battles * (sum(TEAM1) + sum(TEAM2))
+    return {"pokemons": constructed * PER_MILLION / battles,
+            "containers": len(containers) * PER_MILLION / battles,
+            "battles_per_second": battles / elapsed}
+
+
+if __name__ == '__main__':
+    for mode in range(3):
+        for pooled in (False, True):
+            result = run_battles(mode, pooled)
+            print("Mode {} {:<8} {:>9.0f} pokemons/M battles {:>8.0f} containers/M battles {:>6.0f} battles/s".format(
+                mode, "pooled" if pooled else "unpooled", result["pokemons"], result["containers"],
+                result["battles_per_second"]))
@@ -0,0 +1,77 @@
+"""
+Benchmark of the size and speed of binary battle snapshots against pickling the battle's object graph
+Run from the repository's root with: python -m benchmarks.snapshots
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from battle import Battle
+from random_stream import RandomStream
+from snapshot import encode_battle, decode_battle, get_items
+from timeit import repeat
+import pickle
+
+REPEATS = 5
+NUMBER = 2000
+TEAM1 = [2, 2, 1, 1]
+TEAM2 = [1, 2, 3]
+
+
+def make_battle(battle_mode: int) -> Battle:
+    """
+    Returns a battle with both teams assigned and ready to fight
+    :param battle_mode: An integer of the battle mode
+    :complexity: Best and worst is O(N), where N is the size of both teams
+    """
+    battle = Battle("Ash", "Gary", True, RandomStream(0))
+    criterion = "hp" if battle_mode == 2 else None
+    battle.battle_mode = battle_mode
+    battle.criterion_team1 = battle.criterion_team2 = criterion
+    battle.team1.set_team(battle_mode, TEAM1, criterion)
+    battle.team2.set_team(battle_mode, TEAM2, criterion)
+    return battle
+
+
+def get_graph(battle: Battle) -> tuple:
+    """
+    Returns the state a snapshot records as plain Python objects holding the same pokemons and sorted list items.
+    The Battle itself can't be pickled, as its containers are ctypes arrays
+    :complexity: Best and worst is O(N), where N is the size of both teams
+    """
+    teams = tuple((team.trainer, team.battle_mode, team.criterion, team.unbattled, get_items(team),
+                   [team.missingno_slot[i] for i in range(len(team.missingno_slot))])
+                  for team in (battle.team1, battle.team2))
+    return (battle.trusted, battle.battle_mode, battle.criterion_team1, battle.criterion_team2, battle.exchanges,
+            battle.pokemon1, battle.pokemon2) + teams
+
+
+def time_per_call(function, number: int = NUMBER) -> float:
+    """
+    Returns the best time of a call to function over a number of repeats
+    :return: A float of the seconds per call
+    :complexity: Best and worst is O(number * REPEATS) calls to function
+    """
+    return min(repeat(function, number=number, repeat=REPEATS)) / number
+
+
+def compare(battle_mode: int) -> dict:
+    """
+    Returns the size and the encode and decode times of a snapshot and of a pickle of the same battle's state
+    :param battle_mode: An integer of the battle mode
+    :return: A dictionary of the bytes and microseconds to encode and decode, for "snapshot" and "pickle"
+    :complexity: Best and worst is O(NUMBER * REPEATS * N), where N is the size of both teams
+    """
+    battle = make_battle(battle_mode)
+    snapshot = encode_battle(battle)
+    pickled = pickle.dumps(get_graph(battle), pickle.HIGHEST_PROTOCOL)
+    return {"snapshot": (len(snapshot), time_per_call(lambda: encode_battle(battle)) * 1e6,
+                         time_per_call(lambda: decode_battle(snapshot)) * 1e6),
+            "pickle": (len(pickled),
+                       time_per_call(lambda: pickle.dumps(get_graph(battle), pickle.HIGHEST_PROTOCOL)) * 1e6,
+                       time_per_call(lambda: pickle.loads(pickled)) * 1e6)}
+
+
+if __name__ == '__main__':
+    for mode in range(3):
+        for name, (size, encode, decode) in compare(mode).items():
+            print("Mode {} {:<8} {:>5} bytes, encode {:>7.2f} us, decode {:>7.2f} us".format(
+                mode, name, size, encode, decode))
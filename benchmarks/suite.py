@@ -0,0 +1,217 @@
+"""
+Benchmark suite of the ADTs, team assignment and full battles in every battle mode, with results written as JSON so
+they can be compared against a baseline to catch regressions
+Run from the repository's root with: python -m benchmarks.suite [--output results.json] [--baseline base.json]
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from referential_array import ArrayR
+from stack_adt import ArrayStack
+from queue_adt import CircularQueue
+from array_sorted_list import ArraySortedList
+from heap_sorted_list import HeapSortedList
+from sorted_list import ListItem
+from poke_team import PokeTeam
+from battle import Battle
+from random_stream import RandomStream
+from timeit import Timer
+import argparse
+import json
+import platform
+import sys
+
+SIZES = [16, 256, 4096]
+REPEATS = 5
+MIN_TIME = 0.05  # Seconds a repeat of a benchmark runs for at least
+TOLERANCE = 0.25  # How much slower than the baseline a benchmark can get before it is reported
+TEAM1 = [2, 2, 1, 1]
+TEAM2 = [1, 2, 3]
+BATTLES = 20  # Battles per call, few enough that every repeat runs for MIN_TIME and averages many calls
+SEED = 0
+
+
+def time_call(function, repeats: int = REPEATS, min_time: float = MIN_TIME) -> float:
+    """
+    Returns the best seconds per call of a function out of a number of repeats, each calling it enough times to run
+    for at least min_time
+    :param function: A function without parameters
+    :param repeats: An integer of how many repeats to take the best of
+    :param min_time: A float of the seconds a repeat runs for at least
+    :return: A float of the seconds per call
+    :complexity: Best and worst is O(repeats * min_time / T) calls to function, where T is the time of a call
+    """
+    timer = Timer(function)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeats, number=number)) / number
+
+
+def fill_and_empty(add, remove, size: int) -> None:
+    """
+    Adds size items with add() then removes them all with remove()
+    :complexity: Best and worst is O(size) calls to add and remove
+    """
+    for item in range(size):
+        add(item)
+    for _ in range(size):
+        remove()
+
+
+def bench_stack(size: int) -> float:
+    """
+    Returns the seconds to push then pop size items on an ArrayStack
+    :complexity: Same as time_call()
+    """
+    stack = ArrayStack(size)
+    return time_call(lambda: fill_and_empty(stack.push, stack.pop, size))
+
+
+def bench_queue(size: int) -> float:
+    """
+    Returns the seconds to append then serve size items on a CircularQueue
+    :complexity: Same as time_call()
+    """
+    queue = CircularQueue(size)
+    return time_call(lambda: fill_and_empty(queue.append, queue.serve, size))
+
+
+def bench_array(size: int) -> float:
+    """
+    Returns the seconds to create an ArrayR of size items, set and get every item, then copy it
+    :complexity: Same as time_call()
+    """
+    def run() -> None:
+        array = ArrayR(size)
+        for i in range(size):
+            array[i] = i
+        for i in range(size):
+            array[i]
+        array.copy()
+    return time_call(run)
+
+
+def bench_sorted_list(container_class, size: int) -> float:
+    """
+    Returns the seconds to add size items with a handful of keys to a sorted list, then withdraw them all,
+    as a battle mode 2 team is filled and sent out
+    :param container_class: ArraySortedList or HeapSortedList
+    :complexity: Same as time_call()
+    """
+    items = [ListItem(i, i % 7) for i in range(size)]
+
+    def run() -> None:
+        container = container_class(size)
+        for item in items:
+            container.modified_add(item)
+        for _ in range(size):
+            container.withdraw()
+    return time_call(run)
+
+
+def bench_assign_team(battle_mode: int) -> float:
+    """
+    Returns the seconds to assign a full team in a battle mode
+    :complexity: Same as time_call()
+    """
+    team = PokeTeam("Ash")
+    criterion = "hp" if battle_mode == 2 else None
+    return time_call(lambda: team.set_team(battle_mode, TEAM1, criterion))
+
+
+def bench_battles(battle_mode: int, trusted: bool, battles: int = BATTLES, seed: int = SEED) -> float:
+    """
+    Returns the seconds to set up and fight a number of battles from a fixed seed, so every call fights the same
+    battles
+    :param battle_mode: An integer of the battle mode
+    :param trusted: A boolean of whether the battles are trusted
+    :complexity: Same as time_call()
+    """
+    criterion = "lvl" if battle_mode == 2 else None
+
+    def run() -> None:
+        rng = RandomStream(seed)
+        for _ in range(battles):
+            Battle("Ash", "Gary", trusted, rng).headless_battle(battle_mode, TEAM1, TEAM2, criterion, criterion)
+    return time_call(run)
+
+
+def get_benchmarks() -> list:
+    """
+    Returns every benchmark of the suite
+    :return: A list of (name, function without parameters returning seconds) tuples
+    :complexity: Best and worst is O(B), where B is the number of benchmarks
+    """
+    benchmarks = []
+    for size in SIZES:
+        benchmarks.append(("ArrayStack.push_pop[{}]".format(size), lambda size=size: bench_stack(size)))
+        benchmarks.append(("CircularQueue.append_serve[{}]".format(size), lambda size=size: bench_queue(size)))
+        benchmarks.append(("ArrayR.set_get_copy[{}]".format(size), lambda size=size: bench_array(size)))
+        for container_class in (ArraySortedList, HeapSortedList):
+            benchmarks.append(("{}.add_withdraw[{}]".format(container_class.__name__, size),
+                               lambda size=size, container_class=container_class:
+                               bench_sorted_list(container_class, size)))
+    for mode in range(3):
+        benchmarks.append(("PokeTeam.assign_team[mode {}]".format(mode), lambda mode=mode: bench_assign_team(mode)))
+    for mode in range(3):
+        for trusted in (False, True):
+            benchmarks.append(("Battle.headless_battle[mode {}, {}, {} battles]".format(
+                mode, "trusted" if trusted else "checked", BATTLES),
+                lambda mode=mode, trusted=trusted: bench_battles(mode, trusted)))
+    return benchmarks
+
+
+def run_suite(pattern: str = "") -> dict:
+    """
+    Runs every benchmark whose name contains pattern
+    :param pattern: A string every benchmark run has in its name, all of them if empty
+    :return: A dictionary of the machine the suite ran on and the seconds of every benchmark by name
+    :complexity: Best and worst is O(B), where B is the number of benchmarks run, each bounded by time_call()
+    """
+    results = {}
+    for name, benchmark in get_benchmarks():
+        if pattern in name:
+            results[name] = benchmark()
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "machine": platform.machine(), "results": results}
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> list:
+    """
+    Returns the benchmarks that got slower than their baseline by more than the tolerance
+    :param results: A dictionary returned by run_suite()
+    :param baseline: A dictionary returned by run_suite() on an earlier version
+    :param tolerance: A float of the fraction a benchmark can get slower by
+    :return: A list of (name, baseline seconds, seconds) tuples
+    :complexity: Best and worst is O(B), where B is the number of benchmarks
+    """
+    regressions = []
+    for name, seconds in results["results"].items():
+        before = baseline["results"].get(name)
+        if before is not None and seconds > before * (1 + tolerance):
+            regressions.append((name, before, seconds))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Runs the benchmark suite")
+    parser.add_argument("--output", help="File the results are written to as JSON, standard output if not given")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to check for regressions against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="Fraction a benchmark can get slower than the baseline by")
+    parser.add_argument("--filter", default="", help="Only runs the benchmarks with this in their name")
+    arguments = parser.parse_args()
+
+    suite = run_suite(arguments.filter)
+    if arguments.output is None:
+        json.dump(suite, sys.stdout, indent=2)
+        print()
+    else:
+        with open(arguments.output, "w") as file:
+            json.dump(suite, file, indent=2)
+    if arguments.baseline is not None:
+        with open(arguments.baseline) as file:
+            regressions = find_regressions(suite, json.load(file), arguments.tolerance)
+        for name, before, seconds in regressions:
+            print("Regression: {} took {:.3g} s, {:.3g} s before".format(name, seconds, before), file=sys.stderr)
+        # Non-zero exit status so a CI job fails on a regression
+        sys.exit(1 if regressions else 0)
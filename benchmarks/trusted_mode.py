@@ -0,0 +1,48 @@
+"""
+Benchmark of the time taken per exchange by checked and trusted battles
+Run from the repository's root with: python -m benchmarks.trusted_mode
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from battle import Battle
+from time import perf_counter
+import random
+
+BATTLES = 5000
+TEAM1 = [2, 2, 1, 1]
+TEAM2 = [1, 2, 3]
+
+
+def time_per_exchange(battle_mode: int, trusted: bool, battles: int = BATTLES, seed: int = 0) -> float:
+    """
+    Returns the average seconds taken per exchange over a number of battles. Both teams are assigned before the
+    timer starts, so only the fight itself is timed
+    :param battle_mode: An integer of the battle mode
+    :param trusted: A boolean of whether the battles are trusted
+    :param battles: An integer of how many battles to run
+    :param seed: An integer to seed the random module with, so checked and trusted runs play the same battles
+    :return: A float of the seconds per exchange
+    :complexity: Best and worst is O(battles * B), where B is the complexity of a single battle
+    """
+    random.seed(seed)
+    elapsed = 0.0
+    exchanges = 0
+    for _ in range(battles):
+        battle = Battle("Ash", "Gary", trusted)
+        battle.battle_mode = battle_mode
+        battle.criterion_team1 = battle.criterion_team2 = "lvl" if battle_mode == 2 else None
+        battle.team1.set_team(battle_mode, TEAM1, battle.criterion_team1)
+        battle.team2.set_team(battle_mode, TEAM2, battle.criterion_team2)
+        start = perf_counter()
+        battle.fight()
+        elapsed += perf_counter() - start
+        exchanges += battle.exchanges
+    return elapsed / exchanges
+
+
+if __name__ == '__main__':
+    for mode in range(3):
+        checked = time_per_exchange(mode, False)
+        trusted = time_per_exchange(mode, True)
+        print("Mode {}: checked {:.2f} us/exchange, trusted {:.2f} us/exchange, speedup {:.2f}x".format(
+            mode, checked * 1e6, trusted * 1e6, checked / trusted))
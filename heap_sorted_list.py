@@ -0,0 +1,348 @@
+""" Heap-based implementation of SortedList ADT.
+
+Items are kept in a binary max heap on their keys, with a position map so the key of an item already in the
+list can be changed in O(log N). Out of the items sharing a key, the one added first is withdrawn first, which is
+the same order as ArraySortedList.modified_add() and ArraySortedList.withdraw(). Also defines UnitTests for the
+class.
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+import unittest
+from sorted_list import *
+
+
+class HeapSortedList(SortedList[T]):
+    """ SortedList ADT implemented with a binary heap. Indexing gives the items in ascending order of their keys. """
+    MIN_CAPACITY = 1
+
+    def __init__(self, max_capacity: int) -> None:
+        """
+        Constructor for HeapSortedList
+        :param max_capacity: An integer of how many items the heap can hold before it is resized
+        :complexity: Best and worst is O(max_capacity) to initialise the arrays
+        """
+        SortedList.__init__(self)
+        size = max(self.MIN_CAPACITY, max_capacity)
+        # Fixed size Python lists rather than ArrayR, as every swap of the heap indexes them several times
+        self.heap = [None] * size
+        # Priority of the item at the same heap index, as (key, -order added). Larger priorities are withdrawn first,
+        # so out of the items sharing a key, the one added earlier is withdrawn first
+        self.priorities = [None] * size
+        self.positions = {}  # Heap index of every item, by the item's id
+        self.added = 0
+        self.view = None  # Items in ascending order, worked out when indexed and dropped when the heap changes
+
+    def _place(self, index: int, item: ListItem, priority: tuple) -> None:
+        """
+        Puts an item and its priority at a heap index and records its position
+        :complexity: Best and worst is O(1)
+        """
+        self.heap[index] = item
+        self.priorities[index] = priority
+        self.positions[id(item)] = index
+
+    def _rise(self, index: int) -> int:
+        """
+        Moves the item at a heap index up until its parent is withdrawn before it
+        :return: An integer of the item's new heap index
+        :complexity: Best is O(1) when the item is already in place. Worst is O(log N), where N is len(self)
+        """
+        heap = self.heap
+        priorities = self.priorities
+        positions = self.positions
+        item = heap[index]
+        priority = priorities[index]
+        while index > 0:
+            parent = (index - 1) // 2
+            if priority <= priorities[parent]:
+                break
+            # Parent moves down into the item's place, same as _place() without the method call
+            heap[index] = heap[parent]
+            priorities[index] = priorities[parent]
+            positions[id(heap[index])] = index
+            index = parent
+        self._place(index, item, priority)
+        return index
+
+    def _sink(self, index: int) -> int:
+        """
+        Moves the item at a heap index down until it is withdrawn before both of its children
+        :return: An integer of the item's new heap index
+        :complexity: Best is O(1) when the item is already in place. Worst is O(log N), where N is len(self)
+        """
+        heap = self.heap
+        priorities = self.priorities
+        positions = self.positions
+        item = heap[index]
+        priority = priorities[index]
+        child = 2 * index + 1
+        while child < self.length:
+            if child + 1 < self.length and priorities[child + 1] > priorities[child]:
+                # Picks the child withdrawn first
+                child += 1
+            if priority >= priorities[child]:
+                break
+            # Child moves up into the item's place, same as _place() without the method call
+            heap[index] = heap[child]
+            priorities[index] = priorities[child]
+            positions[id(heap[index])] = index
+            index = child
+            child = 2 * index + 1
+        self._place(index, item, priority)
+        return index
+
+    def _resize(self) -> None:
+        """
+        Doubles the size of the heap
+        :complexity: Best and worst is O(N), where N is len(self)
+        """
+        new_heap = [None] * (2 * len(self.heap))
+        new_priorities = [None] * (2 * len(self.heap))
+        for i in range(self.length):
+            new_heap[i] = self.heap[i]
+            new_priorities[i] = self.priorities[i]
+        self.heap = new_heap
+        self.priorities = new_priorities
+
+    def _remove_at(self, index: int) -> ListItem:
+        """
+        Removes and returns the item at a heap index, moving the last item of the heap into its place
+        :complexity: Best is O(1) when the last item is removed. Worst is O(log N), where N is len(self)
+        """
+        item = self.heap[index]
+        self.length -= 1
+        last = self.length
+        del self.positions[id(item)]
+        if index < last:
+            self._place(index, self.heap[last], self.priorities[last])
+            self._sink(self._rise(index))
+        self.heap[last] = None
+        self.priorities[last] = None
+        self.view = None
+        return item
+
+    def _get_view(self) -> list:
+        """
+        Returns the items in ascending order of their keys, with the items sharing a key in the reverse of the order
+        they are withdrawn, as an ArraySortedList would hold them
+        :complexity: Best is O(1) when the heap hasn't changed since the last call. Worst is O(N log N), where N is
+                     len(self)
+        """
+        if self.view is None:
+            indexes = sorted(range(self.length), key=lambda i: self.priorities[i])
+            self.view = [self.heap[i] for i in indexes]
+        return self.view
+
+    def __getitem__(self, index: int) -> ListItem:
+        """
+        Returns the item at a position of the list in ascending order, the last position being withdrawn next
+        :complexity: Same as _get_view()
+        """
+        if not -self.length <= index < self.length:
+            raise IndexError('No such index in the list')
+        return self._get_view()[index]
+
+    def __setitem__(self, index: int, item: ListItem) -> None:
+        """
+        Inserts the item at a given position, if it keeps the list in sorted order
+        :raises IndexError: If the item's key doesn't belong at that position
+        :complexity: Same as _get_view()
+        """
+        view = self._get_view()
+        if (index > 0 and view[index - 1].key > item.key) or (index < len(view) and item.key > view[index].key):
+            raise IndexError('Element should be inserted in sorted order')
+        self.modified_add(item)
+
+    def __contains__(self, item: ListItem) -> bool:
+        """
+        Checks if the item is in the list
+        :complexity: Best and worst is O(1) as the position map is looked up
+        """
+        return id(item) in self.positions
+
+    def delete_at_index(self, index: int) -> ListItem:
+        """
+        Deletes the item at a position of the list in ascending order
+        :raises IndexError: If there is no such index
+        :complexity: Best and worst is O(N log N) following _get_view()
+        """
+        if not 0 <= index < self.length:
+            raise IndexError('No such index in the list')
+        return self._remove_at(self.positions[id(self._get_view()[index])])
+
+    def index(self, item: ListItem) -> int:
+        """
+        Finds the position of the item in the list in ascending order
+        :raises ValueError: If the item isn't in the list
+        :complexity: Best and worst is O(N log N) following _get_view()
+        """
+        if item not in self:
+            raise ValueError('item not in list')
+        return self._get_view().index(item)
+
+    def remove(self, item: ListItem) -> None:
+        """
+        Removes the item from the list
+        :raises ValueError: If the item isn't in the list
+        :complexity: Best and worst is O(log N), where N is len(self), as its position is looked up
+        """
+        if item not in self:
+            raise ValueError('item not in list')
+        self._remove_at(self.positions[id(item)])
+
+    def clear(self) -> None:
+        """
+        Clears the list
+        :complexity: Best and worst is O(N), where N is len(self), to drop the references to the items
+        """
+        for i in range(self.length):
+            self.heap[i] = None
+            self.priorities[i] = None
+        SortedList.clear(self)
+        self.positions.clear()
+        self.view = None
+
+    def is_full(self) -> bool:
+        """
+        Checks if the heap is full
+        :complexity: Best and worst is O(1)
+        """
+        return len(self) >= len(self.heap)
+
+    def add(self, item: ListItem) -> None:
+        """
+        Adds an item to the list, behind the items already sharing its key
+        :raises ValueError: If the item is already in the list
+        :complexity: Best is O(1) when the item has the smallest key. Worst is O(log N), where N is len(self),
+                     or O(N) when the heap is resized
+        """
+        if item in self:
+            raise ValueError('item already in list')
+        if self.is_full():
+            self._resize()
+        self.added += 1
+        self._place(self.length, item, (item.key, -self.added))
+        self.length += 1
+        self._rise(self.length - 1)
+        self.view = None
+
+    def modified_add(self, item: ListItem) -> None:
+        """
+        Adds an item to the list. Out of the items sharing its key, it is withdrawn after the ones already added,
+        as with ArraySortedList.modified_add()
+        :param item: A ListItem to be added to the list
+        :complexity: Same as add()
+        """
+        self.add(item)
+
+    def withdraw(self) -> ListItem:
+        """
+        Removes and returns the item with the largest key.
+        Out of the items sharing the largest key, the one that has been in the list the longest is returned.
+        :return: The ListItem with the largest key
+        :raises Exception: If the list is empty
+        :complexity: Best is O(1) when a single item is left. Worst is O(log N), where N is len(self)
+        """
+        if self.is_empty():
+            raise Exception("List is empty")
+        return self._remove_at(0)
+
+    def peek(self) -> ListItem:
+        """
+        Returns the item that is withdrawn next without removing it
+        :raises Exception: If the list is empty
+        :complexity: Best and worst is O(1)
+        """
+        if self.is_empty():
+            raise Exception("List is empty")
+        return self.heap[0]
+
+    def update_key(self, item: ListItem, key: int) -> None:
+        """
+        Changes the key of an item in the list. The item is then ordered as if it was removed and added back,
+        so it is withdrawn after the items already sharing its new key
+        :param item: A ListItem in the list
+        :param key: An integer of the new key
+        :raises ValueError: If the item isn't in the list
+        :complexity: Best and worst is O(log N), where N is len(self)
+        """
+        if item not in self:
+            raise ValueError('item not in list')
+        item.key = key
+        self.added += 1
+        index = self.positions[id(item)]
+        self.priorities[index] = (key, -self.added)
+        self._sink(self._rise(index))
+        self.view = None
+
+
+class TestHeapSortedList(unittest.TestCase):
+    """ Tests for the above class."""
+    CAPACITY = 2
+    KEYS = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3]
+
+    def setUp(self):
+        self.items = [ListItem(i, key) for i, key in enumerate(self.KEYS)]
+        self.lst = HeapSortedList(self.CAPACITY)
+        for item in self.items:
+            self.lst.modified_add(item)
+
+    def test_len(self):
+        self.assertEqual(len(self.lst), len(self.KEYS))
+        self.assertTrue(HeapSortedList(self.CAPACITY).is_empty())
+
+    def test_withdraw_order(self):
+        """ Tests items are withdrawn by descending key and by insertion order within a key."""
+        expected = sorted(range(len(self.KEYS)), key=lambda i: (-self.KEYS[i], i))
+        self.assertEqual([self.lst.withdraw().value for _ in range(len(self.KEYS))], expected)
+        self.assertRaises(Exception, self.lst.withdraw)
+
+    def test_view(self):
+        """ Tests indexing gives the order an ArraySortedList would hold the items in."""
+        expected = sorted(range(len(self.KEYS)), key=lambda i: (self.KEYS[i], -i))
+        self.assertEqual([self.lst[i].value for i in range(len(self.lst))], expected)
+        self.assertEqual(self.lst.index(self.items[5]), len(self.KEYS) - 1)
+
+    def test_update_key(self):
+        """ Tests an updated item is withdrawn after the items already sharing its new key."""
+        self.lst.update_key(self.items[1], 9)
+        self.assertEqual(self.lst.withdraw().value, 5)
+        self.assertEqual(self.lst.withdraw().value, 1)
+        self.lst.update_key(self.items[7], 0)
+        self.assertEqual(self.lst[0].value, 7)
+
+    def test_remove_and_delete(self):
+        self.lst.remove(self.items[4])
+        self.assertFalse(self.items[4] in self.lst)
+        self.assertEqual(self.lst.delete_at_index(len(self.lst) - 1).value, 5)
+        self.assertEqual(len(self.lst), len(self.KEYS) - 2)
+        self.assertRaises(ValueError, self.lst.remove, self.items[4])
+
+    def test_clear(self):
+        self.lst.clear()
+        self.assertTrue(self.lst.is_empty())
+        self.lst.modified_add(self.items[0])
+        self.assertEqual(self.lst.withdraw(), self.items[0])
+
+    def test_battle_team(self):
+        """ Tests a large battle mode 2 team is kept in a heap and fights as it would in an array sorted list."""
+        from battle import Battle
+        from poke_team import PokeTeam
+        from random_stream import RandomStream
+        results = []
+        for heap_min_size in (PokeTeam.HEAP_MIN_SIZE, 1000):
+            saved, PokeTeam.HEAP_MIN_SIZE = PokeTeam.HEAP_MIN_SIZE, heap_min_size
+            try:
+                battle = Battle("Ash", "Gary", True, RandomStream(0), team_limit=400)
+                battle.set_up(2, [60, 50, 40, 1], [50, 50, 50], "hp", "lvl")
+                self.assertEqual(isinstance(battle.team1.team, HeapSortedList), heap_min_size <= 151)
+                results.append((battle.fight(), battle.exchanges, str(battle.team1), str(battle.team2)))
+            finally:
+                PokeTeam.HEAP_MIN_SIZE = saved
+        self.assertEqual(results[0], results[1])
+
+
+if __name__ == '__main__':
+    testtorun = TestHeapSortedList()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,338 @@
+"""
+Cache of the results of deterministic battles, keyed by the canonical signature of both teams, the battle mode and
+the criteria. A battle without MissingNo makes no random rolls, so the same matchup always ends the same way and
+can be answered from the cache instead of being fought again. A result from the cache has no fought teams, so it
+is only given by lookup() and play(), never by Battle.headless_battle() or battling(). The least recently used
+results are evicted once the cache is full, and results can be kept in an SQLite database so they survive restarts
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from collections import OrderedDict
+import os
+import sqlite3
+import tempfile
+import unittest
+
+DRAW = 0  # Winner stored for a draw, otherwise the number of the winning team
+
+
+class MatchupCache:
+    CAPACITY = 4096  # Results kept in memory
+
+    def __init__(self, capacity: int = CAPACITY, path: str = None) -> None:
+        """
+        Constructor for MatchupCache. A single cache can be given to every Battle of a process, and matchups
+        answered from it with lookup() or play()
+        :param capacity: An integer of how many results are kept in memory before the least recently used is evicted
+        :param path: A string of an SQLite database file every result is also stored in, kept in memory only if None
+        :raises TypeError: If capacity isn't an integer
+        :raises ValueError: If capacity is lesser than or equal to 0
+        :complexity: Best and worst is O(1) as local variables are initialised
+        """
+        if type(capacity) != int:
+            raise TypeError("Capacity must be an integer")
+        elif capacity <= 0:
+            raise ValueError("Capacity must be above 0")
+        self.capacity = capacity
+        self.entries = OrderedDict()  # (winner, exchanges) by signature, least recently used first
+        self.hits = 0  # Lookups answered from memory
+        self.disk_hits = 0  # Lookups answered from the database after missing in memory
+        self.misses = 0  # Lookups of matchups not stored yet
+        self.evictions = 0
+        self.uncacheable = 0  # Lookups skipped as the matchup has a MissingNo
+        self.connection = None
+        if path is not None:
+            self.connection = sqlite3.connect(path)
+            self.connection.execute("CREATE TABLE IF NOT EXISTS matchups "
+                                    "(signature TEXT PRIMARY KEY, winner INTEGER, exchanges INTEGER)")
+
+    def get_signature(self, battle_mode: int, team1_head_count: list, team2_head_count: list,
+                      criterion_team1: str = None, criterion_team2: str = None) -> str:
+        """
+        Returns the canonical signature of a matchup, which is the same for every battle that ends the same way
+        :param battle_mode: An integer of the battle mode
+        :param team1_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+                                 for team 1
+        :param team2_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+                                 for team 2
+        :param criterion_team1: A string of the criterion chosen for team 1, only used when battle mode is 2
+        :param criterion_team2: A string of the criterion chosen for team 2, only used when battle mode is 2
+        :return: A string of the battle mode, both teams' species counts and, in battle mode 2, both criteria. None
+                 if a team has a MissingNo, as the battle then depends on random rolls
+        :complexity: Best and worst is O(1) as every head count has at most 4 elements
+        """
+        # A team given without its MissingNo count has none
+        head_counts = [list(head_count) + [0] * (4 - len(head_count))
+                       for head_count in (team1_head_count, team2_head_count)]
+        if head_counts[0][3] > 0 or head_counts[1][3] > 0:
+            return None
+        if battle_mode == 2:
+            criteria = (criterion_team1, criterion_team2)
+        else:
+            # Criteria are only used in battle mode 2, so the same teams match whatever was chosen
+            criteria = ("-", "-")
+        return "{}|{}|{}|{}|{}".format(battle_mode, ",".join(str(count) for count in head_counts[0]),
+                                       ",".join(str(count) for count in head_counts[1]), *criteria)
+
+    def get_battle_signature(self, battle) -> str:
+        """
+        Returns the canonical signature of the matchup a battle's teams were assigned from
+        :param battle: A Battle object whose teams have been assigned
+        :return: A string returned by get_signature(). None if a team has a MissingNo or wasn't assigned from a head
+                 count, such as a team decoded from a snapshot, whose pokemons may have battled already
+        :complexity: Best and worst is O(1)
+        """
+        if battle.team1.head_count is None or battle.team2.head_count is None:
+            return None
+        return self.get_signature(battle.battle_mode, battle.team1.head_count, battle.team2.head_count,
+                                  battle.criterion_team1, battle.criterion_team2)
+
+    def get(self, signature: str) -> tuple:
+        """
+        Returns the stored result of a matchup, marking it as the most recently used
+        :param signature: A string returned by get_signature()
+        :return: A tuple of the winner, DRAW or the number of the winning team, and the number of exchanges. None if
+                 the matchup isn't stored
+        :complexity: Best and worst is O(1), on top of a database lookup when it misses in memory
+        """
+        result = self.entries.get(signature)
+        if result is not None:
+            self.entries.move_to_end(signature)
+            self.hits += 1
+            return result
+        if self.connection is not None:
+            row = self.connection.execute("SELECT winner, exchanges FROM matchups WHERE signature = ?",
+                                          (signature,)).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                self.store(signature, row)
+                return row
+        self.misses += 1
+        return None
+
+    def put(self, signature: str, result: tuple) -> None:
+        """
+        Stores the result of a matchup, in the database too if the cache has one
+        :param signature: A string returned by get_signature()
+        :param result: A tuple of the winner, DRAW or the number of the winning team, and the number of exchanges
+        :complexity: Best and worst is O(1), on top of a database write
+        """
+        self.store(signature, result)
+        if self.connection is not None:
+            self.connection.execute("INSERT OR REPLACE INTO matchups VALUES (?, ?, ?)", (signature, *result))
+
+    def store(self, signature: str, result: tuple) -> None:
+        """
+        Stores a result in memory as the most recently used, evicting the least recently used if the cache is full
+        :complexity: Best and worst is O(1)
+        """
+        self.entries[signature] = tuple(result)
+        self.entries.move_to_end(signature)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def lookup(self, battle_mode: int, team1_head_count: list, team2_head_count: list,
+               criterion_team1: str = None, criterion_team2: str = None) -> tuple:
+        """
+        Returns the stored result of a matchup without fighting it. The parameters are those of get_signature()
+        :return: A tuple of the winner, DRAW or the number of the winning team, and the number of exchanges. None if
+                 the matchup isn't stored or has a MissingNo
+        :complexity: Best and worst is O(1), on top of a database lookup when it misses in memory
+        """
+        signature = self.get_signature(battle_mode, team1_head_count, team2_head_count, criterion_team1,
+                                       criterion_team2)
+        if signature is None:
+            self.uncacheable += 1
+            return None
+        return self.get(signature)
+
+    def record(self, battle) -> None:
+        """
+        Stores the result of a battle that has just been fought from the teams it was assigned. Nothing is stored if
+        the battle has a MissingNo or teams that weren't assigned from a head count
+        :param battle: A Battle object whose fight is over
+        :raises ValueError: If the battle's fight isn't over
+        :complexity: Best and worst is O(1), on top of a database write
+        """
+        if not battle.is_over():
+            raise ValueError("Battle hasn't been fought")
+        signature = self.get_battle_signature(battle)
+        if signature is not None:
+            # The winner is stored as a team number, so it holds whatever the trainers are called
+            if battle.team1.team.is_empty() and battle.team2.team.is_empty():
+                team = DRAW
+            elif battle.team2.team.is_empty():
+                team = 1
+            else:
+                team = 2
+            self.put(signature, (team, battle.exchanges))
+
+    def play(self, battle, battle_mode: int, team1_head_count: list, team2_head_count: list,
+             criterion_team1: str = None, criterion_team2: str = None) -> tuple:
+        """
+        Returns the result of a matchup from the cache if it is stored. Otherwise the battle is set up and fought as
+        by Battle.headless_battle() and its result stored. On a hit the battle is left as it was, as are its log,
+        observers and profiler, so a caller needing the fought teams uses Battle.headless_battle() instead
+        :param battle: A Battle object the matchup is fought with if it isn't stored, whose trainers name the winner
+        :return: A tuple of the winner's name, or "Draw", and the number of exchanges
+        :raises ValueError: See Battle.headless_battle()
+        :complexity: Best is O(1) when the matchup is stored. Worst is the complexity of Battle.headless_battle()
+        """
+        result = self.lookup(battle_mode, team1_head_count, team2_head_count, criterion_team1, criterion_team2)
+        if result is not None:
+            team, exchanges = result
+            if team == DRAW:
+                return "Draw", exchanges
+            return battle.team1.trainer if team == 1 else battle.team2.trainer, exchanges
+        battle.set_up(battle_mode, team1_head_count, team2_head_count, criterion_team1, criterion_team2)
+        winner = battle.fight()
+        if battle.cache is not self:
+            # A battle given this cache has already stored its result
+            self.record(battle)
+        return winner, battle.exchanges
+
+    def hit_rate(self) -> float:
+        """
+        Returns the fraction of lookups answered from memory or the database
+        :complexity: Best and worst is O(1)
+        """
+        lookups = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / lookups if lookups > 0 else 0.0
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the cache's counters
+        :return: A dictionary of the hits, disk hits, misses, evictions, uncacheable battles, results in memory and
+                 hit rate
+        :complexity: Best and worst is O(1)
+        """
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "evictions": self.evictions,
+                "uncacheable": self.uncacheable, "size": len(self.entries), "hit_rate": self.hit_rate()}
+
+    def flush(self) -> None:
+        """
+        Commits the results stored since the last flush to the database, if the cache has one
+        :complexity: Best and worst is O(R), where R is the number of results to commit
+        """
+        if self.connection is not None:
+            self.connection.commit()
+
+    def close(self) -> None:
+        """
+        Flushes and closes the database, if the cache has one. The cache stays usable in memory
+        :complexity: Same as flush()
+        """
+        if self.connection is not None:
+            self.flush()
+            self.connection.close()
+            self.connection = None
+
+    def __len__(self) -> int:
+        """
+        Returns the number of results kept in memory
+        :complexity: Best and worst is O(1)
+        """
+        return len(self.entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class TestMatchupCache(unittest.TestCase):
+    """ Tests for the above class."""
+    MATCHUPS = ((0, [2, 2, 2], [1, 3, 2], None, None), (1, [1, 1, 1], [3, 0, 0], None, None),
+                (2, [2, 2, 2], [1, 3, 2], "hp", "lvl"), (2, [2, 2, 2], [1, 3, 2], "lvl", "hp"))
+
+    def setUp(self):
+        from battle import Battle
+        from random_stream import RandomStream
+        self.battles = [Battle("Ash", "Gary", True, RandomStream(0)) for i in range(2)]
+        # Results of every matchup fought without a cache
+        self.results = []
+        for matchup in self.MATCHUPS:
+            winner = self.battles[0].headless_battle(*matchup)
+            self.results.append((winner, self.battles[0].exchanges))
+
+    def test_lru_eviction(self):
+        """ Tests the least recently used result is evicted once the cache is full."""
+        cache = MatchupCache(2)
+        cache.put("a", (1, 10))
+        cache.put("b", (2, 20))
+        self.assertEqual(cache.get("a"), (1, 10))
+        cache.put("c", (DRAW, 30))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), (1, 10))
+        self.assertEqual(cache.get("c"), (DRAW, 30))
+        self.assertRaises(ValueError, MatchupCache, 0)
+        self.assertRaises(TypeError, MatchupCache, "2")
+
+    def test_hits_and_misses(self):
+        """ Tests matchups are fought once, then answered from the cache with the same result."""
+        cache = MatchupCache()
+        for i in range(2):
+            for matchup, result in zip(self.MATCHUPS, self.results):
+                self.assertEqual(cache.play(self.battles[1], *matchup), result)
+        self.assertEqual(cache.misses, len(self.MATCHUPS))
+        self.assertEqual(cache.hits, len(self.MATCHUPS))
+        self.assertEqual(cache.hit_rate(), 0.5)
+        # Criteria only matter in battle mode 2
+        self.assertEqual(cache.lookup(0, [2, 2, 2], [1, 3, 2], "spd", "atk"), cache.lookup(0, [2, 2, 2], [1, 3, 2]))
+        self.assertIsNone(cache.lookup(0, [2, 2, 1, 1], [1, 3, 2]))
+        self.assertEqual(cache.uncacheable, 1)
+
+    def test_headless_battle(self):
+        """ Tests a battle given a cache is always fought and stores its result."""
+        from battle import Battle
+        cache = MatchupCache()
+        battle = Battle("Ash", "Gary", True, cache=cache)
+        for i in range(2):
+            for matchup, result in zip(self.MATCHUPS, self.results):
+                self.assertEqual(battle.headless_battle(*matchup), result[0])
+                self.assertTrue(battle.is_over())
+                self.assertEqual(battle.get_result(), result[0])
+        self.assertEqual(len(cache), len(self.MATCHUPS))
+        self.assertEqual(cache.hits + cache.misses, 0)
+        self.assertEqual(cache.play(battle, *self.MATCHUPS[0]), self.results[0])
+        self.assertEqual(cache.hits, 1)
+
+    def test_decoded_battle(self):
+        """ Tests a battle decoded from a snapshot isn't stored, as its teams weren't assigned from head counts."""
+        from snapshot import encode_battle, decode_battle
+        battle = self.battles[1]
+        battle.set_up(*self.MATCHUPS[0])
+        battle = decode_battle(encode_battle(battle))
+        battle.fight()
+        cache = MatchupCache()
+        self.assertIsNone(cache.get_battle_signature(battle))
+        cache.record(battle)
+        self.assertEqual(len(cache), 0)
+
+    def test_sqlite(self):
+        """ Tests results stored in the database are read back by a new cache."""
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "matchups.sqlite")
+        try:
+            with MatchupCache(path=path) as cache:
+                for matchup in self.MATCHUPS:
+                    cache.play(self.battles[1], *matchup)
+            with MatchupCache(path=path) as cache:
+                for matchup, result in zip(self.MATCHUPS, self.results):
+                    self.assertEqual(cache.play(self.battles[1], *matchup), result)
+                self.assertEqual(cache.disk_hits, len(self.MATCHUPS))
+                self.assertEqual(cache.misses, 0)
+                self.assertEqual(len(cache), len(self.MATCHUPS))
+        finally:
+            os.remove(path)
+            os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    testtorun = TestMatchupCache()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,223 @@
+"""
+Exact win, draw and loss probabilities of battles involving MissingNo in battle mode 0 and 1
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from battle import Battle
+from pokemon import Charmander, Bulbasaur, Squirtle
+from MissingNo import MissingNo
+from GlitchMon import GlitchMon
+from stack_adt import ArrayStack
+from fractions import Fraction
+from functools import lru_cache
+import unittest
+
+SPECIES = (Charmander, Bulbasaur, Squirtle, MissingNo)
+
+
+class BranchingRandom:
+    def __init__(self, choices: list) -> None:
+        """
+        Constructor for BranchingRandom, a random number generator that plays a chosen branch of every roll.
+        Rolls beyond the chosen branches take their first branch, and every roll made is recorded so the
+        other branches can be explored afterwards
+        :param choices: A list of integer branch indexes for the first rolls
+        :complexity: Best and worst is O(1) as local variables are initialised
+        """
+        self.choices = choices
+        self.taken = []
+        self.branch_counts = []
+        self.probability = Fraction(1)
+
+    def get_branches(self, a: int, b: int) -> list:
+        """
+        Returns the distinct branches of a roll as (value, probability) pairs.
+        The superpower roll between 1 and 100 only matters on whether it is within GlitchMon.SUPERPOWER_CHANCE,
+        every other roll is split into each of its values
+        :complexity: Best and worst is O(b - a)
+        """
+        if (a, b) == (1, 100):
+            chance = GlitchMon.SUPERPOWER_CHANCE
+            return [(chance, Fraction(chance, 100)), (100, Fraction(100 - chance, 100))]
+        return [(value, Fraction(1, b - a + 1)) for value in range(a, b + 1)]
+
+    def randint(self, a: int, b: int) -> int:
+        """
+        Returns the value of the chosen branch of this roll, the first branch if none was chosen
+        :complexity: Best and worst is O(b - a) following get_branches()
+        """
+        branches = self.get_branches(a, b)
+        depth = len(self.taken)
+        choice = self.choices[depth] if depth < len(self.choices) else 0
+        self.taken.append(choice)
+        self.branch_counts.append(len(branches))
+        value, probability = branches[choice]
+        self.probability *= probability
+        return value
+
+
+def make_pokemon(state: tuple, rng: BranchingRandom):
+    """
+    Returns a pokemon object in the given state
+    :param state: A tuple of (SPECIES_ID, hp, level)
+    :param rng: The BranchingRandom given to a MissingNo
+    :complexity: Best and worst is O(1)
+    """
+    species, hp, level = state
+    pokemon = MissingNo(rng) if SPECIES[species] is MissingNo else SPECIES[species]()
+    pokemon.hp = hp
+    pokemon.level = level
+    return pokemon
+
+
+@lru_cache(maxsize=None)
+def exchange_outcomes(state1: tuple, state2: tuple) -> tuple:
+    """
+    Returns every possible result of sending 2 pokemons out against each other with its exact probability.
+    The exchange is played by Battle itself once for every combination of MissingNo's rolls
+    :param state1: A tuple of (SPECIES_ID, hp, level) of team 1's pokemon
+    :param state2: A tuple of (SPECIES_ID, hp, level) of team 2's pokemon
+    :return: A tuple of (state1, state2, probability), where a state is None if the pokemon fainted
+    :complexity: Best is O(1) without a MissingNo. Worst is O(R) with R combinations of rolls, at most 12 per
+                 MissingNo hit
+    """
+    outcomes = {}
+    pending = [[]]
+    while pending:
+        choices = pending.pop()
+        rng = BranchingRandom(choices)
+        pokemon1 = make_pokemon(state1, rng)
+        pokemon2 = make_pokemon(state2, rng)
+        battle = Battle("1", "2", True, rng)
+        battle.battle_mode = 0
+        battle.team1.team = ArrayStack(1)
+        battle.team2.team = ArrayStack(1)
+        battle._compare_speed(pokemon1, pokemon2)
+
+        # Every roll after the chosen ones took its first branch, so its other branches are still to be explored
+        for depth in range(len(choices), len(rng.taken)):
+            for choice in range(1, rng.branch_counts[depth]):
+                pending.append(rng.taken[:depth] + [choice])
+        result = tuple((pokemon.SPECIES_ID, pokemon.hp, pokemon.level) if pokemon.hp > 0 else None
+                       for pokemon in (pokemon1, pokemon2))
+        outcomes[result] = outcomes.get(result, Fraction(0)) + rng.probability
+    return tuple((result[0], result[1], probability) for result, probability in outcomes.items())
+
+
+@lru_cache(maxsize=None)
+def team_probabilities(team1: tuple, team2: tuple, battle_mode: int) -> tuple:
+    """
+    Returns the exact probabilities of a team battle's results, memoized on the state of both teams
+    :param team1: A tuple of (SPECIES_ID, hp, level) for team 1, in the order they are sent out
+    :param team2: A tuple of (SPECIES_ID, hp, level) for team 2, in the order they are sent out
+    :param battle_mode: An integer of the battle mode, 0 or 1
+    :return: A tuple of Fractions (team 1 wins, draw, team 2 wins)
+    :complexity: Best is O(1) when cached. Worst is O(S * R), where S is the number of reachable states of both
+                 teams and R is the number of results of an exchange
+    """
+    if not team1 and not team2:
+        return Fraction(0), Fraction(1), Fraction(0)
+    elif not team1:
+        return Fraction(0), Fraction(0), Fraction(1)
+    elif not team2:
+        return Fraction(1), Fraction(0), Fraction(0)
+    win = draw = loss = Fraction(0)
+    for state1, state2, probability in exchange_outcomes(team1[0], team2[0]):
+        # Survivors go back on top of the stack in battle mode 0 and to the back of the queue in battle mode 1
+        rest1 = team1[1:]
+        rest2 = team2[1:]
+        if state1 is not None:
+            rest1 = (state1,) + rest1 if battle_mode == 0 else rest1 + (state1,)
+        if state2 is not None:
+            rest2 = (state2,) + rest2 if battle_mode == 0 else rest2 + (state2,)
+        next_win, next_draw, next_loss = team_probabilities(rest1, rest2, battle_mode)
+        win += probability * next_win
+        draw += probability * next_draw
+        loss += probability * next_loss
+    return win, draw, loss
+
+
+def build_team(head_count: list) -> tuple:
+    """
+    Returns a team as (SPECIES_ID, hp, level) tuples in the order PokeTeam.assign_team() sends them out,
+    which is Charmanders, Bulbasaurs, Squirtles then MissingNo in both battle mode 0 and 1
+    :param head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+    :return: A tuple of (SPECIES_ID, hp, level)
+    :complexity: Best and worst is O(sum(head_count))
+    """
+    team = []
+    for species, count in enumerate(head_count):
+        for i in range(count):
+            team.append((species, SPECIES[species]().get_hp(), 1))
+    return tuple(team)
+
+
+def win_probabilities(team1_head_count: list, team2_head_count: list, battle_mode: int) -> tuple:
+    """
+    Returns the exact probabilities of team 1 winning, a draw and team 2 winning a battle between 2 compositions
+    :param team1_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+    :param team2_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+    :param battle_mode: An integer of the battle mode, 0 or 1
+    :return: A tuple of Fractions (team 1 wins, draw, team 2 wins) adding up to 1
+    :raises ValueError: If battle_mode isn't 0 or 1
+    :complexity: Same as team_probabilities()
+    """
+    if battle_mode not in (0, 1):
+        raise ValueError("Battle mode input must be 0 or 1")
+    return team_probabilities(build_team(team1_head_count), build_team(team2_head_count), battle_mode)
+
+
+def matchup_probabilities(state1: tuple, state2: tuple) -> tuple:
+    """
+    Returns the exact probabilities of 2 pokemons fighting until one or both faint, as in battle mode 0
+    :param state1: A tuple of (SPECIES_ID, hp, level) of team 1's pokemon
+    :param state2: A tuple of (SPECIES_ID, hp, level) of team 2's pokemon
+    :return: A tuple of Fractions (pokemon 1 wins, both faint, pokemon 2 wins)
+    :complexity: Same as team_probabilities()
+    """
+    return team_probabilities((state1,), (state2,), 0)
+
+
+class TestMissingNoOdds(unittest.TestCase):
+    """ Tests for the above functions."""
+    # Compositions without a MissingNo, whose battles have no random rolls
+    TEAMS = ([1, 1, 1], [2, 0, 1], [0, 3, 0], [1, 2, 3], [3, 0, 0], [0, 0, 2])
+    # Compositions with a MissingNo
+    MISSINGNO_TEAMS = ([0, 0, 0, 1], [1, 0, 0, 1], [0, 1, 1, 1], [1, 1, 1, 1])
+
+    def test_sum(self):
+        """ Tests the probabilities of a battle with MissingNo add up to 1."""
+        for battle_mode in range(2):
+            for team1 in self.MISSINGNO_TEAMS:
+                for team2 in self.TEAMS + self.MISSINGNO_TEAMS:
+                    probabilities = win_probabilities(team1, team2, battle_mode)
+                    self.assertEqual(sum(probabilities), 1)
+                    self.assertTrue(all(0 <= probability <= 1 for probability in probabilities))
+
+    def test_without_missingno(self):
+        """ Tests a battle without MissingNo has a certain result, which is the one Battle.fight() gives."""
+        from battle import Battle
+        results = {"Ash": (1, 0, 0), "Draw": (0, 1, 0), "Gary": (0, 0, 1)}
+        for battle_mode in range(2):
+            for team1 in self.TEAMS:
+                for team2 in self.TEAMS:
+                    battle = Battle("Ash", "Gary")
+                    battle.set_up(battle_mode, team1, team2)
+                    self.assertEqual(win_probabilities(team1, team2, battle_mode), results[battle.fight()])
+
+    def test_matchup(self):
+        """ Tests a MissingNo matchup worked out by hand."""
+        # Charmander is faster, and its attack of 7 makes a MissingNo with 3 HP faint unless the superpower adds 1 HP
+        # (25% * 2/3) and the defence roll only halves the damage (2/3). MissingNo then strikes back with at least
+        # 5, making the Charmander with 2 HP faint
+        self.assertEqual(matchup_probabilities((3, 3, 1), (0, 2, 1)), (Fraction(1, 9), Fraction(0), Fraction(8, 9)))
+
+    def test_bad_mode(self):
+        """ Tests battle mode 2 is rejected."""
+        self.assertRaises(ValueError, win_probabilities, [1, 1, 1, 1], [1, 1, 1], 2)
+
+
+if __name__ == '__main__':
+    testtorun = TestMissingNoOdds()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,272 @@
+"""
+Observer interface for the exchanges of a battle, with callbacks carrying integer fields only so observers can
+analyse a battle without anything being formatted as a string. Pokemons are given by their team, 1 or 2, and
+SPECIES_ID. A battle only pays for dispatching events while it has observers subscribed
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from GlitchMon import GlitchMon
+import unittest
+
+# Methods of a Battle wrapped by the dispatcher while it has observers, with the name of the dispatcher's method
+# making the wrapper. The checked and unchecked version of a method are both wrapped, so every wrapper calls the
+# method it wraps and the battle is changed exactly as it would be unobserved
+OBSERVED_METHODS = (("compare_speed", "wrap_compare_speed"), ("_compare_speed", "wrap_compare_speed"),
+                    ("strike", "wrap_strike"), ("_strike", "wrap_strike"),
+                    ("lose_hp", "wrap_lose_hp"), ("_lose_hp", "wrap_lose_hp"),
+                    ("level_up", "wrap_level_up"), ("_level_up", "wrap_level_up"),
+                    ("returning", "wrap_returning"), ("_returning", "wrap_returning"))
+
+
+class BattleObserver:
+    """
+    Base class of battle observers, every callback of which does nothing, so an observer only overrides the events
+    it is interested in
+    """
+    def round_start(self, exchange: int, species_1: int, species_2: int, hp_1: int, hp_2: int) -> None:
+        """
+        Called when team 1's and team 2's pokemons start an exchange
+        :param exchange: An integer of the number of exchanges fought before this one
+        """
+        pass
+
+    def attack(self, attacker_team: int, attacker_species: int, defender_team: int, defender_species: int) -> None:
+        """
+        Called when a pokemon attacks, before the defender takes the damage
+        """
+        pass
+
+    def damage_applied(self, team: int, species: int, hp_lost: int, hp: int) -> None:
+        """
+        Called when a pokemon has taken damage from an attack, or lost 1 HP at the end of an exchange
+        :param hp_lost: An integer of the HP lost, negative if a superpower added more HP than the attack took
+        :param hp: An integer of the pokemon's HP afterwards
+        """
+        pass
+
+    def faint(self, team: int, species: int) -> None:
+        """
+        Called when a pokemon's HP drops to 0 or below
+        """
+        pass
+
+    def level_up(self, team: int, species: int, level: int) -> None:
+        """
+        Called when the pokemon left standing after an exchange levels up
+        :param level: An integer of the pokemon's new level
+        """
+        pass
+
+    def returned_to_team(self, team: int, species: int, hp: int, level: int) -> None:
+        """
+        Called when a pokemon that didn't faint is added back to its team
+        """
+        pass
+
+    def superpower(self, team: int, species: int, result: int) -> None:
+        """
+        Called when a defending GlitchMon has rolled for its superpower
+        :param result: An integer of the GlitchMon's SUPERPOWER_* result code
+        """
+        pass
+
+
+class BattleDispatcher:
+    def __init__(self, battle) -> None:
+        """
+        Constructor for BattleDispatcher, which wraps the battle's exchange methods with ones firing events to every
+        observer subscribed once added to the battle's hooks
+        :param battle: A Battle object
+        :complexity: Best and worst is O(1) as local variables are initialised
+        """
+        self.battle = battle
+        self.observers = []
+
+    def install(self, battle) -> list:
+        """
+        Sets the wrappers of the observed methods on the battle, called by Battle.install_hooks()
+        :param battle: The Battle object this dispatcher was made for
+        :return: A list of the (object, method name) pairs set
+        :complexity: Best and worst is O(1) as a fixed number of methods are wrapped
+        """
+        installed = []
+        for method, wrapper in OBSERVED_METHODS:
+            setattr(battle, method, getattr(self, wrapper)(getattr(battle, method)))
+            installed.append((battle, method))
+        return installed
+
+    def wrap_compare_speed(self, compare_speed):
+        """
+        Returns a function that fires round_start then calls compare_speed()
+        :param compare_speed: A Battle's compare_speed() or _compare_speed() method
+        :return: A function with the same parameters and return value as compare_speed
+        :complexity: Best and worst is O(S) on top of compare_speed, where S is the number of observers
+        """
+        def observe_compare_speed(pokemon_1, pokemon_2) -> bool:
+            for observer in self.observers:
+                observer.round_start(self.battle.exchanges - 1, pokemon_1.SPECIES_ID, pokemon_2.SPECIES_ID,
+                                     pokemon_1.hp, pokemon_2.hp)
+            return compare_speed(pokemon_1, pokemon_2)
+        return observe_compare_speed
+
+    def wrap_strike(self, strike):
+        """
+        Returns a function that fires attack, calls strike(), then fires superpower, damage_applied and faint
+        :param strike: A Battle's strike() or _strike() method
+        :return: A function with the same parameters as strike
+        :complexity: Best and worst is O(S) on top of strike, where S is the number of observers
+        """
+        def observe_strike(attacker, defender, attacker_team: int, defender_team: int) -> None:
+            for observer in self.observers:
+                observer.attack(attacker_team, attacker.SPECIES_ID, defender_team, defender.SPECIES_ID)
+            hp = defender.hp
+            glitch = isinstance(defender, GlitchMon)
+            # Only a superpower rolled by this attack is fired, so the code of an earlier one is cleared
+            if glitch:
+                defender.last_superpower = GlitchMon.SUPERPOWER_NONE
+            strike(attacker, defender, attacker_team, defender_team)
+            if glitch and defender.last_superpower != GlitchMon.SUPERPOWER_NONE:
+                for observer in self.observers:
+                    observer.superpower(defender_team, defender.SPECIES_ID, defender.last_superpower)
+            self.damaged(defender, defender_team, hp)
+        return observe_strike
+
+    def wrap_lose_hp(self, lose_hp):
+        """
+        Returns a function that calls lose_hp(), then fires damage_applied and faint
+        :param lose_hp: A Battle's lose_hp() or _lose_hp() method
+        :return: A function with the same parameters as lose_hp
+        :complexity: Best and worst is O(S) on top of lose_hp, where S is the number of observers
+        """
+        def observe_lose_hp(pokemon, team: int) -> None:
+            hp = pokemon.hp
+            lose_hp(pokemon, team)
+            self.damaged(pokemon, team, hp)
+        return observe_lose_hp
+
+    def wrap_level_up(self, level_up):
+        """
+        Returns a function that calls level_up(), then fires level_up
+        :param level_up: A Battle's level_up() or _level_up() method
+        :return: A function with the same parameters as level_up
+        :complexity: Best and worst is O(S) on top of level_up, where S is the number of observers
+        """
+        def observe_level_up(pokemon, team: int) -> None:
+            level_up(pokemon, team)
+            for observer in self.observers:
+                observer.level_up(team, pokemon.SPECIES_ID, pokemon.level)
+        return observe_level_up
+
+    def wrap_returning(self, returning):
+        """
+        Returns a function that calls returning(), then fires returned_to_team
+        :param returning: A Battle's returning() or _returning() method
+        :return: A function with the same parameters as returning
+        :complexity: Best and worst is O(S) on top of returning, where S is the number of observers
+        """
+        def observe_returning(pokemon, team: int) -> None:
+            returning(pokemon, team)
+            for observer in self.observers:
+                observer.returned_to_team(team, pokemon.SPECIES_ID, pokemon.hp, pokemon.level)
+        return observe_returning
+
+    def damaged(self, pokemon, team: int, hp: int) -> None:
+        """
+        Fires damage_applied for a pokemon that had hp before, and faint if it has fainted
+        :complexity: Best and worst is O(S), where S is the number of observers
+        """
+        for observer in self.observers:
+            observer.damage_applied(team, pokemon.SPECIES_ID, hp - pokemon.hp, pokemon.hp)
+        if pokemon.hp <= 0:
+            for observer in self.observers:
+                observer.faint(team, pokemon.SPECIES_ID)
+
+
+class TestBattleDispatcher(unittest.TestCase):
+    """ Tests for the above class."""
+    METHODS = ("fight", "compare_speed", "_compare_speed", "match", "_match", "match_same_speed", "_match_same_speed",
+               "strike", "_strike", "lose_hp", "_lose_hp", "level_up", "_level_up", "returning", "_returning")
+
+    def setUp(self):
+        from battle import Battle
+        from profiler import BattleProfiler
+        from random_stream import RandomStream
+        self.battle = Battle("Ash", "Gary", True, RandomStream(0))
+        self.profiler = BattleProfiler()
+        self.observer = BattleObserver()
+        self.winner = self.fight()
+        self.exchanges = self.battle.exchanges
+
+    def fight(self) -> str:
+        self.battle.set_up(1, [2, 2, 2], [1, 3, 2])
+        return self.battle.fight()
+
+    def assertFought(self):
+        """ Asserts the battle ends as the unwrapped one did."""
+        self.assertEqual(self.fight(), self.winner)
+        self.assertEqual(self.battle.exchanges, self.exchanges)
+
+    def assertUnwrapped(self):
+        """ Asserts the battle runs its class's methods again."""
+        for method in self.METHODS:
+            self.assertNotIn(method, self.battle.__dict__)
+        self.assertEqual(self.battle.hooks, [])
+        self.assertFought()
+
+    def test_subscribe_then_attach(self):
+        """ Tests removing the dispatcher keeps the wrappers of a profiler attached after it."""
+        self.battle.subscribe(self.observer)
+        self.profiler.attach(self.battle)
+        self.battle.unsubscribe(self.observer)
+        self.assertFought()
+        self.assertEqual(self.profiler.counters["exchanges"], self.exchanges)
+        self.profiler.detach(self.battle)
+        self.assertUnwrapped()
+        self.assertEqual(self.profiler.counters["fights"], 1)
+
+    def test_attach_then_subscribe(self):
+        """ Tests detaching a profiler keeps the dispatcher subscribed after it."""
+        self.profiler.attach(self.battle)
+        self.battle.subscribe(self.observer)
+        self.assertFought()
+        self.assertEqual(self.profiler.calls["match"] + self.profiler.calls["match_same_speed"], self.exchanges)
+        self.profiler.detach(self.battle)
+        self.assertEqual(self.battle.returning.__name__, "observe_returning")
+        self.assertFought()
+        self.assertEqual(self.profiler.counters["fights"], 1)
+        self.battle.unsubscribe(self.observer)
+        self.assertUnwrapped()
+
+    def test_untrusted(self):
+        """ Tests an untrusted battle keeps calling the checked methods while observed."""
+        from battle import Battle
+        from random_stream import RandomStream
+
+        class CountedBattle(Battle):
+            def returning(self, pokemon, team):
+                self.counts[0] += 1
+                super().returning(pokemon, team)
+
+            def _returning(self, pokemon, team):
+                self.counts[1] += 1
+                super()._returning(pokemon, team)
+
+        for battle_mode in range(3):
+            results = []
+            for observed in (False, True):
+                battle = CountedBattle("Ash", "Gary", False, RandomStream(0))
+                battle.counts = [0, 0]
+                if observed:
+                    battle.subscribe(self.observer)
+                results.append((battle.headless_battle(battle_mode, [2, 2, 1, 1], [1, 2, 2, 1], "lvl", "lvl"),
+                                battle.exchanges, battle.counts))
+            self.assertEqual(results[1], results[0])
+            self.assertEqual(results[1][2][1], 0)
+            self.assertGreater(results[1][2][0], 0)
+        self.assertRaises(TypeError, battle.returning, "Pikachu", 1)
+
+
+if __name__ == '__main__':
+    testtorun = TestBattleDispatcher()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -0,0 +1,226 @@
+"""
+Memoized solver for the outcome of deterministic battles, which don't involve MissingNo, in battle mode 0 and 1
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from pokemon import Charmander, Bulbasaur, Squirtle
+from type_chart import get_damage_table
+from collections import deque
+from functools import lru_cache
+import unittest
+
+CACHE_SIZE = 1 << 16
+SPECIES = (Charmander, Bulbasaur, Squirtle)
+
+# One pokemon per species and side, only used to work out speeds and damage at a given level
+attackers = [species() for species in SPECIES]
+defenders = [species() for species in SPECIES]
+
+
+def get_hp_loss(attacker_species: int, attacker_level: int, defender_species: int, defender_level: int) -> int:
+    """
+    Returns the hp the defender loses to one attack, before being capped at its hp
+    :param attacker_species: An integer SPECIES_ID of the attacking pokemon
+    :param attacker_level: An integer level of the attacking pokemon
+    :param defender_species: An integer SPECIES_ID of the defending pokemon
+    :param defender_level: An integer level of the defending pokemon
+    :return: An integer of the hp lost
+    :complexity: Best is O(1) when the levels are in the damage table. Worst is O(1) following get_damage()
+    """
+    attacker = attackers[attacker_species]
+    defender = defenders[defender_species]
+    attacker.level = attacker_level
+    defender.level = defender_level
+    hp_loss = get_damage_table().get_hp_loss(attacker, defender)
+    if hp_loss is None:
+        # Levels are beyond the table, so the damage is worked out by attacking a defender with plenty of hp
+        defender.hp = get_damage_table().PROBE_HP
+        defender.get_damage(attacker)
+        hp_loss = get_damage_table().PROBE_HP - defender.hp
+    return hp_loss
+
+
+def get_speed(species: int, level: int) -> int:
+    """
+    Returns the speed of a pokemon at a given level
+    :complexity: Best and worst is O(1)
+    """
+    pokemon = attackers[species]
+    pokemon.level = level
+    return pokemon.get_speed()
+
+
+def play_exchange(species1: int, hp1: int, level1: int, species2: int, hp2: int, level2: int) -> tuple:
+    """
+    Plays out a single exchange as Battle.compare_speed() would, without creating any pokemon
+    :return: A tuple of (hp1, level1, hp2, level2) after the exchange
+    :complexity: Best and worst is O(1)
+    """
+    loss1 = get_hp_loss(species2, level2, species1, level1)
+    loss2 = get_hp_loss(species1, level1, species2, level2)
+    speed1 = get_speed(species1, level1)
+    speed2 = get_speed(species2, level2)
+    if speed1 > speed2:
+        # Pokemon 1 attacks first and pokemon 2 only strikes back if it didn't faint
+        hp2 = max(0, hp2 - loss2)
+        if hp2 > 0:
+            hp1 = max(0, hp1 - loss1)
+    elif speed2 > speed1:
+        # Pokemon 2 attacks first and pokemon 1 only strikes back if it didn't faint
+        hp1 = max(0, hp1 - loss1)
+        if hp1 > 0:
+            hp2 = max(0, hp2 - loss2)
+    else:
+        # Both attack simultaneously
+        hp1 = max(0, hp1 - loss1)
+        hp2 = max(0, hp2 - loss2)
+    if hp1 > 0 and hp2 > 0:
+        # If neither fainted, both lose 1 HP
+        hp1 -= 1
+        hp2 -= 1
+    # A pokemon levels up if its opponent fainted and it didn't
+    if hp1 > 0 and hp2 == 0:
+        level1 += 1
+    elif hp2 > 0 and hp1 == 0:
+        level2 += 1
+    return hp1, level1, hp2, level2
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def solve(species1: int, hp1: int, level1: int, species2: int, hp2: int, level2: int, battle_mode: int) -> tuple:
+    """
+    Returns the outcome of 2 pokemons being sent out against each other.
+    In battle mode 0 the survivor of an exchange goes back on top of its stack, so both fight until one faints.
+    With both levels fixed until then, every exchange in which neither faints costs the same hp, so the number of
+    those exchanges is worked out in one step and only the last exchange is played.
+    In battle mode 1 both go to the back of their queues, so a single exchange is played
+    :param species1: An integer SPECIES_ID of team 1's pokemon
+    :param hp1: An integer hp of team 1's pokemon
+    :param level1: An integer level of team 1's pokemon
+    :param species2: An integer SPECIES_ID of team 2's pokemon
+    :param hp2: An integer hp of team 2's pokemon
+    :param level2: An integer level of team 2's pokemon
+    :param battle_mode: An integer of the battle mode, 0 or 1
+    :return: A tuple of (winner, hp1, level1, hp2, level2, exchanges), where winner is 1 or 2, 0 if both fainted
+             and None if neither did
+    :raises ValueError: If battle_mode isn't 0 or 1
+    :complexity: Best and worst is O(1), results are cached for the last CACHE_SIZE distinct inputs
+    """
+    if battle_mode not in (0, 1):
+        raise ValueError("Battle mode input must be 0 or 1")
+    exchanges = 1
+    if battle_mode == 0:
+        # Neither faints in an exchange as long as both have more hp than the attack plus the 1 HP both lose
+        step1 = get_hp_loss(species2, level2, species1, level1) + 1
+        step2 = get_hp_loss(species1, level1, species2, level2) + 1
+        survived = min((hp1 - 1) // step1, (hp2 - 1) // step2)
+        hp1 -= survived * step1
+        hp2 -= survived * step2
+        exchanges += survived
+    hp1, level1, hp2, level2 = play_exchange(species1, hp1, level1, species2, hp2, level2)
+    if hp1 > 0 and hp2 > 0:
+        winner = None
+    elif hp1 > 0:
+        winner = 1
+    elif hp2 > 0:
+        winner = 2
+    else:
+        winner = 0
+    return winner, hp1, level1, hp2, level2, exchanges
+
+
+def build_team(head_count: list) -> deque:
+    """
+    Returns a team as [species, hp, level] lists, in the order they are sent out, as PokeTeam.assign_team() forms it
+    :param head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+    :return: A deque of [species, hp, level] with the next pokemon to be sent out on the left
+    :raises ValueError: If the head count includes a MissingNo
+    :complexity: Best and worst is O(sum(head_count))
+    """
+    if len(head_count) == 4 and head_count[3] > 0:
+        raise ValueError("MissingNo battles aren't deterministic")
+    team = deque()
+    # Charmanders are on top of the stack and at the front of the queue alike
+    for species in range(len(SPECIES)):
+        for i in range(head_count[species]):
+            team.append([species, SPECIES[species]().get_hp(), 1])
+    return team
+
+
+def resolve_team_battle(team1_head_count: list, team2_head_count: list, battle_mode: int) -> tuple:
+    """
+    Returns the outcome of a whole team battle in battle mode 0 or 1 by looking up every pairing in solve()
+    :param team1_head_count: A list of the number of Charmanders, Bulbasaurs and Squirtles for team 1
+    :param team2_head_count: A list of the number of Charmanders, Bulbasaurs and Squirtles for team 2
+    :param battle_mode: An integer of the battle mode, 0 or 1
+    :return: A tuple of (winner, exchanges, team1, team2), where winner is 1, 2 or 0 for a draw, and both teams are
+             deques of the remaining [species, hp, level] in the order they would be sent out
+    :raises ValueError: If battle_mode isn't 0 or 1, or either team includes a MissingNo
+    :complexity: Best and worst is O(len(team1) + len(team2)) lookups in battle mode 0, where each pairing ends with a
+                 faint, and O(E) lookups in battle mode 1, where E is the number of exchanges
+    """
+    if battle_mode not in (0, 1):
+        raise ValueError("Battle mode input must be 0 or 1")
+    team1 = build_team(team1_head_count)
+    team2 = build_team(team2_head_count)
+    exchanges = 0
+    while team1 and team2:
+        species1, hp1, level1 = team1.popleft()
+        species2, hp2, level2 = team2.popleft()
+        winner, hp1, level1, hp2, level2, played = solve(species1, hp1, level1, species2, hp2, level2, battle_mode)
+        exchanges += played
+        # Survivors go back on top of the stack in battle mode 0 and to the back of the queue in battle mode 1
+        for team, species, hp, level in ((team1, species1, hp1, level1), (team2, species2, hp2, level2)):
+            if hp > 0 and battle_mode == 0:
+                team.appendleft([species, hp, level])
+            elif hp > 0:
+                team.append([species, hp, level])
+    if not team1 and not team2:
+        winner = 0
+    elif not team1:
+        winner = 2
+    else:
+        winner = 1
+    return winner, exchanges, team1, team2
+
+
+class TestOutcomeSolver(unittest.TestCase):
+    """ Tests for the above functions."""
+    WINNERS = {"Draw": 0, "Ash": 1, "Gary": 2}
+
+    def get_teams(self) -> list:
+        """ Returns every composition of 1 to 3 pokemons without MissingNo, and a few of 6."""
+        teams = [[charm, bulb, squir] for charm in range(4) for bulb in range(4) for squir in range(4)
+                 if 0 < charm + bulb + squir <= 3]
+        return teams + [[2, 2, 2], [6, 0, 0], [1, 3, 2], [0, 1, 5]]
+
+    def test_resolve_team_battle(self):
+        """ Tests the solver gives the winner, exchanges and remaining teams of Battle.headless_battle()."""
+        from battle import Battle
+        teams = self.get_teams()
+        for battle_mode in range(2):
+            for team1 in teams:
+                for team2 in teams:
+                    battle = Battle("Ash", "Gary")
+                    winner = self.WINNERS[battle.headless_battle(battle_mode, team1, team2)]
+                    remaining = [[[pokemon.SPECIES_ID, pokemon.hp, pokemon.level] for pokemon in team.get_members()]
+                                 for team in (battle.team1, battle.team2)]
+                    solved = resolve_team_battle(team1, team2, battle_mode)
+                    self.assertEqual((solved[0], solved[1], list(solved[2]), list(solved[3])),
+                                     (winner, battle.exchanges, remaining[0], remaining[1]),
+                                     (battle_mode, team1, team2))
+
+    def test_missingno(self):
+        """ Tests a team with MissingNo or a battle mode other than 0 and 1 is rejected."""
+        self.assertRaises(ValueError, resolve_team_battle, [1, 1, 1, 1], [1, 1, 1], 0)
+        self.assertRaises(ValueError, resolve_team_battle, [1, 1, 1], [0, 1, 0, 1], 1)
+        self.assertRaises(ValueError, resolve_team_battle, [1, 1, 1], [1, 1, 1], 2)
+        # A head count of 0 MissingNo is an ordinary team
+        self.assertEqual(resolve_team_battle([1, 1, 1, 0], [1, 1, 1], 0)[:2],
+                         resolve_team_battle([1, 1, 1], [1, 1, 1], 0)[:2])
+
+
+if __name__ == '__main__':
+    testtorun = TestOutcomeSolver()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -1,33 +1,66 @@
 """
 Class where pokemon teams are created and pokemons are assigned to their teams
 Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
-Last Modified: 30.04.2022
+Last Modified: 17.10.2026
 """
 from stack_adt import ArrayStack
 from pokemon import Charmander, Bulbasaur, Squirtle
 from queue_adt import CircularQueue
 from array_sorted_list import ArraySortedList
-from sorted_list import ListItem
+from heap_sorted_list import HeapSortedList
+from sorted_list import ListItem, KeyedListItem
 from pokemon_base import PokemonBase
 from MissingNo import MissingNo
+from pokemon_pool import PokemonPool
+from stream_writer import write_value, to_string
+from operator import methodcaller
 from typing import TypeVar
 
 T = TypeVar('T', Charmander, Bulbasaur, Squirtle, MissingNo, PokemonBase)
 
 
-class PokeTeam(Charmander, Squirtle, Bulbasaur):
+class PokeTeam:
     LIMIT = 6
     MISSINGNO_MAX = 1
+    HEAP_MIN_SIZE = 128  # Teams at least this large are kept in a HeapSortedList in battle mode 2
+    # Getter of the key for each criterion, called on the pokemon so the getter of its own species is used
+    CRITERION_KEYS = {"lvl": methodcaller("get_level"),
+                      "hp": methodcaller("get_hp"),
+                      "atk": methodcaller("get_attack_damage"),
+                      "def": methodcaller("get_defence"),
+                      "spd": methodcaller("get_speed")}
 
-    def __init__(self, trainer: str) -> None:
+    def __init__(self, trainer: str, rng=None, pool: PokemonPool = None, limit: int = LIMIT) -> None:
         """
         Constructor for Poke_team
+        :param trainer: A string of the trainer's name
+        :param rng: An object with a randint(a, b) method given to every MissingNo of the team, the random module
+                    if None
+        :param pool: A PokemonPool the team's pokemons are taken from and released back to when the team is
+                     assigned again, in which case the team's container is reused too. New pokemons are constructed
+                     for every team if None
+        :param limit: An integer of the maximum number of pokemons in the team, LIMIT by default. Battle mode 2 teams
+                      of at least HEAP_MIN_SIZE pokemons are kept in a HeapSortedList
+        :raises TypeError: If limit isn't an integer
+        :raises ValueError: If limit is lesser than or equal to 0
         :complexity: Best and worst is O(1) as local variables are initialised
         """
+        if type(limit) != int:
+            raise TypeError("Team limit must be an integer")
+        elif limit <= 0:
+            raise ValueError("Team limit must be above 0")
+        self.limit = limit
         self.criterion = None
         self.battle_mode = 0
         self.team = None
         self.trainer = trainer
+        self.rng = rng
+        self.pool = pool
+        self.roster = []  # Every pokemon taken from the pool for the current team, including the fainted ones
+        self.unbattled = 0  # Number of pokemons in the team that haven't been sent out to battle yet
+        self.missingno_slot = ArraySortedList(PokeTeam.MISSINGNO_MAX)  # Holds a deferred MissingNo in battle mode 2
+        self.key_function = None  # Criterion's getter, resolved once when a battle mode 2 team is assigned
+        self.head_count = None  # Number of Charmanders, Bulbasaurs, Squirtles and MissingNo the team was assigned
 
     def get_team_limit(self) -> int:
         """
@@ -35,7 +68,7 @@ class PokeTeam(Charmander, Squirtle, Bulbasaur):
         :return: An integer of all team's limit
         :complexity: Best and worst is O(1) as it returns the team's limit value
         """
-        return PokeTeam.LIMIT
+        return self.limit
 
     def get_missingno_max(self) -> int:
         """
@@ -86,28 +119,68 @@ class PokeTeam(Charmander, Squirtle, Bulbasaur):
                 pokemon_head_count = [int(entry) for entry in user_input.split()]  # Stores user input as a list.
                 # Length of list will represent the number of type of pokemons user will utilise to form their team.
                 # Each element in the list will represent the number of desired pokemon type.
-                if len(pokemon_head_count) == 3:
-                    # Checks if user has inputted for a team with 3 type of pokemons.
-                    if 0 < sum(pokemon_head_count) <= self.get_team_limit():
-                        # Check if total number of entered pokemons for the team is less than or equal to the team_limit and greater than 0.
-                        is_valid = True
-                        self.assign_team(pokemon_head_count[0], pokemon_head_count[1], pokemon_head_count[
-                            2])  # Forms the team with the desired num of pokemons for each pokemon type
-                    else:
-                        # Else, print appropriate message, regarding the total pokemons entered exceeding the limit.
-                        print("Please enter a valid input\n" + message)
-                elif len(pokemon_head_count) == 4:
-                    # Checks if user has inputted for a team with 4 type of pokemons.
-                    if 0 < sum(pokemon_head_count) <= self.get_team_limit() and pokemon_head_count[3] == self.get_missingno_max():
-                        # Check if total number of entered pokemons for the team is less than or equal to the team_limit and greater than 0.
-                        # As well as checking if the number of MissingNo pokemons is equal to 1.
-                        is_valid = True
-                        self.assign_team(pokemon_head_count[0], pokemon_head_count[1], pokemon_head_count[2],
-                                         pokemon_head_count[
-                                             3])  # Forms the team with the desired num of pokemons for each pokemon type
-                    else:
-                        # Else, print appropriate message, regarding the total pokemons entered exceeding the limit.
-                        print("Please enter a valid input\n" + message)
+                if self.is_valid_head_count(pokemon_head_count):
+                    # Forms the team with the desired num of pokemons for each pokemon type
+                    is_valid = True
+                    self.assign_team(*pokemon_head_count)
+                elif len(pokemon_head_count) in (3, 4):
+                    # Else, print appropriate message, regarding the total pokemons entered exceeding the limit.
+                    print("Please enter a valid input\n" + message)
+
+    def set_team(self, battle_mode: int, pokemon_head_count: list, criterion: str = None) -> None:
+        """
+        Selects a team of Charmander, Bulbasaur, Squirtle, and MissingNo without asking for user input.
+        Non-interactive counterpart of choose_team, used when the team composition is already known.
+        :param battle_mode: An integer that determines the type of battle
+        :param pokemon_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+        :param criterion: A string or None that determines the order in which each pokemon in the team will battle
+        :raises TypeError: If battle_mode isn't an integer,
+                           or criterion is not a string when inputted
+        :raises ValueError: If battle_mode isn't 0, 1 or 2,
+                            or pokemon_head_count isn't a valid team
+        :pre: 0 <= battle_mode <= 2
+        :complexity: Best and worst is O(N), where N is the team size, following the assign_team() method
+        """
+        if type(battle_mode) != int:
+            # Check if passed parameter battle_mode is of type int.
+            raise TypeError("Battle mode input must be an integer")
+        elif criterion is not None and type(criterion) != str:
+            # Check if passed parameter criterion is of type string.
+            raise TypeError("Criterion input must be a string")
+        elif not 0 <= battle_mode <= 2:
+            # Check if passed parameter battle mode is of between values 0 and 2 inclusive.
+            raise ValueError("Battle mode input must be 0, 1 or 2")
+        elif not self.is_valid_head_count(pokemon_head_count):
+            # Check if passed parameter pokemon_head_count follows the same rules as choose_team's input.
+            raise ValueError("Team input is invalid")
+        else:
+            # All checks passed.
+            self.battle_mode = battle_mode
+            self.criterion = criterion
+            self.assign_team(*pokemon_head_count)
+
+    def is_valid_head_count(self, pokemon_head_count: list) -> bool:
+        """
+        Checks whether a list of pokemon head counts forms a valid team.
+        A valid team has 3 or 4 counts, none of them negative, adding up to between 1 and the team limit, where the
+        4th count, if any, is the number of MissingNo and must be equal to the maximum number of MissingNo
+        :param pokemon_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+        :return: A True if the team is valid and False if it isn't
+        :complexity: Best and worst is O(1) as the list has at most 4 elements
+        """
+        if min(pokemon_head_count, default=0) < 0:
+            # A negative count could otherwise be made up for by the others, such as 7 -1 0
+            return False
+        elif len(pokemon_head_count) == 3:
+            # Check if total number of entered pokemons for the team is less than or equal to the team_limit and greater than 0.
+            return 0 < sum(pokemon_head_count) <= self.get_team_limit()
+        elif len(pokemon_head_count) == 4:
+            # Check if total number of entered pokemons for the team is less than or equal to the team_limit and greater than 0.
+            # As well as checking if the number of MissingNo pokemons is equal to 1.
+            return 0 < sum(pokemon_head_count) <= self.get_team_limit() and \
+                pokemon_head_count[3] == self.get_missingno_max()
+        else:
+            return False
 
     def assign_team(self, charm: int, bulb: int, squir: int, missi: int = 0) -> None:
         """
@@ -151,46 +224,86 @@ class PokeTeam(Charmander, Squirtle, Bulbasaur):
             raise ValueError("MissingNo's input must not be a negative value")
         else:
             team_size = charm + bulb + squir + missi
+            self.head_count = (charm, bulb, squir, missi)
+            if self.pool is not None:
+                self.reset()  # Releases the previous team's pokemons back to the pool
+            self.unbattled = team_size  # None of the new pokemons have battled
+            self.missingno_slot.clear()  # Slot is reused by every team assigned, so a deferred MissingNo is dropped
+            charmanders = self.get_new_pokemons(Charmander, charm)
+            bulbasaurs = self.get_new_pokemons(Bulbasaur, bulb)
+            squirtles = self.get_new_pokemons(Squirtle, squir)
+            missingnos = self.get_new_pokemons(MissingNo, missi)
             if self.battle_mode == 0:
                 # Check if battle_mode == 0. Will decide method of forming team.
-                self.team = ArrayStack(team_size)  # team will be of type ArrayStack with length of team size.
-                for i in range(missi):
-                    self.team.push(MissingNo())  # Pushes a new MissingNo object to the ArrayStak.
-                for i in range(squir):
-                    self.team.push(Squirtle())  # Pushes a new Squirtle object to the ArrayStak.
-                for i in range(bulb):
-                    self.team.push(Bulbasaur())  # Pushes a new Bulbasaur object to the ArrayStak.
-                for i in range(charm):
-                    self.team.push(Charmander())  # Pushes a new Charmander object to the ArrayStak.
+                self.team = self.get_container(ArrayStack, team_size)  # team will be of type ArrayStack with length of team size.
+                # Pushes every new pokemon in one block, MissingNo at the bottom and Charmanders on top.
+                self.team.push_many(missingnos + squirtles + bulbasaurs + charmanders)
             elif self.battle_mode == 1:
                 # Check if battle_mode == 1. Will decide method of forming team.
-                self.team = CircularQueue(team_size)  # team will be of type CircularQueue with length of team size.
-                for i in range(charm):
-                    self.team.append(Charmander())  # Appends a new Charmander object to the CircularQueue.
-                for i in range(bulb):
-                    self.team.append(Bulbasaur())  # Appends a new Bulbasaur object to the CircularQueue.
-                for i in range(squir):
-                    self.team.append(Squirtle())  # Appends a new Squirtle object to the CircularQueue.
-                for i in range(missi):
-                    self.team.append(MissingNo())  # Appends a new MissingNo object to the CircularQueue.
+                self.team = self.get_container(CircularQueue, team_size)  # team will be of type CircularQueue with length of team size.
+                # Appends every new pokemon in one block, Charmanders at the front and MissingNo at the rear.
+                self.team.append_many(charmanders + bulbasaurs + squirtles + missingnos)
             elif self.battle_mode == 2:
-                # Check if battle_mode == 1. Will decide method of forming team.
-                self.team = ArraySortedList(team_size)  # team will be of type ArraySortedList with length of team size.
-                for i in range(charm):
-                    c = Charmander()
-                    self.team.modified_add(ListItem(c, self.get_criterion(c, self.criterion)))  # Adds a ListItem with value Charmander and key as the passed criterion to the ArraySortedList.
-                for i in range(bulb):
-                    b = Bulbasaur()
-                    self.team.modified_add(ListItem(b, self.get_criterion(b, self.criterion)))  # Adds a ListItem with value Bulbasaur and key as the passed criterion to the ArraySortedList.
-                for i in range(squir):
-                    s = Squirtle()
-                    self.team.modified_add(ListItem(s, self.get_criterion(s, self.criterion)))  # Adds a ListItem with value Squirtle and key as the passed criterion to the ArraySortedList.
-                for i in range(missi):
-                    m = MissingNo()
-                    self.team.modified_add(ListItem(m, self.get_criterion(m,self.criterion)))  # Adds a ListItem with value MissingNo and key as the passed criterion to the ArraySortedList.
+                # Check if battle_mode == 2. Will decide method of forming team.
+                if team_size >= PokeTeam.HEAP_MIN_SIZE:
+                    # Re-adding a pokemon is O(log n) in a heap, but shifting a few references in an array is faster
+                    # for small teams
+                    self.team = self.get_container(HeapSortedList, team_size)  # team will be of type HeapSortedList with length of team size.
+                else:
+                    self.team = self.get_container(ArraySortedList, team_size)  # team will be of type ArraySortedList with length of team size.
+                self.key_function = self.get_key_function(self.criterion)
+                for pokemon in charmanders + bulbasaurs + squirtles + missingnos:
+                    # Adds a ListItem with value the pokemon and key as the passed criterion to the sorted list.
+                    self.team.modified_add(self.get_item(pokemon))
             else:
                 raise Exception("Input battle mode is invalid")
 
+    def get_new_pokemons(self, species, count: int) -> list:
+        """
+        Returns a number of pokemons of a species at their base hp and level, taken from the pool if the team has one
+        :param species: A pokemon class, Charmander, Bulbasaur, Squirtle or MissingNo
+        :param count: An integer of how many pokemons are needed
+        :return: A list of count pokemon objects
+        :complexity: Best and worst is O(count)
+        """
+        if self.pool is not None:
+            pokemons = self.pool.acquire_many(species, count, self.rng)
+            self.roster += pokemons
+            return pokemons
+        elif species is MissingNo:
+            return [MissingNo(self.rng) for i in range(count)]
+        else:
+            return [species() for i in range(count)]
+
+    def get_container(self, container_class, capacity: int):
+        """
+        Returns an empty container for the team. The team's current container is cleared and reused if the team has
+        a pool and the container is of the same class and large enough, otherwise a new one is created
+        :param container_class: ArrayStack, CircularQueue, ArraySortedList or HeapSortedList
+        :param capacity: An integer of how many pokemons the container must hold
+        :return: An empty container_class object
+        :complexity: Best is O(1) when the container is reused. Worst is O(capacity) to create a new one
+        """
+        if self.pool is not None and type(self.team) is container_class:
+            array = self.team.heap if container_class is HeapSortedList else self.team.array
+            if len(array) >= capacity:
+                self.team.clear()
+                return self.team
+        return container_class(capacity)
+
+    def reset(self) -> None:
+        """
+        Releases every pokemon of the team back to its pool and empties the team, keeping its container to be reused
+        :complexity: Best and worst is O(N), where N is the number of pokemons the team was assigned
+        """
+        if self.pool is not None:
+            self.pool.release_many(self.roster)
+        self.roster = []
+        if self.team is not None:
+            self.team.clear()
+        self.missingno_slot.clear()
+        self.unbattled = 0
+
     def get_criterion(self, pokemon: T, criterion: str) -> int:
         """
         Returns key value of passed pokemon.
@@ -210,26 +323,42 @@ class PokeTeam(Charmander, Squirtle, Bulbasaur):
             # Check if passed parameter criterion is not None and is of type string.
             raise TypeError("Criterion input must be a string")
         else:
-            if criterion is None:
-                # Check If criterion is None, no action will be performed.
-                pass
-            elif criterion == "lvl":
-                # Check is criterion is lvl. If true, return the passed pokemon level.
-                return pokemon.get_level()
-            elif criterion == "hp":
-                # Check is criterion is hp. If true, return the passed pokemon hp.
-                return pokemon.get_hp()
-            elif criterion == "atk":
-                # Check is criterion is atk. If true, return the passed pokemon attack damage.
-                return pokemon.get_attack_damage()
-            elif criterion == "def":
-                # Check is criterion is def. If true, return the passed pokemon defence.
-                return pokemon.get_defence()
-            elif criterion == "spd":
-                # Check is criterion is spd. If true, return the passed pokemon speed.
-                return pokemon.get_speed()
-            else:
-                raise ValueError("Input criterion is invalid")
+            # Looks up the criterion's getter, None if criterion is None, and calls it on the pokemon.
+            return self.get_key_function(criterion)(pokemon)
+
+    def get_key_function(self, criterion: str):
+        """
+        Resolves a criterion once into the function returning a pokemon's key, so the criterion isn't checked again
+        every time a key is updated. Only utilized when battle_mode = 2
+        :param criterion: A string of the criterion
+        :return: A function taking a pokemon object and returning its key, None if the criterion is None
+        :raises TypeError: If criterion isn't a string when inputted
+        :raises ValueError: If criterion isn't lvl, hp, atk, def or spd
+        :complexity: Best and worst is O(1) as the getter is looked up
+        """
+        if criterion is None:
+            # Same as get_criterion(), a team without a criterion has no keys.
+            return lambda pokemon: None
+        elif type(criterion) != str:
+            raise TypeError("Criterion input must be a string")
+        elif criterion not in PokeTeam.CRITERION_KEYS:
+            raise ValueError("Input criterion is invalid")
+        else:
+            return PokeTeam.CRITERION_KEYS[criterion]
+
+    def get_item(self, pokemon: T, key: int = None) -> KeyedListItem:
+        """
+        Returns the sorted list item of a pokemon, keyed with the team's criterion. The pokemon's on_change hook is
+        set to refresh the item's key, so the key follows its hp and level without being worked out again after
+        every exchange. Only utilized when battle_mode = 2
+        :param pokemon: A pokemon object of this team
+        :param key: An integer the item is keyed with until the pokemon changes, its criterion if None
+        :return: A KeyedListItem with value the pokemon
+        :complexity: Best and worst is O(1) as the key function was already resolved
+        """
+        item = KeyedListItem(pokemon, self.key_function, key)
+        pokemon.on_change = item.refresh_key  # Only the last item made for the pokemon is kept up to date
+        return item
 
     def get_pokemon(self, battle_mode: int) -> T:
         """
@@ -240,8 +369,8 @@ class PokeTeam(Charmander, Squirtle, Bulbasaur):
         :raises ValueError: If battle_mode is not 0, 1 or 2
         :pre: 0 <= battle_mode <= 2
         :complexity: Best is O(1) if it's a stack or circular queue as it access the element from the top or front.
-                     Worst is O(len(self)) if it's an array sorted list as it has to traverse to len(self) and obtain
-                     the element
+                     Worst is O(log(len(self))) if it's a heap sorted list as the heap is restored after the element
+                     with the largest key is taken. It is O(1) for an array sorted list, taken from the back
         """
         if type(battle_mode) != int:
             # Check if passed parameter battle_mode is of type int.
@@ -257,9 +386,65 @@ class PokeTeam(Charmander, Squirtle, Bulbasaur):
                 # If battle mode 1. Serve pokemon from CircularQueue.
                 return self.team.serve()
             elif battle_mode == 2:
-                # If battle mode 2. Withdraw ListItem from ArraySortedList.
+                # If battle mode 2. Withdraw ListItem from the sorted list.
                 return self.team.withdraw()
 
+    def get_members(self) -> list:
+        """
+        Returns the pokemons in the team, in the order they will be sent out to battle
+        :return: A list of pokemon objects, empty if the team hasn't been assigned
+        :complexity: Best and worst is O(len(self.team)) as every pokemon in the team is visited
+        """
+        members = []
+        if self.team is None:
+            # Team hasn't been assigned yet.
+            pass
+        elif self.battle_mode == 0:
+            # Stack, from the top to the bottom.
+            for i in range(len(self.team) - 1, -1, -1):
+                members.append(self.team.array[i])
+        elif self.battle_mode == 1:
+            # Circular queue, from the front to the rear.
+            for i in range(len(self.team)):
+                members.append(self.team.array[(self.team.front + i) % len(self.team.array)])
+        else:
+            # Array or heap sorted list, withdrawn from the back of its ascending order.
+            for i in range(len(self.team) - 1, -1, -1):
+                members.append(self.team[i].value)
+        return members
+
+    def mark_battled(self, pokemon: T) -> None:
+        """
+        Sets the pokemon's battled status and keeps count of the pokemons in the team that haven't battled
+        :param pokemon: A pokemon object of this team that is sent out to battle
+        :complexity: Best and worst is O(1) as it sets the status and updates the counter
+        """
+        if not pokemon.battled:
+            # Pokemons that have battled before were already taken off the counter
+            pokemon.battled = True
+            self.unbattled -= 1
+
+    def hold_missingno(self, item: ListItem) -> ArraySortedList:
+        """
+        Moves a MissingNo that hasn't battled out of the team and into the team's holding slot, until every other
+        pokemon in the team has battled. Only utilized when battle_mode = 2
+        :param item: A ListItem with value MissingNo, withdrawn from the team
+        :return: The ArraySortedList holding slot, reused every time the team defers a MissingNo
+        :complexity: Best and worst is O(1) as the slot only ever holds one MissingNo
+        """
+        self.missingno_slot.add(item)
+        self.unbattled -= 1  # MissingNo isn't counted until it returns to the team, having battled
+        return self.missingno_slot
+
+    def write(self, sink) -> None:
+        """
+        Writes all pokemon in team to a sink, in the same form as __str__(), without building the team's string first
+        :param sink: An object with a write(string) method, such as an open file or an io.StringIO
+        :complexity: Best and worst is O(length) following the write() method of the stack, circular queue or sorted
+                     list
+        """
+        write_value(self.team, sink)
+
     def __str__(self) -> str:
         """
         Returns all pokemon in team
@@ -267,4 +452,4 @@ class PokeTeam(Charmander, Squirtle, Bulbasaur):
         :complexity: Best and worst is O(length) as it returns the PokeTeam object (stack, circular queue or array
                      sorted list) in string format
         """
-        return str(self.team)
+        return to_string(self)
@@ -1,23 +1,35 @@
 """
 Classes for a pokemon object with its stats and methods
 Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
-Last Modified: 29.04.2022
+Last Modified: 17.10.2026
 """
 from pokemon_base import PokemonBase
+from type_chart import get_effectiveness, get_damage_table
 
 
 class Charmander(PokemonBase):
     NAME = "Charmander"
+    HP = 7
+    SPECIES_ID = 0
     ATTACK = 6
     DEFENCE = 4
     SPEED = 7
+    __slots__ = ("battled",)
 
     def __init__(self) -> None:
         """
         Constructor for Charmander Class
         :complexity: Best and worst is O(1) as local variables are initialised
         """
-        PokemonBase.__init__(self, 7, "Fire")
+        PokemonBase.__init__(self, Charmander.HP, "Fire")
+        self.battled = False
+
+    def reset(self) -> None:
+        """
+        Restores the pokemon's base hp, level and battled status, as it was constructed
+        :complexity: Best and worst is O(1) following PokemonBase.reset()
+        """
+        PokemonBase.reset(self)
         self.battled = False
 
     def get_name(self) -> str:
@@ -65,26 +77,20 @@ class Charmander(PokemonBase):
         Calculates the opponent's effective damage taken by the pokemon and update the pokemon's hp
         :param opponent: A pokemon object that is attacking this pokemon.
         :raises TypeError: If opponent isn't a Charmander, Bulbasaur, Squirtle or MissingNo
-        :complexity: Best and worst is O(1) following the update_health() method
+        :complexity: Best and worst is O(1) as it looks up the damage table or follows the update_health() method
         """
         if not isinstance(opponent, PokemonBase):
             # Check if passed parameter opponent is of type PokemonBase
             raise TypeError("The opponent must be a Pokemon object")
         else:
-            # Check passed.
-            damage = opponent.get_attack_damage() # opponent's attack damage
-            if opponent.get_poke_type() == "Grass":
-                # Check if opponent is of type Grass. If true, damage to be dealt to this Charmander object will be halved.
-                effective_damage = damage * 0.5
-                self.update_health(effective_damage)
-            elif opponent.get_poke_type() == "Water":
-                # Check if opponent is of type Water. If true, damage to be dealt to this Charmander object will be doubled.
-                effective_damage = damage * 2
-                self.update_health(float(effective_damage))
+            # Check passed. Looks up the hp this pokemon loses to the opponent's attack in the shared damage table.
+            hp_loss = get_damage_table().get_hp_loss(opponent, self)
+            if hp_loss is None:
+                # Opponent or either level isn't in the table, damage is worked out from the type effectiveness.
+                self.update_health(opponent.get_attack_damage() * get_effectiveness(opponent.type_id, self.type_id))
             else:
-                # Else damage to be dealt to this Charmander object will remain the same.
-                effective_damage = damage * 1
-                self.update_health(float(effective_damage))
+                # Hp can't go below 0, as in update_health().
+                self.set_hp(max(0, self.get_hp() - hp_loss))
 
     def update_health(self, damage: float) -> None:
         """
@@ -124,16 +130,27 @@ class Charmander(PokemonBase):
 
 class Bulbasaur(PokemonBase):
     NAME = "Bulbasaur"
+    HP = 9
+    SPECIES_ID = 1
     ATTACK = 5
     DEFENCE = 5
     SPEED = 7
+    __slots__ = ("battled",)
 
     def __init__(self) -> None:
         """
         Constructor for Bulbasaur class
         :complexity: Best and worst is O(1) as local variables are initialised
         """
-        PokemonBase.__init__(self, 9, "Grass")
+        PokemonBase.__init__(self, Bulbasaur.HP, "Grass")
+        self.battled = False
+
+    def reset(self) -> None:
+        """
+        Restores the pokemon's base hp, level and battled status, as it was constructed
+        :complexity: Best and worst is O(1) following PokemonBase.reset()
+        """
+        PokemonBase.reset(self)
         self.battled = False
 
     def get_name(self) -> str:
@@ -181,26 +198,20 @@ class Bulbasaur(PokemonBase):
         Calculates the opponent's effective damage taken by the pokemon and update the pokemon's hp.
         :param opponent: A pokemon object that is attacking this pokemon.
         :raises TypeError: If opponent isn't a Charmander, Bulbasaur, Squirtle or MissingNo
-        :complexity: Best and worst is O(1) following the update_health() method
+        :complexity: Best and worst is O(1) as it looks up the damage table or follows the update_health() method
         """
         if not isinstance(opponent, PokemonBase):
             # Check if passed parameter opponent is of type PokemonBase
             raise TypeError("The opponent must be a Pokemon object")
         else:
-            # Check passed.
-            damage = opponent.get_attack_damage() # opponent's attack damage
-            if opponent.get_poke_type() == "Water":
-                # Check if opponent is of type Water. If true, damage to be dealt to this Bulbasaur object will be halved.
-                effective_damage = damage * 0.5
-                self.update_health(effective_damage)
-            elif opponent.get_poke_type() == "Fire":
-                # Check if opponent is of type Fire. If true, damage to be dealt to this Bulbasaur object will be doubled.
-                effective_damage = damage * 2
-                self.update_health(float(effective_damage))
+            # Check passed. Looks up the hp this pokemon loses to the opponent's attack in the shared damage table.
+            hp_loss = get_damage_table().get_hp_loss(opponent, self)
+            if hp_loss is None:
+                # Opponent or either level isn't in the table, damage is worked out from the type effectiveness.
+                self.update_health(opponent.get_attack_damage() * get_effectiveness(opponent.type_id, self.type_id))
             else:
-                # Else damage to be dealt to this Bulbasaur object will remain the same.
-                effective_damage = damage * 1
-                self.update_health(float(effective_damage))
+                # Hp can't go below 0, as in update_health().
+                self.set_hp(max(0, self.get_hp() - hp_loss))
 
     def update_health(self, damage: float) -> None:
         """Updates the pokemon hp after getting damaged.
@@ -239,16 +250,27 @@ class Bulbasaur(PokemonBase):
 
 class Squirtle(PokemonBase):
     NAME = "Squirtle"
+    HP = 8
+    SPECIES_ID = 2
     ATTACK = 4
     DEFENCE = 6
     SPEED = 7
+    __slots__ = ("battled",)
 
     def __init__(self) -> None:
         """
         Constructor for Squirtle class
         :complexity: Best and worst is O(1) as local variables are initialised
         """
-        PokemonBase.__init__(self, 8, "Water")
+        PokemonBase.__init__(self, Squirtle.HP, "Water")
+        self.battled = False
+
+    def reset(self) -> None:
+        """
+        Restores the pokemon's base hp, level and battled status, as it was constructed
+        :complexity: Best and worst is O(1) following PokemonBase.reset()
+        """
+        PokemonBase.reset(self)
         self.battled = False
 
     def get_name(self) -> str:
@@ -296,26 +318,20 @@ class Squirtle(PokemonBase):
         Calculates the opponent's effective damage taken by the pokemon and update the pokemon's hp.
         :param opponent: A pokemon object that is attacking this pokemon.
         :raises TypeError: If opponent isn't a Charmander, Bulbasaur, Squirtle or MissingNo
-        :complexity: Best and worst is O(1) following the update_health() method
+        :complexity: Best and worst is O(1) as it looks up the damage table or follows the update_health() method
         """
         if not isinstance(opponent, PokemonBase):
             # Check if passed parameter opponent is of type PokemonBase
             raise TypeError("The opponent must be a Pokemon object")
         else:
-            # Check passed.
-            damage = opponent.get_attack_damage() # opponent's attack damage
-            if opponent.get_poke_type() == "Fire":
-                # Check if opponent is of type Fire. If true, damage to be dealt to this Squirtle object will be halved.
-                effective_damage = damage * 0.5
-                self.update_health(effective_damage)
-            elif opponent.get_poke_type() == "Grass":
-                # Check if opponent is of type Grass. If true, damage to be dealt to this Squirtle object will be doubled.
-                effective_damage = damage * 2
-                self.update_health(float(effective_damage))
+            # Check passed. Looks up the hp this pokemon loses to the opponent's attack in the shared damage table.
+            hp_loss = get_damage_table().get_hp_loss(opponent, self)
+            if hp_loss is None:
+                # Opponent or either level isn't in the table, damage is worked out from the type effectiveness.
+                self.update_health(opponent.get_attack_damage() * get_effectiveness(opponent.type_id, self.type_id))
             else:
-                # Else damage to be dealt to this Squirtle object will remain the same.
-                effective_damage = damage * 1
-                self.update_health(float(effective_damage))
+                # Hp can't go below 0, as in update_health().
+                self.set_hp(max(0, self.get_hp() - hp_loss))
 
     def update_health(self, damage: float) -> None:
         """
@@ -1,12 +1,18 @@
 """
 Abstract class for the Pokemons and GlitchMon class
 Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
-Last Modified: 29.04.2022
+Last Modified: 17.10.2026
 """
 from abc import ABC, abstractmethod
+from type_chart import get_type_id, get_damage_table
+from stream_writer import to_string
 
 
 class PokemonBase(ABC):
+    SPECIES_ID = None
+    HP = None  # HP every pokemon of a species is constructed with
+    __slots__ = ("hp", "level", "poke_type", "type_id", "on_change")
+
     def __init__(self, hp: int, poke_type: str) -> None:
         """
         Constructor for this PokemonBase class
@@ -29,9 +35,11 @@ class PokemonBase(ABC):
             raise ValueError("HP must be above 0")
         else:
             # If all check passed, will assign the passed values to the appropriate attributes.
+            self.on_change = None  # Called with no arguments whenever the hp or level changes, such as to update a key
             self.hp = hp
             self.level = 1
             self.poke_type = poke_type
+            self.type_id = get_type_id(poke_type)  # Interned id of poke_type, used to look up type effectiveness
 
     def set_hp(self, new_health: int) -> None:
         """
@@ -50,7 +58,7 @@ class PokemonBase(ABC):
             raise ValueError("HP must not be a negative value")
         else:
             # If all checks passed object's hp will be set to the value of new_health.
-            self.hp = new_health
+            self._set_hp(new_health)
 
     def set_level(self, new_level: int) -> None:
         """
@@ -69,7 +77,29 @@ class PokemonBase(ABC):
             raise ValueError("Level must be above 0")
         else:
             # If all checks passed object's level will be set to the value of new_level.
+            self._set_level(new_level)
+
+    def _set_hp(self, new_health: int) -> None:
+        """
+        Unchecked version of set_hp() for trusted battles. Calls the on_change hook if the hp actually changed
+        :param new_health: Value of health to be set.
+        :complexity: Best and worst is O(1), not counting the hook
+        """
+        if new_health != self.hp:
+            self.hp = new_health
+            if self.on_change is not None:
+                self.on_change()
+
+    def _set_level(self, new_level: int) -> None:
+        """
+        Unchecked version of set_level() for trusted battles. Calls the on_change hook if the level actually changed
+        :param new_level: Value of level to be set.
+        :complexity: Best and worst is O(1), not counting the hook
+        """
+        if new_level != self.level:
             self.level = new_level
+            if self.on_change is not None:
+                self.on_change()
 
     def get_hp(self) -> int:
         """
@@ -153,6 +183,20 @@ class PokemonBase(ABC):
         """
         pass
 
+    def _get_damage(self, opponent) -> None:
+        """
+        Unchecked version of get_damage() for trusted battles, where both pokemons have already been validated.
+        Looks up the hp lost in the shared damage table and falls back to get_damage() if it isn't there
+        :param opponent: A pokemon object that is attacking this pokemon.
+        :complexity: Best and worst is O(1) as it looks up the damage table or follows the get_damage() method
+        """
+        hp_loss = get_damage_table().get_hp_loss(opponent, self)
+        if hp_loss is None:
+            # Opponent, either level or this pokemon isn't in the table, such as a defending MissingNo.
+            self.get_damage(opponent)
+        else:
+            self._set_hp(max(0, self.hp - hp_loss))
+
     @abstractmethod
     def update_health(self, damage: float) -> None:
         """
@@ -182,6 +226,16 @@ class PokemonBase(ABC):
             # If object's hp is less than or equal to 0, true will be returned.
             return True
 
+    def reset(self) -> None:
+        """
+        Restores the pokemon's base hp and level, as it was constructed, so a pooled pokemon can be reused.
+        The on_change hook is removed without being called, as the pokemon no longer belongs to a team
+        :complexity: Best and worst is O(1) as it sets the hp and level
+        """
+        self.on_change = None
+        self.hp = self.HP
+        self.level = 1
+
     def level_up(self) -> None:
         """
         Increases pokemon's level by 1
@@ -197,11 +251,24 @@ class PokemonBase(ABC):
         """
         pass
 
+    def write(self, sink) -> None:
+        """
+        Writes the pokemon's name, hp and level to a sink, in the same form as __str__().
+        The hp and level are read without the checks of get_hp() and get_level(), as the pokemon is only logged
+        :param sink: An object with a write(string) method, such as an open file or an io.StringIO
+        :complexity: Best and worst is O(1) as it writes a fixed number of strings
+        """
+        sink.write(self.get_name())
+        sink.write("'s HP = ")
+        sink.write(str(self.hp))
+        sink.write(" and level = ")
+        sink.write(str(self.level))
+
     def __str__(self) -> str:
         """
         Returns the pokemon's name, hp and level
         :return: A string of the pokemon object
-        :complexity: Best and worst is O(1) as it returns the pokemon object in string format
+        :complexity: Best and worst is O(1) following write()
         """
-        return "{}'s HP = {} and level = {}".format(self.get_name(), self.get_hp(), self.get_level())
+        return to_string(self)
 
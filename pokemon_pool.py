@@ -0,0 +1,86 @@
+"""
+Class that recycles pokemon objects between battles instead of constructing new ones for every team
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from pokemon import Charmander, Bulbasaur, Squirtle
+from MissingNo import MissingNo
+import random
+
+SPECIES = (Charmander, Bulbasaur, Squirtle, MissingNo)
+
+
+class PokemonPool:
+    def __init__(self) -> None:
+        """
+        Constructor for PokemonPool, which keeps a list of free pokemons for every species
+        :complexity: Best and worst is O(1) as a list is created for each of the 4 species
+        """
+        # Indexed by SPECIES_ID. Python lists rather than stacks from stack_adt, as a pooled pokemon has to be
+        # cheaper to hand out than constructing a new one
+        self.free = [[] for species in SPECIES]
+        self.created = 0  # Number of pokemons constructed because none were free
+        self.reused = 0  # Number of pokemons handed out again after being released
+
+    def acquire_many(self, species, count: int, rng=None) -> list:
+        """
+        Returns a number of pokemons of a species, in the same state as newly constructed ones. Free pokemons are
+        handed out first and new ones are only constructed once none are left
+        :param species: A pokemon class, Charmander, Bulbasaur, Squirtle or MissingNo
+        :param count: An integer of how many pokemons are needed
+        :param rng: An object with a randint(a, b) method given to every MissingNo, the random module if None
+        :return: A list of count pokemon objects
+        :raises ValueError: If species isn't Charmander, Bulbasaur, Squirtle or MissingNo
+        :complexity: Best and worst is O(count)
+        """
+        if species not in SPECIES:
+            raise ValueError("Species must be Charmander, Bulbasaur, Squirtle or MissingNo")
+        elif count <= 0:
+            return []
+        free = self.free[species.SPECIES_ID]
+        reused = min(count, len(free))
+        # Takes the last pokemons released, from the end of the list
+        pokemons = free[len(free) - reused:]
+        del free[len(free) - reused:]
+        if species is MissingNo:
+            for pokemon in pokemons:
+                # Released MissingNos may have belonged to a team with another random number generator
+                pokemon.rng = random if rng is None else rng
+            pokemons += [MissingNo(rng) for i in range(count - reused)]
+        else:
+            pokemons += [species() for i in range(count - reused)]
+        self.reused += reused
+        self.created += count - reused
+        return pokemons
+
+    def acquire(self, species, rng=None):
+        """
+        Returns a single pokemon of a species, in the same state as a newly constructed one
+        :complexity: Same as acquire_many()
+        """
+        return self.acquire_many(species, 1, rng)[0]
+
+    def release_many(self, pokemons: list) -> None:
+        """
+        Resets pokemons to their base hp, level and battled status and makes them free to be handed out again.
+        A released pokemon must no longer be used by its team
+        :param pokemons: A list of pokemon objects acquired from this pool
+        :complexity: Best and worst is O(len(pokemons))
+        """
+        for pokemon in pokemons:
+            pokemon.reset()
+            self.free[pokemon.SPECIES_ID].append(pokemon)
+
+    def release(self, pokemon) -> None:
+        """
+        Resets a pokemon and makes it free to be handed out again
+        :complexity: Same as release_many()
+        """
+        self.release_many([pokemon])
+
+    def __len__(self) -> int:
+        """
+        Returns the number of free pokemons in the pool
+        :complexity: Best and worst is O(1) as the 4 stacks are counted
+        """
+        return sum(len(free) for free in self.free)
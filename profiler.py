@@ -0,0 +1,282 @@
+"""
+Class that times the phases of a battle and counts what happens in it, exportable as a dictionary or as text in
+the Prometheus exposition format. A profiler wraps the methods of the battles it is attached to, so battles without
+one run the unwrapped methods and pay nothing for it
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from time import perf_counter
+import unittest
+
+# Methods of a Battle timed as each phase, the checked and unchecked version of a method counting as the same phase
+BATTLE_PHASES = (("fight", ("fight",)),
+                 ("compare_speed", ("compare_speed", "_compare_speed")),
+                 ("match", ("match", "_match")),
+                 ("match_same_speed", ("match_same_speed", "_match_same_speed")),
+                 ("returning", ("returning", "_returning")),
+                 ("update_criterion", ("update_criterion",)),
+                 ("get_missingno", ("get_missingno",)))
+# Methods of both of its PokeTeams timed as each phase
+TEAM_PHASES = (("team_selection", ("assign_team",)),
+               ("get_pokemon", ("get_pokemon",)))
+PHASES = tuple(name for name, methods in BATTLE_PHASES + TEAM_PHASES)
+COUNTERS = ("fights",  # Fights started with Battle.fight()
+            "exchanges",  # Exchanges fought, one for every call to compare_speed()
+            "level_ups",  # Levels gained by pokemons over their exchanges
+            "faints",  # Pokemons that fainted in an exchange
+            "missingno_deferrals",  # MissingNos held back until the rest of their team has battled
+            "missingno_reinsertions")  # Held back MissingNos added back to their team
+
+
+class BattleProfiler:
+    def __init__(self) -> None:
+        """
+        Constructor for BattleProfiler, which starts with every timer and counter at 0 and no battle attached
+        :complexity: Best and worst is O(P), where P is the number of phases
+        """
+        self.battles = []
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.seconds = dict.fromkeys(PHASES, 0.0)  # Time spent in each phase, including the phases it calls
+        self.self_seconds = dict.fromkeys(PHASES, 0.0)  # Time spent in each phase, excluding the phases it calls
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.children = []  # Time spent in the phases called by every phase being timed, innermost last
+
+    def reset(self) -> None:
+        """
+        Sets every timer and counter back to 0, keeping the battles attached
+        :complexity: Best and worst is O(P), where P is the number of phases
+        """
+        # Updated in place, as the wrappers of the battles attached hold on to these dictionaries
+        self.calls.update(dict.fromkeys(PHASES, 0))
+        self.seconds.update(dict.fromkeys(PHASES, 0.0))
+        self.self_seconds.update(dict.fromkeys(PHASES, 0.0))
+        self.counters.update(dict.fromkeys(COUNTERS, 0))
+
+    def attach(self, battle) -> None:
+        """
+        Starts profiling a battle by wrapping the methods of it and its teams. A profiler can be attached to
+        several battles, adding up their timers and counters
+        :param battle: A Battle object
+        :raises ValueError: If the battle already has a profiler
+        :complexity: Best and worst is O(P), where P is the number of phases
+        """
+        if getattr(battle, "profiler", None) is not None:
+            raise ValueError("Battle already has a profiler")
+        battle.profiler = self
+        self.battles.append(battle)
+        battle.add_hook(self)
+
+    def detach(self, battle) -> None:
+        """
+        Stops profiling a battle, whose other hooks are kept
+        :param battle: A Battle object this profiler is attached to
+        :raises ValueError: If this profiler isn't attached to the battle
+        :complexity: Best and worst is O(P + B), where P is the number of phases and B the number of battles attached
+        """
+        if battle.profiler is not self:
+            raise ValueError("Battle isn't profiled by this profiler")
+        battle.profiler = None
+        self.battles.remove(battle)
+        battle.remove_hook(self)
+
+    def install(self, battle) -> list:
+        """
+        Sets the profiler's wrappers on a battle and its teams, called by Battle.install_hooks()
+        :param battle: A Battle object this profiler is attached to
+        :return: A list of the (object, method name) pairs set
+        :complexity: Best and worst is O(P), where P is the number of phases
+        """
+        installed = []
+        # The wrappers are set on the instances, so they shadow the class's methods for this battle only
+        for phase, methods in BATTLE_PHASES:
+            for method in methods:
+                setattr(battle, method, self.timed(phase, getattr(battle, method)))
+                installed.append((battle, method))
+        for team in (battle.team1, battle.team2):
+            for phase, methods in TEAM_PHASES:
+                for method in methods:
+                    setattr(team, method, self.timed(phase, getattr(team, method)))
+                    installed.append((team, method))
+        for method in ("compare_speed", "_compare_speed"):
+            setattr(battle, method, self.counted(battle, getattr(battle, method)))
+        battle.get_missingno = self.deferred(battle.get_missingno)
+        battle.fight = self.started(battle.fight)
+        return installed
+
+    def timed(self, phase: str, method):
+        """
+        Returns a function that calls method and adds the time it took to the phase
+        :param phase: A string of the phase's name, one of PHASES
+        :param method: A bound method
+        :return: A function with the same parameters and return value as method
+        :complexity: Best and worst is O(1) on top of method
+        """
+        children = self.children
+        calls = self.calls
+        seconds = self.seconds
+        self_seconds = self.self_seconds
+
+        def timed_method(*args, **kwargs):
+            children.append(0.0)
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                calls[phase] += 1
+                seconds[phase] += elapsed
+                self_seconds[phase] += elapsed - children.pop()
+                if children:
+                    # Counts towards the time of the phase that called this one
+                    children[-1] += elapsed
+        return timed_method
+
+    def counted(self, battle, compare_speed):
+        """
+        Returns a function that calls compare_speed() and counts the exchange, the levels gained, the pokemons that
+        fainted and the MissingNos added back to their team
+        :param battle: The Battle object compare_speed belongs to
+        :param compare_speed: A Battle's compare_speed() or _compare_speed() method
+        :return: A function with the same parameters and return value as compare_speed
+        :complexity: Best and worst is O(1) on top of compare_speed
+        """
+        counters = self.counters
+
+        def counted_compare_speed(pokemon_1, pokemon_2) -> bool:
+            level_1, level_2 = pokemon_1.level, pokemon_2.level
+            held = held_missingnos(battle)
+            finished = compare_speed(pokemon_1, pokemon_2)
+            counters["exchanges"] += 1
+            counters["level_ups"] += pokemon_1.level - level_1 + pokemon_2.level - level_2
+            counters["faints"] += (pokemon_1.hp <= 0) + (pokemon_2.hp <= 0)
+            counters["missingno_reinsertions"] += held - held_missingnos(battle)
+            return finished
+        return counted_compare_speed
+
+    def deferred(self, get_missingno):
+        """
+        Returns a function that calls get_missingno() and counts the MissingNo held back
+        :complexity: Best and worst is O(1) on top of get_missingno
+        """
+        counters = self.counters
+
+        def deferred_get_missingno(pokemon, team):
+            counters["missingno_deferrals"] += 1
+            return get_missingno(pokemon, team)
+        return deferred_get_missingno
+
+    def started(self, fight):
+        """
+        Returns a function that calls fight() and counts the fight
+        :complexity: Best and worst is O(1) on top of fight
+        """
+        counters = self.counters
+
+        def started_fight() -> str:
+            counters["fights"] += 1
+            return fight()
+        return started_fight
+
+    def to_dict(self) -> dict:
+        """
+        Returns the timers and counters as plain Python values
+        :return: A dictionary of "phases", the calls, seconds and self seconds of every phase by name, and
+                 "counters", every counter by name
+        :complexity: Best and worst is O(P), where P is the number of phases
+        """
+        return {"phases": {phase: {"calls": self.calls[phase], "seconds": self.seconds[phase],
+                                   "self_seconds": self.self_seconds[phase]} for phase in PHASES},
+                "counters": dict(self.counters)}
+
+    def to_prometheus(self, prefix: str = "battle") -> str:
+        """
+        Returns the timers and counters as text in the Prometheus exposition format, every one a counter metric
+        :param prefix: A string every metric's name starts with
+        :return: A string of the metrics, one sample per line
+        :complexity: Best and worst is O(P), where P is the number of phases
+        """
+        lines = []
+        for name, help_text, values in (
+                ("phase_calls_total", "Calls of each battle phase", self.calls),
+                ("phase_seconds_total", "Seconds spent in each battle phase, including the phases it calls",
+                 self.seconds),
+                ("phase_self_seconds_total", "Seconds spent in each battle phase, excluding the phases it calls",
+                 self.self_seconds)):
+            lines.append("# HELP {}_{} {}".format(prefix, name, help_text))
+            lines.append("# TYPE {}_{} counter".format(prefix, name))
+            for phase in PHASES:
+                lines.append('{}_{}{{phase="{}"}} {}'.format(prefix, name, phase, values[phase]))
+        for counter in COUNTERS:
+            lines.append("# TYPE {}_{}_total counter".format(prefix, counter))
+            lines.append("{}_{}_total {}".format(prefix, counter, self.counters[counter]))
+        return "\n".join(lines) + "\n"
+
+
+def held_missingnos(battle) -> int:
+    """
+    Returns the number of MissingNos held back by both teams of a battle
+    :complexity: Best and worst is O(1)
+    """
+    held = 0
+    for slot in (battle.missingno1, battle.missingno2):
+        if slot is not None:
+            held += len(slot)
+    return held
+
+
+class TestBattleProfiler(unittest.TestCase):
+    """ Tests for the above class."""
+    def setUp(self):
+        from battle import Battle
+        from random_stream import RandomStream
+        self.battle = Battle("Ash", "Gary", True, RandomStream(0))
+        self.profiler = BattleProfiler()
+
+    def fight(self) -> str:
+        self.battle.set_up(2, [2, 2, 2], [1, 3, 2], "hp", "lvl")
+        return self.battle.fight()
+
+    def test_attach(self):
+        """ Tests a profiled battle ends as an unprofiled one and is counted."""
+        winner = self.fight()
+        exchanges = self.battle.exchanges
+        self.profiler.attach(self.battle)
+        self.assertIs(self.battle.profiler, self.profiler)
+        self.assertEqual(self.fight(), winner)
+        self.assertEqual(self.profiler.counters["fights"], 1)
+        self.assertEqual(self.profiler.counters["exchanges"], exchanges)
+        self.assertEqual(self.profiler.calls["team_selection"], 2)
+        self.assertRaises(ValueError, self.profiler.attach, self.battle)
+
+    def test_reset(self):
+        """ Tests the battles attached are still counted after a reset."""
+        self.profiler.attach(self.battle)
+        self.fight()
+        exchanges = self.profiler.counters["exchanges"]
+        self.profiler.reset()
+        self.assertEqual(self.profiler.to_dict()["counters"], dict.fromkeys(COUNTERS, 0))
+        self.assertEqual(self.profiler.calls["fight"], 0)
+        self.fight()
+        self.assertEqual(self.profiler.counters["fights"], 1)
+        self.assertEqual(self.profiler.counters["exchanges"], exchanges)
+        self.assertEqual(self.profiler.calls["fight"], 1)
+
+    def test_detach(self):
+        """ Tests a detached battle runs its class's methods and isn't counted."""
+        self.profiler.attach(self.battle)
+        self.profiler.detach(self.battle)
+        self.assertIsNone(self.battle.profiler)
+        self.assertEqual(self.profiler.battles, [])
+        for phase, methods in BATTLE_PHASES:
+            for method in methods:
+                self.assertNotIn(method, self.battle.__dict__)
+        self.fight()
+        self.assertEqual(self.profiler.counters["fights"], 0)
+        self.assertEqual(self.profiler.calls["team_selection"], 0)
+        self.assertRaises(ValueError, self.profiler.detach, self.battle)
+
+
+if __name__ == '__main__':
+    testtorun = TestBattleProfiler()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
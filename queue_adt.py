@@ -7,9 +7,11 @@ __author__ = "Maria Garcia de la Banda for the base"+"XXXXX student for"
 __docformat__ = 'reStructuredText'
 
 import unittest
+from io import StringIO
 from abc import ABC, abstractmethod 
 from typing import TypeVar, Generic
 from referential_array import ArrayR, T
+from stream_writer import write_value, to_string
 
 class Queue(ABC, Generic[T]):
     """ Abstract class for a generic Queue. """
@@ -89,6 +91,41 @@ class CircularQueue(Queue[T]):
         self.front = (self.front+1) % len(self.array)
         return item 
 
+    def append_many(self, items: list) -> None:
+        """ Adds every element of the list to the rear of the queue, in order.
+        :pre: queue has room for every element
+        :raises Exception: if the queue doesn't have room for every element
+        :complexity: O(len(items)) for best/worst case, as the elements are copied in at most two blocks
+        """
+        count = len(items)
+        if self.length + count > len(self.array):
+            raise Exception("Queue is full")
+        # Fills up to the end of the array, then wraps around to its start
+        first = min(count, len(self.array) - self.rear)
+        self.array[self.rear:self.rear + first] = items[:first]
+        self.array[:count - first] = items[first:]
+        self.length += count
+        self.rear = (self.rear + count) % len(self.array)
+
+    def serve_many(self, count: int) -> list:
+        """ Deletes and returns count elements from the queue's front.
+        :return: a list of the served elements, in the order serve() would return them
+        :pre: queue has at least count elements
+        :raises ValueError: if count is negative
+        :raises Exception: if the queue has less than count elements
+        :complexity: O(count) for best/worst case, as the elements are copied in at most two blocks
+        """
+        if count < 0:
+            raise ValueError("Count must not be negative")
+        elif count > self.length:
+            raise Exception("Queue is empty")
+        # Takes up to the end of the array, then wraps around to its start
+        first = min(count, len(self.array) - self.front)
+        items = self.array[self.front:self.front + first] + self.array[:count - first]
+        self.length -= count
+        self.front = (self.front + count) % len(self.array)
+        return items
+
     def is_full(self) -> T:
         """ True if the queue is full and no element can be appended. """
         return len(self) == len(self.array)
@@ -100,18 +137,126 @@ class CircularQueue(Queue[T]):
         self.rear = 0
 
     # self added
-    def __str__(self) -> str:
+    def write(self, sink) -> None:
         """
-        Returns all the elements in the Queue as a String.
-        :return: A string of all the elements in the circular queue
+        Writes all the elements in the Queue to a sink, from the front to the rear with commas between them,
+        without building a string for the whole queue
+        :param sink: An object with a write(string) method, such as an open file or an io.StringIO
         :complexity: Best and worst is O(length)
         """
-        lst = []
         index = self.front
         for i in range(len(self)):  # Loops through the circular queue
-            lst.append(str(self.array[index]))  # Appends the elements in the circular queue to the list
+            if i > 0:
+                sink.write(", ")
+            write_value(self.array[index], sink)
             index = (index + 1) % len(self.array)
-        return ", ".join(lst)  # Return a string format with commas between each element
+
+    def __str__(self) -> str:
+        """
+        Returns all the elements in the Queue as a String.
+        :return: A string of all the elements in the circular queue
+        :complexity: Best and worst is O(length) following write()
+        """
+        return to_string(self)
+
+
+class DynamicCircularQueue(CircularQueue[T]):
+    """ Circular implementation of a queue with an array that grows and shrinks.
+
+    The array doubles when an append finds it full and halves when a serve leaves it a quarter full,
+    so append and serve are amortised O(1) and the queue is never full.
+    """
+    GROWTH_FACTOR = 2
+    SHRINK_RATIO = 4
+
+    def __init__(self, max_capacity: int = CircularQueue.MIN_CAPACITY) -> None:
+        """ Initialises the queue with the given starting capacity,
+            which is also the smallest the array shrinks to.
+        """
+        CircularQueue.__init__(self, max_capacity)
+        self.min_capacity = len(self.array)
+
+    def _resize(self, capacity: int) -> None:
+        """ Moves the elements, from the front to the rear, to the start of a new array of the given capacity.
+        :complexity: O(capacity) for best/worst case to initialise the new array
+        :pre: capacity >= len(self)
+        """
+        new_array = ArrayR(capacity)
+        # Copies the items from the front to the end of the array, then the ones that wrapped around to its start
+        first = min(self.length, len(self.array) - self.front)
+        new_array[:first] = self.array[self.front:self.front + first]
+        new_array[first:self.length] = self.array[:self.length - first]
+        self.array = new_array
+        self.front = 0
+        self.rear = self.length % capacity
+
+    def is_full(self) -> bool:
+        """ False, as the array grows when an element is appended to a full array. """
+        return False
+
+    def append(self, item: T) -> None:
+        """ Adds an element to the rear of the queue, doubling the array if it is full.
+        :complexity: O(1) amortised, O(len(self)) when the array grows
+        """
+        if self.length == len(self.array):
+            self._resize(self.GROWTH_FACTOR * len(self.array))
+        self.array[self.rear] = item
+        self.length += 1
+        self.rear = (self.rear + 1) % len(self.array)
+
+    def serve(self) -> T:
+        """ Deletes and returns the element at the queue's front, halving the array once it is a quarter full.
+        :pre: queue is not empty
+        :raises Exception: if the queue is empty
+        :complexity: O(1) amortised, O(len(self)) when the array shrinks
+        """
+        if self.is_empty():
+            raise Exception("Queue is empty")
+        self.length -= 1
+        item = self.array[self.front]
+        self.array[self.front] = None  # Drops the reference so the element can be freed
+        self.front = (self.front + 1) % len(self.array)
+        if self.length * self.SHRINK_RATIO <= len(self.array) and len(self.array) > self.min_capacity:
+            self._resize(max(self.min_capacity, len(self.array) // self.GROWTH_FACTOR))
+        return item
+
+    def append_many(self, items: list) -> None:
+        """ Adds every element of the list to the rear of the queue, growing the array once if they don't fit.
+        :complexity: O(len(items)) amortised, O(len(self) + len(items)) when the array grows
+        """
+        capacity = len(self.array)
+        while capacity < self.length + len(items):
+            capacity *= self.GROWTH_FACTOR
+        if capacity > len(self.array):
+            self._resize(capacity)
+        CircularQueue.append_many(self, items)
+
+    def serve_many(self, count: int) -> list:
+        """ Deletes and returns count elements from the queue's front, shrinking the array once if it is left a
+        quarter full.
+        :return: a list of the served elements, in the order serve() would return them
+        :pre: queue has at least count elements
+        :raises ValueError: if count is negative
+        :raises Exception: if the queue has less than count elements
+        :complexity: O(count) amortised, O(len(self)) when the array shrinks
+        """
+        start = self.front
+        items = CircularQueue.serve_many(self, count)
+        # Drops the references, in the same two blocks they were served from
+        first = min(count, len(self.array) - start)
+        self.array[start:start + first] = [None] * first
+        self.array[:count - first] = [None] * (count - first)
+        capacity = len(self.array)
+        while self.length * self.SHRINK_RATIO <= capacity and capacity > self.min_capacity:
+            capacity = max(self.min_capacity, capacity // self.GROWTH_FACTOR)
+        if capacity < len(self.array):
+            self._resize(capacity)
+        return items
+
+    def clear(self) -> None:
+        """ Clears all elements from the queue and shrinks the array back to its starting capacity. """
+        CircularQueue.clear(self)
+        self.array = ArrayR(self.min_capacity)
 
 
 class TestQueue(unittest.TestCase):
@@ -192,6 +337,36 @@ class TestQueue(unittest.TestCase):
             for i in range(nitems):
                 self.assertEqual(queue.serve(), i)
                 
+    def test_append_many_and_serve_many(self):
+        """ Tests bulk appends and serves keep the order when the queue wraps around."""
+        for queue, length in zip(self.queues, self.lengths):
+            expected = list(range(length))
+            for i in range(3):
+                # Moves the front along the array so the blocks wrap around its end
+                block = list(range(100 * (i + 1), 100 * (i + 1) + self.LARGE))
+                queue.append_many(block)
+                expected += block
+                self.assertEqual(queue.serve_many(self.LARGE), expected[:self.LARGE])
+                expected = expected[self.LARGE:]
+                self.assertEqual(len(queue), len(expected))
+            self.assertEqual(queue.serve_many(len(queue)), expected)
+        self.assertRaises(Exception, self.empty_queue.serve_many, 1)
+        self.assertRaises(Exception, self.empty_queue.append_many, list(range(self.CAPACITY + 1)))
+        self.empty_queue.append(1)
+        self.assertRaises(ValueError, self.empty_queue.serve_many, -2)
+        self.assertEqual(len(self.empty_queue), 1)
+        self.assertEqual(self.empty_queue.serve_many(0), [])
+        self.assertEqual(self.empty_queue.serve_many(1), [1])
+
+    def test_write(self):
+        """ Tests writing to a sink gives the same string as str(), from the front of a wrapped around queue."""
+        for i in range(self.CAPACITY - 2):
+            self.large_queue.append(self.large_queue.serve())
+        sink = StringIO()
+        self.large_queue.write(sink)
+        self.assertEqual(sink.getvalue(), str(self.large_queue))
+        self.assertEqual(str(self.large_queue), "8, 9, 0, 1, 2, 3, 4, 5, 6, 7")
+
     def test_clear(self):
         for queue in self.queues:
             queue.clear()
@@ -199,6 +374,71 @@ class TestQueue(unittest.TestCase):
             self.assertTrue(queue.is_empty())
 
 
+
+class TestDynamicCircularQueue(unittest.TestCase):
+    """ Tests for the growable circular queue."""
+    START = 2
+    COUNT = 100
+
+    def setUp(self):
+        self.queue = DynamicCircularQueue(self.START)
+
+    def test_grow(self):
+        """ Tests appending past the starting capacity doubles the array."""
+        for i in range(self.COUNT):
+            self.queue.append(i)
+        self.assertEqual(len(self.queue), self.COUNT)
+        self.assertFalse(self.queue.is_full())
+        self.assertEqual(len(self.queue.array), 128)
+
+    def test_append_and_serve_wrapped(self):
+        """ Tests the order is kept when the array grows while the queue wraps around."""
+        expected = 0
+        for i in range(self.COUNT):
+            self.queue.append(i)
+            if i % 3 == 0:
+                self.assertEqual(self.queue.serve(), expected)
+                expected += 1
+        while not self.queue.is_empty():
+            self.assertEqual(self.queue.serve(), expected)
+            expected += 1
+        self.assertEqual(expected, self.COUNT)
+        self.assertRaises(Exception, self.queue.serve)
+
+    def test_shrink(self):
+        """ Tests serving shrinks the array, but never below the starting capacity."""
+        for i in range(self.COUNT):
+            self.queue.append(i)
+        while len(self.queue) > 10:
+            self.queue.serve()
+        self.assertLessEqual(len(self.queue.array), 4 * 10)
+        self.assertEqual(str(self.queue), ", ".join(str(i) for i in range(self.COUNT - 10, self.COUNT)))
+        while not self.queue.is_empty():
+            self.queue.serve()
+        self.assertEqual(len(self.queue.array), self.START)
+
+    def test_append_many_and_serve_many(self):
+        """ Tests bulk appends grow the array once, and bulk serves keep the order and shrink it."""
+        self.queue.append(0)
+        self.queue.serve()
+        self.queue.append_many(list(range(self.COUNT)))
+        self.assertEqual(len(self.queue.array), 128)
+        self.assertEqual(self.queue.serve_many(self.COUNT - 10), list(range(self.COUNT - 10)))
+        self.assertLessEqual(len(self.queue.array), 4 * 10)
+        self.assertRaises(ValueError, self.queue.serve_many, -2)
+        self.assertEqual(len(self.queue), 10)
+        self.queue.append_many([self.COUNT])
+        self.assertEqual(self.queue.serve_many(11), list(range(self.COUNT - 10, self.COUNT + 1)))
+        self.assertEqual(len(self.queue.array), self.START)
+
+    def test_clear(self):
+        for i in range(self.COUNT):
+            self.queue.append(i)
+        self.queue.clear()
+        self.assertTrue(self.queue.is_empty())
+        self.assertEqual(len(self.queue.array), self.START)
+
+
 if __name__ == '__main__':
     testtorun = TestQueue()
     suite = unittest.TestLoader().loadTestsFromModule(testtorun)
@@ -0,0 +1,168 @@
+"""
+Class for a seedable stream of random numbers drawn in blocks, injected into the GlitchMon and MissingNo of a battle
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from array import array
+from random import Random
+import sys
+import unittest
+
+
+class RandomStream:
+    BLOCK_SIZE = 4096
+    WORD_BITS = 32
+
+    def __init__(self, seed: int = None, block_size: int = BLOCK_SIZE) -> None:
+        """
+        Constructor for RandomStream. Two streams with the same seed give the same numbers on any machine and in
+        any process
+        :param seed: An integer to seed the stream with, or None to seed it from the system
+        :param block_size: An integer of how many 32 bit words are drawn at once
+        :raises ValueError: If block_size is lesser than or equal to 0
+        :complexity: Best and worst is O(1) as local variables are initialised
+        """
+        if block_size <= 0:
+            raise ValueError("Block size must be above 0")
+        self.generator = Random(seed)
+        self.block_size = block_size
+        self.block = array('I')
+        self.position = 0
+
+    def refill(self) -> None:
+        """
+        Draws a new block of random 32 bit words from the generator
+        :complexity: Best and worst is O(block_size)
+        """
+        words = self.generator.getrandbits(self.block_size * RandomStream.WORD_BITS)
+        self.block = array('I')
+        self.block.frombytes(words.to_bytes(self.block_size * 4, 'little'))
+        if sys.byteorder == 'big':
+            # Words are always read in little endian order so the stream is the same on every machine
+            self.block.byteswap()
+        self.position = 0
+
+    def next_word(self) -> int:
+        """
+        Returns the next random 32 bit word of the stream
+        :return: An integer between 0 and 2^32 - 1
+        :complexity: Best is O(1) when the block has words left. Worst is O(block_size) when it is refilled
+        """
+        if self.position >= len(self.block):
+            self.refill()
+        word = self.block[self.position]
+        self.position += 1
+        return word
+
+    def randint(self, a: int, b: int) -> int:
+        """
+        Returns a random integer between a and b inclusive, like random.randint()
+        :param a: An integer of the lowest value
+        :param b: An integer of the highest value
+        :return: An integer between a and b inclusive
+        :raises ValueError: If b is lesser than a, or the range doesn't fit in 32 bits
+        :complexity: Best is O(1). Words beyond the largest multiple of the range are redrawn so every value is equally
+                     likely, which happens less than half the time
+        """
+        span = b - a + 1
+        if span <= 0:
+            raise ValueError("Empty range for randint")
+        elif span > 1 << RandomStream.WORD_BITS:
+            raise ValueError("Range for randint must fit in 32 bits")
+        limit = (1 << RandomStream.WORD_BITS) // span * span
+        word = self.next_word()
+        while word >= limit:
+            word = self.next_word()
+        return a + word % span
+
+    def getstate(self) -> tuple:
+        """
+        Returns the state of the stream, like random.getstate(), so it can be restored to give the same numbers again
+        :return: A tuple of the generator's state, the words of the current block and the position in it
+        :complexity: Best and worst is O(block_size) to copy the block
+        """
+        return self.generator.getstate(), self.block.tobytes(), self.position
+
+    def setstate(self, state: tuple) -> None:
+        """
+        Restores a state returned by getstate(), from this or another stream
+        :param state: A tuple returned by getstate()
+        :complexity: Best and worst is O(block_size) to copy the block
+        """
+        generator_state, block, position = state
+        self.generator.setstate(generator_state)
+        self.block = array('I')
+        self.block.frombytes(block)
+        self.position = position
+
+
+class TestRandomStream(unittest.TestCase):
+    """ Tests for the above class."""
+    def draw(self, stream: RandomStream, count: int) -> list:
+        """ Returns the next count words of a stream."""
+        return [stream.next_word() for i in range(count)]
+
+    def test_seed(self):
+        """ Tests streams with the same seed give the same words, over several blocks."""
+        self.assertEqual(self.draw(RandomStream(7, 8), 30), self.draw(RandomStream(7, 8), 30))
+        self.assertNotEqual(self.draw(RandomStream(7, 8), 30), self.draw(RandomStream(8, 8), 30))
+        # The block size only changes how many words are drawn at once
+        self.assertEqual(self.draw(RandomStream(7, 8), 30), self.draw(RandomStream(7), 30))
+        self.assertRaises(ValueError, RandomStream, 7, 0)
+
+    def test_state(self):
+        """ Tests a stream restored mid-block gives the words the saved one gave afterwards."""
+        stream = RandomStream(3, 8)
+        self.draw(stream, 5)
+        state = stream.getstate()
+        expected = self.draw(stream, 20)
+        restored = RandomStream(4, 8)
+        self.draw(restored, 2)
+        restored.setstate(state)
+        self.assertEqual(self.draw(restored, 20), expected)
+        stream.setstate(state)
+        self.assertEqual(self.draw(stream, 20), expected)
+
+    def test_randint(self):
+        """ Tests randint() stays within its range and gives every value of it."""
+        stream = RandomStream(5)
+        for a, b in ((0, 2), (1, 100), (-3, 3), (4, 4), (0, 5), (0, 7)):
+            values = [stream.randint(a, b) for i in range(2000)]
+            self.assertEqual(set(values), set(range(a, b + 1)))
+        self.assertTrue(0 <= stream.randint(0, (1 << 32) - 1) < 1 << 32)
+        self.assertRaises(ValueError, stream.randint, 3, 2)
+        self.assertRaises(ValueError, stream.randint, 0, 1 << 32)
+
+    def test_rejection(self):
+        """ Tests a word beyond the largest multiple of a range that isn't a power of 2 is redrawn."""
+        stream = RandomStream(0)
+        # 2^32 - 1 is the largest multiple of 3 below 2^32, so the word equal to it is redrawn
+        stream.block = array('I', [(1 << 32) - 1, 4, (1 << 32) - 2])
+        stream.position = 0
+        self.assertEqual(stream.randint(0, 2), 1)
+        self.assertEqual(stream.position, 2)
+        # Every word is kept for a range that is a power of 2
+        self.assertEqual(stream.randint(0, 3), 2)
+        self.assertEqual(stream.position, 3)
+
+    def test_missingno(self):
+        """ Tests MissingNos given streams with the same seed roll the same superpowers and damage."""
+        from MissingNo import MissingNo
+        from pokemon import Charmander
+        results = []
+        for i in range(2):
+            missingno = MissingNo(RandomStream(11))
+            rolls = []
+            for j in range(40):
+                missingno.hp = MissingNo.HP
+                missingno.get_damage(Charmander())
+                rolls.append((missingno.get_hp(), missingno.get_level(), missingno.last_superpower))
+            results.append(rolls)
+        self.assertEqual(results[0], results[1])
+        self.assertGreater(len(set(results[0])), 1)
+
+
+if __name__ == '__main__':
+    testtorun = TestRandomStream()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
@@ -12,16 +12,24 @@ space to hold the references.
 Note that while I do check the precondition in __init__ (noone else
 would), I do not check that of getitem or setitem, since that is already
 checked by self.array[index].
+
+The array type for each length is created once and kept in _types, and
+the new array is filled with a single slice assignment. Slices are passed
+straight to the ctypes array, so array[i:j] returns a list and
+array[i:j] = values copies a block in one call, which from_iterable(),
+copy() and the ADTs' shuffles and resizes rely on.
 """
 __author__ = "Julian Garcia for the __init__ code, Maria Garcia de la Banda for the rest"
 __docformat__ = 'reStructuredText'
 
 from ctypes import py_object
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterable
 
 T = TypeVar('T')
 
 class ArrayR(Generic[T]):
+    _types = {}  # ctypes array type of every length created so far
+
     def __init__(self, length: int) -> None:
         """ Creates an array of references to objects of the given length
         :complexity: O(length) for best/worst case to initialise to None
@@ -29,8 +37,38 @@ class ArrayR(Generic[T]):
         """
         if length <= 0:
             raise ValueError("Array length should be larger than 0.")
-        self.array = (length * py_object)() # initialises the space
-        self.array[:] =  [None for _ in range(length)]
+        array_type = ArrayR._types.get(length)
+        if array_type is None:
+            array_type = ArrayR._types[length] = length * py_object
+        self.array = array_type() # initialises the space
+        self.array[:] = [None] * length
+
+    @classmethod
+    def from_iterable(cls, iterable: Iterable[T], length: int = None) -> 'ArrayR[T]':
+        """ Creates an array holding the items of the iterable in order, followed by Nones up to length
+        :complexity: O(max(length, number of items)) for best/worst case
+        :pre: the iterable has at most length items, if length is given
+        """
+        items = list(iterable)
+        if length is None:
+            length = len(items)
+        elif length < len(items):
+            raise ValueError("Array length should fit every item.")
+        array = cls(length)
+        array.array[:len(items)] = items
+        return array
+
+    def copy(self, length: int = None, count: int = None) -> 'ArrayR[T]':
+        """ Returns a new array of the given length, the same length if None, holding the first count items
+        of this one, every item that fits if None
+        :complexity: O(length) for best/worst case
+        :pre: count <= min(length, len(self))
+        """
+        new_array = ArrayR(len(self) if length is None else length)
+        if count is None:
+            count = min(len(self), len(new_array))
+        new_array.array[:count] = self.array[:count]
+        return new_array
 
     def __len__(self) -> int:
         """ Returns the length of the array
@@ -39,15 +77,15 @@ class ArrayR(Generic[T]):
         return len(self.array)
 
     def __getitem__(self, index: int) -> T:
-        """ Returns the object in position index.
-        :complexity: O(1)
+        """ Returns the object in position index, or a list of the objects in a slice.
+        :complexity: O(1), O(length of the slice) for a slice
         :pre: index in between 0 and length - self.array[] checks it
         """
         return self.array[index]
 
     def __setitem__(self, index: int, value: T) -> None:
-        """ Sets the object in position index to value
-        :complexity: O(1)
+        """ Sets the object in position index to value, or the objects in a slice to a sequence of the same length
+        :complexity: O(1), O(length of the slice) for a slice
         :pre: index in between 0 and length - self.array[] checks it
         """
         self.array[index] = value
@@ -0,0 +1,183 @@
+"""
+Class that replays a past battle up to any exchange from its seed and team compositions, without asking for user
+input. Snapshots of the battle are kept every few exchanges, like keyframes, so a replay starts from the closest
+one instead of fighting the battle again from the start
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from battle import Battle
+from poke_team import PokeTeam
+from random_stream import RandomStream
+from snapshot import encode_battle, decode_battle
+import unittest
+
+
+class BattleReplay:
+    KEYFRAME_INTERVAL = 256  # Exchanges between keyframes
+
+    def __init__(self, seed: int, battle_mode: int, team1_head_count: list, team2_head_count: list,
+                 criterion_team1: str = None, criterion_team2: str = None, trusted: bool = True,
+                 trainer_one_name: str = "Trainer 1", trainer_two_name: str = "Trainer 2",
+                 keyframe_interval: int = KEYFRAME_INTERVAL, team_limit: int = PokeTeam.LIMIT) -> None:
+        """
+        Constructor for BattleReplay, which sets up the battle as Battle.headless_battle() would with a RandomStream
+        seeded with seed. Keyframes are only made as far as the battle has been replayed
+        :param seed: An integer the battle's RandomStream was seeded with
+        :param battle_mode: An integer that determines the type of battle
+        :param team1_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+                                 for team 1
+        :param team2_head_count: A list of the number of Charmanders, Bulbasaurs, Squirtles and optionally MissingNo
+                                 for team 2
+        :param criterion_team1: A string of the criterion chosen for team 1, only used when battle mode is 2
+        :param criterion_team2: A string of the criterion chosen for team 2, only used when battle mode is 2
+        :param trusted: A boolean of whether the battle was fought in trusted mode, which gives the same exchanges
+        :param trainer_one_name: A string of the trainer's name
+        :param trainer_two_name: A string of the trainer's name
+        :param keyframe_interval: An integer of how many exchanges there are between keyframes
+        :param team_limit: An integer of the maximum number of pokemons in each team, which must be the team_limit
+                           the battle was fought with, so teams larger than PokeTeam.LIMIT can be replayed
+        :raises TypeError: If keyframe_interval or team_limit isn't an integer, or see Battle.set_up()
+        :raises ValueError: If keyframe_interval or team_limit is lesser than or equal to 0, or see Battle.set_up()
+        :complexity: Best and worst is O(N), where N is the size of both teams, to set up the battle
+        """
+        if type(keyframe_interval) != int:
+            raise TypeError("Keyframe interval must be an integer")
+        elif keyframe_interval <= 0:
+            raise ValueError("Keyframe interval must be above 0")
+        self.keyframe_interval = keyframe_interval
+        rng = RandomStream(seed)
+        battle = Battle(trainer_one_name, trainer_two_name, trusted, rng, team_limit=team_limit)
+        battle.set_up(battle_mode, team1_head_count, team2_head_count, criterion_team1, criterion_team2)
+        battle.exchanges = 0
+        # Keyframe i is the battle after i * keyframe_interval exchanges, as a snapshot and its RandomStream's state
+        self.keyframes = [(encode_battle(battle), rng.getstate())]
+        self.length = None  # Number of exchanges in the whole battle, once the replay has reached its end
+
+    def load(self, index: int) -> Battle:
+        """
+        Returns a new Battle restored from a keyframe, with its own RandomStream
+        :param index: An integer of the keyframe's index
+        :complexity: Best and worst is O(N), where N is the size of both teams, following decode_battle()
+        """
+        snapshot, state = self.keyframes[index]
+        rng = RandomStream()
+        rng.setstate(state)
+        return decode_battle(snapshot, rng)
+
+    def get_battle(self, exchange: int) -> Battle:
+        """
+        Returns the battle as it was just after a number of exchanges, fought on from the closest keyframe.
+        The battle can be fought on with start_fight() and next_exchange(), which carry on its count of exchanges, or
+        with fight(), which counts them from 0 again
+        :param exchange: An integer of the number of exchanges fought, 0 for the battle before it starts
+        :return: A new Battle object, which doesn't change the replay when fought on
+        :raises TypeError: If exchange isn't an integer
+        :raises IndexError: If exchange is negative or the battle was over in fewer exchanges
+        :complexity: Best is O(N + K), where N is the size of both teams and K the keyframe interval, once a
+                     keyframe at or before exchange has been made. Worst is O(exchange + N * exchange / K) the first
+                     time the replay goes that far
+        """
+        if type(exchange) != int:
+            raise TypeError("Exchange must be an integer")
+        elif exchange < 0 or (self.length is not None and exchange > self.length):
+            raise IndexError("Battle has no exchange {}".format(exchange))
+        index = exchange // self.keyframe_interval
+        while index >= len(self.keyframes) and self.length is None:
+            self.add_keyframe()
+        index = min(index, len(self.keyframes) - 1)
+        battle = self.load(index)
+        compare_speed = battle.start_fight()
+        while battle.exchanges < exchange and not battle.is_over():
+            battle.next_exchange(compare_speed)
+        if battle.exchanges < exchange:
+            raise IndexError("Battle has no exchange {}".format(exchange))
+        return battle
+
+    def add_keyframe(self) -> None:
+        """
+        Fights on from the last keyframe and makes the next one, or records the number of exchanges in the battle if
+        it is over before then
+        :complexity: Best and worst is O(N + K), where N is the size of both teams and K the keyframe interval
+        """
+        battle = self.load(len(self.keyframes) - 1)
+        compare_speed = battle.start_fight()
+        target = len(self.keyframes) * self.keyframe_interval
+        while battle.exchanges < target and not battle.is_over():
+            battle.next_exchange(compare_speed)
+        if battle.exchanges < target or battle.is_over():
+            self.length = battle.exchanges
+        if battle.exchanges == target:
+            self.keyframes.append((encode_battle(battle), battle.rng.getstate()))
+
+    def __len__(self) -> int:
+        """
+        Returns the number of exchanges in the whole battle, replaying it to its end the first time
+        :complexity: Best is O(1) once the end has been reached. Worst is O(E + N * E / K), where E is the number of
+                     exchanges, N the size of both teams and K the keyframe interval
+        """
+        while self.length is None:
+            self.add_keyframe()
+        return self.length
+
+
+class TestBattleReplay(unittest.TestCase):
+    """ Tests for the above class."""
+    BATTLES = ((0, [2, 2, 2], [1, 2, 2, 1], None, None, PokeTeam.LIMIT),
+               (1, [1, 2, 2, 1], [3, 1, 2], None, None, PokeTeam.LIMIT),
+               (2, [2, 1, 2, 1], [2, 2, 2], "hp", "spd", PokeTeam.LIMIT),
+               (0, [20, 25, 15, 1], [30, 20, 10], None, None, 80),
+               (2, [60, 50, 40, 1], [50, 50, 50], "lvl", "atk", 160))
+
+    def fight(self, seed: int, battle_mode: int, team1_head_count: list, team2_head_count: list,
+              criterion_team1: str, criterion_team2: str, team_limit: int) -> list:
+        """ Returns the snapshot of the battle after every exchange, fought directly."""
+        battle = Battle("Trainer 1", "Trainer 2", True, RandomStream(seed), team_limit=team_limit)
+        battle.set_up(battle_mode, team1_head_count, team2_head_count, criterion_team1, criterion_team2)
+        states = [encode_battle(battle)]
+        compare_speed = battle.start_fight()
+        while not battle.is_over():
+            battle.next_exchange(compare_speed)
+            states.append(encode_battle(battle))
+        return states
+
+    def test_get_battle(self):
+        """ Tests the battle replayed to every exchange is the battle fought directly to it."""
+        for seed, matchup in enumerate(self.BATTLES):
+            states = self.fight(seed, *matchup)
+            for keyframe_interval in (1, 2, 3):
+                replay = BattleReplay(seed, *matchup[:5], keyframe_interval=keyframe_interval, team_limit=matchup[5])
+                # Replayed from the end back, then again from the start once every keyframe has been made
+                for exchange in list(range(len(states) - 1, -1, -1)) + list(range(len(states))):
+                    battle = replay.get_battle(exchange)
+                    self.assertEqual(battle.exchanges, exchange)
+                    self.assertEqual(encode_battle(battle), states[exchange])
+                self.assertEqual(len(replay), len(states) - 1)
+                self.assertRaises(IndexError, replay.get_battle, len(states))
+                self.assertRaises(IndexError, replay.get_battle, -1)
+                self.assertRaises(TypeError, replay.get_battle, 1.0)
+
+    def test_large_battle(self):
+        """ Tests a battle of teams above PokeTeam.LIMIT spans several keyframes and is fought on the same."""
+        matchup = self.BATTLES[4]
+        replay = BattleReplay(7, *matchup[:5], team_limit=matchup[5], keyframe_interval=16)
+        self.assertGreater(len(replay), 3 * 16)
+        self.assertEqual(len(replay.keyframes), len(replay) // 16 + 1)
+        battle = Battle("Trainer 1", "Trainer 2", True, RandomStream(7), team_limit=matchup[5])
+        winner = battle.headless_battle(*matchup[:5])
+        replayed = replay.get_battle(len(replay) // 2)
+        compare_speed = replayed.start_fight()
+        while not replayed.is_over():
+            replayed.next_exchange(compare_speed)
+        self.assertEqual(replayed.get_result(), winner)
+        self.assertEqual(replayed.exchanges, battle.exchanges)
+        self.assertRaises(ValueError, BattleReplay, 7, *matchup[:5])
+
+    def test_keyframe_interval(self):
+        self.assertRaises(TypeError, BattleReplay, 0, *self.BATTLES[0][:5], keyframe_interval=1.5)
+        self.assertRaises(ValueError, BattleReplay, 0, *self.BATTLES[0][:5], keyframe_interval=0)
+
+
+if __name__ == '__main__':
+    testtorun = TestBattleReplay()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
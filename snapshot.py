@@ -0,0 +1,433 @@
+"""
+Compact binary snapshots of PokeTeam and Battle objects, so a battle can be checkpointed and resumed later.
+Every pokemon is a fixed-width record packed with struct, and snapshots are read back through a memoryview
+without copying
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from battle import Battle
+from poke_team import PokeTeam
+from pokemon_pool import SPECIES
+from MissingNo import MissingNo
+from stack_adt import ArrayStack
+from queue_adt import CircularQueue
+from array_sorted_list import ArraySortedList
+from heap_sorted_list import HeapSortedList
+import struct
+import unittest
+
+VERSION = 1
+TEAM_MAGIC = b"PT"
+BATTLE_MAGIC = b"PB"
+CRITERIA = (None, "lvl", "hp", "atk", "def", "spd")  # Criterion of a team, by its code
+CONTAINERS = (None, ArrayStack, CircularQueue, ArraySortedList, HeapSortedList)  # Class of a team, by its code
+NO_MODE = 255  # Battle mode code of a battle that hasn't been set up
+
+# Flags of a pokemon record
+BATTLED = 1
+KEYED = 2  # The pokemon is held in a sorted list item, whose key is the record's key
+
+# Where the pokemon a battle last sent out is, by its code
+OUT_NONE = 0  # No pokemon has been sent out
+OUT_TEAM = 1  # Back in its team, at the record's index
+OUT_SLOT = 2  # In its team's MissingNo holding slot
+OUT_RECORD = 3  # Fainted or out of its team, so its own record follows the teams
+
+# Species, flags, hp, level, attack, defence, speed and key. Attack, defence and speed are only kept by MissingNo
+POKEMON = struct.Struct("<BBiiiiii")
+# Magic, version, battle mode, criterion, container, capacity, member count, unbattled count, slot count and
+# length of the trainer's name
+TEAM = struct.Struct("<2sBBBBIIIBH")
+# Magic, version, trusted, battle mode, both criterions, exchanges, then where pokemon 1 and 2 are and whether the
+# battle is holding a MissingNo for team 1 and 2
+BATTLE = struct.Struct("<2sBBBBBQBIBIBB")
+
+
+def get_code(values: tuple, value) -> int:
+    """
+    Returns the code of a value in a table of codes
+    :raises ValueError: If the value has no code
+    :complexity: Best and worst is O(1) as every table is a handful of values
+    """
+    if value not in values:
+        raise ValueError("{} can't be stored in a snapshot".format(value))
+    return values.index(value)
+
+
+def get_items(team: PokeTeam) -> list:
+    """
+    Returns the objects in a team's container, pokemons or sorted list items, in the order they are recorded.
+    Stacks go from the bottom to the top, queues from the front to the rear and sorted lists in ascending order
+    :complexity: Best and worst is O(N), where N is the team size, or O(N log N) for a HeapSortedList
+    """
+    container = team.team
+    if container is None:
+        return []
+    elif type(container) is ArrayStack:
+        return container.array[0:len(container)]
+    elif type(container) is CircularQueue:
+        return [container.array[(container.front + i) % len(container.array)] for i in range(len(container))]
+    else:
+        return [container[i] for i in range(len(container))]
+
+
+def get_capacity(container) -> int:
+    """
+    Returns how many items a team's container holds before it is full or resized
+    :complexity: Best and worst is O(1)
+    """
+    if container is None:
+        return 0
+    elif type(container) is HeapSortedList:
+        return len(container.heap)
+    else:
+        return len(container.array)
+
+
+def pack_pokemon(buffer: bytearray, offset: int, item) -> int:
+    """
+    Writes the record of a pokemon, or of the pokemon in a sorted list item along with its key
+    :return: An integer of the offset just after the record
+    :complexity: Best and worst is O(1)
+    """
+    keyed = not hasattr(item, "SPECIES_ID")
+    pokemon = item.value if keyed else item
+    flags = (BATTLED if pokemon.battled else 0) | (KEYED if keyed and item.key is not None else 0)
+    if type(pokemon) is MissingNo:
+        attack, defence, speed = pokemon.attack, pokemon.defence, pokemon.speed
+    else:
+        attack = defence = speed = 0
+    POKEMON.pack_into(buffer, offset, pokemon.SPECIES_ID, flags, pokemon.hp, pokemon.level, attack, defence, speed,
+                      item.key if flags & KEYED else 0)
+    return offset + POKEMON.size
+
+
+def make_pokemon(record: tuple, team: PokeTeam, rng=None):
+    """
+    Returns the pokemon of an unpacked record, or its sorted list item if the pokemon was held in one
+    :param record: A tuple of the record's fields, unpacked with POKEMON
+    :param team: The PokeTeam the pokemon belongs to, which makes its sorted list item
+    :param rng: An object with a randint(a, b) method given to a MissingNo, the random module if None
+    :complexity: Best and worst is O(1)
+    """
+    species, flags, hp, level, attack, defence, speed, key = record
+    if SPECIES[species] is MissingNo:
+        pokemon = MissingNo(rng)
+        pokemon.attack = attack
+        pokemon.defence = defence
+        pokemon.speed = speed
+    else:
+        pokemon = SPECIES[species]()
+    pokemon.hp = hp
+    pokemon.level = level
+    pokemon.battled = bool(flags & BATTLED)
+    if team.battle_mode == 2:
+        # The key is kept as it was rather than worked out again, as a held MissingNo's key may be out of date
+        return team.get_item(pokemon, key if flags & KEYED else None)
+    return pokemon
+
+
+def unpack_pokemons(view: memoryview, offset: int, count: int, team: PokeTeam, rng=None) -> tuple:
+    """
+    Reads back a number of consecutive pokemon records in one pass
+    :return: A tuple of a list of the pokemons or their items, and the offset just after the records
+    :complexity: Best and worst is O(count)
+    """
+    end = offset + count * POKEMON.size
+    return [make_pokemon(record, team, rng) for record in POKEMON.iter_unpack(view[offset:end])], end
+
+
+def get_team_size(team: PokeTeam) -> int:
+    """
+    Returns the number of bytes of a team's snapshot
+    :complexity: Best and worst is O(1)
+    """
+    count = 0 if team.team is None else len(team.team)
+    return TEAM.size + len(team.trainer.encode()) + (count + len(team.missingno_slot)) * POKEMON.size
+
+
+def pack_team(buffer: bytearray, offset: int, team: PokeTeam, items: list = None) -> int:
+    """
+    Writes a team's snapshot into a buffer
+    :param items: A list of the team's items from get_items(), worked out again if None
+    :return: An integer of the offset just after the snapshot
+    :complexity: Best and worst is O(N), where N is the team size, or O(N log N) for a HeapSortedList
+    """
+    if items is None:
+        items = get_items(team)
+    name = team.trainer.encode()
+    TEAM.pack_into(buffer, offset, TEAM_MAGIC, VERSION, team.battle_mode, get_code(CRITERIA, team.criterion),
+                   get_code(CONTAINERS, type(team.team) if team.team is not None else None),
+                   get_capacity(team.team), len(items), team.unbattled, len(team.missingno_slot), len(name))
+    offset += TEAM.size
+    buffer[offset:offset + len(name)] = name
+    offset += len(name)
+    for item in items:
+        offset = pack_pokemon(buffer, offset, item)
+    for i in range(len(team.missingno_slot)):
+        offset = pack_pokemon(buffer, offset, team.missingno_slot[i])
+    return offset
+
+
+def unpack_team(view: memoryview, offset: int, rng=None) -> tuple:
+    """
+    Reads back a team's snapshot from a buffer
+    :param rng: An object with a randint(a, b) method given to the team and its MissingNo, the random module if None
+    :return: A tuple of the PokeTeam, its items in the order they were recorded and the offset just after the
+             snapshot
+    :raises ValueError: If the buffer doesn't hold a team snapshot of this version
+    :complexity: Best and worst is O(N), where N is the team size, or O(N log N) for a HeapSortedList
+    """
+    magic, version, battle_mode, criterion, container, capacity, count, unbattled, slot, name_length = \
+        TEAM.unpack_from(view, offset)
+    if magic != TEAM_MAGIC or version != VERSION:
+        raise ValueError("Snapshot isn't a version {} team snapshot".format(VERSION))
+    offset += TEAM.size
+    team = PokeTeam(str(view[offset:offset + name_length], "utf-8"), rng)
+    offset += name_length
+    team.battle_mode = battle_mode
+    team.criterion = CRITERIA[criterion]
+    team.unbattled = unbattled
+    if battle_mode == 2:
+        team.key_function = team.get_key_function(team.criterion)
+
+    items, offset = unpack_pokemons(view, offset, count, team, rng)
+    container_class = CONTAINERS[container]
+    if container_class is ArrayStack:
+        team.team = ArrayStack(capacity)
+        team.team.push_many(items)
+    elif container_class is CircularQueue:
+        team.team = CircularQueue(capacity)
+        team.team.append_many(items)
+    elif container_class is ArraySortedList:
+        # Items are copied in as they were held, so items sharing a key stay in the same order
+        team.team = ArraySortedList(capacity)
+        team.team.array[0:count] = items
+        team.team.length = count
+    elif container_class is HeapSortedList:
+        # Added in the order they are withdrawn, so out of the items sharing a key the first one is withdrawn first
+        team.team = HeapSortedList(capacity)
+        for i in range(count - 1, -1, -1):
+            team.team.add(items[i])
+    held, offset = unpack_pokemons(view, offset, slot, team, rng)
+    for item in held:
+        team.missingno_slot.add(item)
+    return team, items, offset
+
+
+def encode_team(team: PokeTeam) -> bytes:
+    """
+    Returns a compact binary snapshot of a team: its trainer, battle mode, criterion, container and every pokemon's
+    species, hp, level and battled status in the order they are held. The random number generator and pool aren't
+    recorded
+    :param team: A PokeTeam object
+    :return: The snapshot as bytes
+    :raises ValueError: If the team's container or criterion can't be recorded
+    :complexity: Best and worst is O(N), where N is the team size, or O(N log N) for a HeapSortedList
+    """
+    buffer = bytearray(get_team_size(team))
+    pack_team(buffer, 0, team)
+    return bytes(buffer)
+
+
+def decode_team(data, rng=None) -> PokeTeam:
+    """
+    Returns a new PokeTeam from a snapshot made by encode_team(), which battles the same as the recorded team
+    :param data: A bytes-like object of the snapshot
+    :param rng: An object with a randint(a, b) method given to the team and its MissingNo, the random module if None
+    :return: A PokeTeam object
+    :raises ValueError: If data isn't a team snapshot of this version
+    :complexity: Same as encode_team()
+    """
+    return unpack_team(memoryview(data), 0, rng)[0]
+
+
+def locate(team: PokeTeam, items: list, out) -> tuple:
+    """
+    Returns where the pokemon a battle last sent out for a team is, as a code and an index into the team's items
+    :param out: The pokemon, or sorted list item in battle mode 2, last sent out for the team
+    :complexity: Best is O(1) when it is in the holding slot. Worst is O(N), where N is the team size
+    """
+    if out is None:
+        return OUT_NONE, 0
+    elif len(team.missingno_slot) > 0 and team.missingno_slot[0] is out:
+        return OUT_SLOT, 0
+    for i in range(len(items)):
+        if items[i] is out:
+            return OUT_TEAM, i
+    return OUT_RECORD, 0
+
+
+def encode_battle(battle: Battle) -> bytes:
+    """
+    Returns a compact binary snapshot of a battle: both teams as in encode_team(), the pokemons last sent out and
+    the MissingNo the battle is holding back in battle mode 2
+    :param battle: A Battle object
+    :return: The snapshot as bytes
+    :raises ValueError: If a team's container or a criterion can't be recorded
+    :complexity: Best and worst is O(N), where N is the size of both teams, or O(N log N) with a HeapSortedList
+    """
+    items1 = get_items(battle.team1)
+    items2 = get_items(battle.team2)
+    where1, index1 = locate(battle.team1, items1, battle.pokemon1)
+    where2, index2 = locate(battle.team2, items2, battle.pokemon2)
+    size = BATTLE.size + get_team_size(battle.team1) + get_team_size(battle.team2) + \
+        ((where1 == OUT_RECORD) + (where2 == OUT_RECORD)) * POKEMON.size
+    buffer = bytearray(size)
+    BATTLE.pack_into(buffer, 0, BATTLE_MAGIC, VERSION, battle.trusted,
+                     NO_MODE if battle.battle_mode is None else battle.battle_mode,
+                     get_code(CRITERIA, battle.criterion_team1), get_code(CRITERIA, battle.criterion_team2),
+                     battle.exchanges, where1, index1, where2, index2,
+                     battle.missingno1 is not None, battle.missingno2 is not None)
+    offset = pack_team(buffer, BATTLE.size, battle.team1, items1)
+    offset = pack_team(buffer, offset, battle.team2, items2)
+    if where1 == OUT_RECORD:
+        offset = pack_pokemon(buffer, offset, battle.pokemon1)
+    if where2 == OUT_RECORD:
+        pack_pokemon(buffer, offset, battle.pokemon2)
+    return bytes(buffer)
+
+
+def decode_battle(data, rng=None) -> Battle:
+    """
+    Returns a new Battle from a snapshot made by encode_battle(), which fights on the same as the recorded battle
+    given the same random rolls
+    :param data: A bytes-like object of the snapshot
+    :param rng: An object with a randint(a, b) method owned by the battle, the random module if None
+    :return: A Battle object
+    :raises ValueError: If data isn't a battle snapshot of this version
+    :complexity: Same as encode_battle()
+    """
+    view = memoryview(data)
+    magic, version, trusted, battle_mode, criterion1, criterion2, exchanges, where1, index1, where2, index2, \
+        held1, held2 = BATTLE.unpack_from(view, 0)
+    if magic != BATTLE_MAGIC or version != VERSION:
+        raise ValueError("Snapshot isn't a version {} battle snapshot".format(VERSION))
+    team1, items1, offset = unpack_team(view, BATTLE.size, rng)
+    team2, items2, offset = unpack_team(view, offset, rng)
+    battle = Battle(team1.trainer, team2.trainer, bool(trusted), rng)
+    battle.team1 = team1
+    battle.team2 = team2
+    battle.battle_mode = None if battle_mode == NO_MODE else battle_mode
+    battle.criterion_team1 = CRITERIA[criterion1]
+    battle.criterion_team2 = CRITERIA[criterion2]
+    battle.exchanges = exchanges
+    battle.missingno1 = team1.missingno_slot if held1 else None
+    battle.missingno2 = team2.missingno_slot if held2 else None
+
+    # The pokemons last sent out are the same objects as the ones in the teams, as they are when fighting
+    outs = []
+    for team, items, where, index in ((team1, items1, where1, index1), (team2, items2, where2, index2)):
+        if where == OUT_TEAM:
+            outs.append(items[index])
+        elif where == OUT_SLOT:
+            outs.append(team.missingno_slot[0])
+        elif where == OUT_RECORD:
+            out, offset = unpack_pokemons(view, offset, 1, team, rng)
+            outs += out
+        else:
+            outs.append(None)
+    battle.pokemon1, battle.pokemon2 = outs
+    return battle
+
+
+class TestSnapshot(unittest.TestCase):
+    """ Tests for the above functions."""
+    # Battle mode, both teams, both criteria and the team limit of the battles snapshotted
+    BATTLES = ((0, [2, 2, 1, 1], [1, 2, 2, 1], None, None, PokeTeam.LIMIT),
+               (1, [1, 2, 2, 1], [2, 1, 2, 1], None, None, PokeTeam.LIMIT),
+               (2, [2, 1, 2, 1], [1, 2, 2, 1], "hp", "spd", PokeTeam.LIMIT),
+               (2, [1, 1, 3, 1], [2, 2, 1], "lvl", "def", PokeTeam.LIMIT),
+               (2, [60, 50, 40, 1], [50, 50, 50, 1], "atk", "hp", 160))
+
+    def set_up(self, seed: int, battle_mode: int, team1_head_count: list, team2_head_count: list,
+               criterion_team1: str, criterion_team2: str, team_limit: int) -> Battle:
+        from random_stream import RandomStream
+        battle = Battle("Ash", "Gary", True, RandomStream(seed), team_limit=team_limit)
+        battle.set_up(battle_mode, team1_head_count, team2_head_count, criterion_team1, criterion_team2)
+        return battle
+
+    def decode(self, data: bytes, state: tuple) -> Battle:
+        """ Returns the battle decoded from a snapshot, with a RandomStream in state."""
+        from random_stream import RandomStream
+        rng = RandomStream()
+        rng.setstate(state)
+        return decode_battle(data, rng)
+
+    def test_team(self):
+        """ Tests every container's team decodes to the same pokemons, in the same order."""
+        for battle_mode, container_class, team_limit in ((0, ArrayStack, PokeTeam.LIMIT),
+                                                          (1, CircularQueue, PokeTeam.LIMIT),
+                                                          (2, ArraySortedList, PokeTeam.LIMIT),
+                                                          (2, HeapSortedList, 160)):
+            battle = self.set_up(0, battle_mode, [60, 50, 40, 1] if team_limit > PokeTeam.LIMIT else [2, 1, 2, 1],
+                                 [1, 2, 3], "lvl", "hp", team_limit)
+            team = battle.team1
+            self.assertIs(type(team.team), container_class)
+            data = encode_team(team)
+            decoded = decode_team(data)
+            self.assertIs(type(decoded.team), container_class)
+            self.assertEqual(decoded.trainer, team.trainer)
+            self.assertEqual(len(decoded.team), len(team.team))
+            self.assertEqual(str(decoded), str(team))
+            self.assertEqual(encode_team(decoded), data)
+
+    def test_battle(self):
+        """ Tests a battle snapshotted mid-fight encodes the same again once decoded and fights on as the original."""
+        locations = set()
+        held = 0
+        for seed in range(20):
+            for matchup in self.BATTLES[:4] + (self.BATTLES[4],) * (seed < 2):
+                battle = self.set_up(seed, *matchup)
+                snapshots = []
+
+                def holding(pokemon, team):
+                    # Only called in trusted battles when a MissingNo is held back, in the middle of next_exchange()
+                    Battle.returning(battle, pokemon, team)
+                    snapshots.append((encode_battle(battle), battle.rng.getstate()))
+                    # The item held is a new one, so the pokemon sent out is only found in the slot if set there
+                    out = (battle.pokemon1, battle.pokemon2)
+                    if battle.missingno1 is not None and len(battle.missingno1) > 0:
+                        battle.pokemon1 = battle.missingno1[0]
+                    if battle.missingno2 is not None and len(battle.missingno2) > 0:
+                        battle.pokemon2 = battle.missingno2[0]
+                    snapshots.append((encode_battle(battle), battle.rng.getstate()))
+                    battle.pokemon1, battle.pokemon2 = out
+                battle.returning = holding
+                compare_speed = battle.start_fight()
+                while not battle.is_over():
+                    battle.next_exchange(compare_speed)
+                    snapshots.append((encode_battle(battle), battle.rng.getstate()))
+                winner = battle.get_result()
+                final = encode_battle(battle)
+                for data, state in snapshots:
+                    header = BATTLE.unpack_from(data, 0)
+                    locations.update((header[7], header[9]))
+                    held += header[11] + header[12]
+                    decoded = self.decode(data, state)
+                    self.assertEqual(encode_battle(decoded), data)
+                    compare_speed = decoded.start_fight()
+                    while not decoded.is_over():
+                        decoded.next_exchange(compare_speed)
+                    self.assertEqual(decoded.get_result(), winner)
+                    self.assertEqual(decoded.exchanges, battle.exchanges)
+                    self.assertEqual(encode_battle(decoded), final)
+        self.assertEqual(locations, {OUT_TEAM, OUT_SLOT, OUT_RECORD})
+        self.assertGreater(held, 0)
+
+    def test_bad_snapshot(self):
+        """ Tests snapshots with the wrong magic or version are rejected."""
+        battle = self.set_up(0, *self.BATTLES[0])
+        for data, decode in ((encode_team(battle.team1), decode_team), (encode_battle(battle), decode_battle)):
+            for offset, value in ((0, ord("X")), (2, VERSION + 1)):
+                corrupted = bytearray(data)
+                corrupted[offset] = value
+                self.assertRaises(ValueError, decode, corrupted)
+        self.assertRaises(ValueError, decode_team, encode_battle(battle))
+        self.assertRaises(ValueError, decode_battle, encode_team(battle.team1))
+
+
+if __name__ == '__main__':
+    testtorun = TestSnapshot()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
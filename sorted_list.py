@@ -6,6 +6,7 @@
 
 from abc import ABC, abstractmethod
 from typing import TypeVar, Generic
+from stream_writer import write_value, to_string
 T = TypeVar('T')
 K = TypeVar('K')
 
@@ -15,12 +16,39 @@ __docformat__ = 'reStructuredText'
 
 class ListItem(Generic[T, K]):
     """ Items to be stored in a list, including the value and the key used for sorting. """
+    __slots__ = ('value', 'key')
+
     def __init__(self, value: T, key: int):
         self.value = value
         self.key = key
 
+    def write(self, sink) -> None:
+        """ Writes the item to a sink as (value, key). """
+        sink.write('(')
+        write_value(self.value, sink)
+        sink.write(', ')
+        write_value(self.key, sink)
+        sink.write(')')
+
     def __str__(self) -> str:
-        return '({0}, {1})'.format(self.value, self.key)
+        return to_string(self)
+
+
+class KeyedListItem(ListItem[T, K]):
+    """ ListItem whose key is worked out from its value by a key function, so it can be brought up to date with
+        refresh_key() when the value changes. The key is changed in place, so an item already in a list has to be
+        re-placed in it afterwards.
+    """
+    __slots__ = ('key_function',)
+
+    def __init__(self, value: T, key_function, key: int = None):
+        """ Works out the key from the value, unless a key is given. """
+        ListItem.__init__(self, value, key_function(value) if key is None else key)
+        self.key_function = key_function
+
+    def refresh_key(self) -> None:
+        """ Works out the key again from the value. """
+        self.key = self.key_function(self.value)
 
 
 class SortedList(ABC, Generic[T]):
@@ -45,15 +73,24 @@ class SortedList(ABC, Generic[T]):
         """ Return the size of the list. """
         return self.length
 
-    def __str__(self) -> str:
-        """ Magic method constructing a string representation of the list object. """
-        result = '['
+    def write(self, sink) -> None:
+        """ Writes the list to a sink in the same form as __str__(), one item at a time. """
+        sink.write('[')
         for i in range(len(self)):
             if i > 0:
-                result += ', '
-            result += str(self[i]) if type(self[i]) != str else "'{0}'".format(self[i])
-        result += ']'
-        return result
+                sink.write(', ')
+            item = self[i]
+            if type(item) == str:
+                sink.write("'")
+                sink.write(item)
+                sink.write("'")
+            else:
+                write_value(item, sink)
+        sink.write(']')
+
+    def __str__(self) -> str:
+        """ Magic method constructing a string representation of the list object. """
+        return to_string(self)
 
     @abstractmethod
     def delete_at_index(self, index: int) -> ListItem:
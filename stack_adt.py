@@ -7,9 +7,11 @@ __author__ = "Maria Garcia de la Banda for the base"+"XXXXX student for"
 __docformat__ = 'reStructuredText'
 
 import unittest
+from io import StringIO
 from abc import ABC, abstractmethod 
 from typing import TypeVar, Generic
 from referential_array import ArrayR, T
+from stream_writer import write_value, to_string
 
 
 class Stack(ABC, Generic[T]):
@@ -91,6 +93,35 @@ class ArrayStack(Stack[T]):
         self.length -= 1
         return self.array[self.length]
 
+    def push_many(self, items: list) -> None:
+        """ Pushes every element of the list in order, so the last one ends up on top.
+        :pre: stack has room for every element
+        :raises Exception: if the stack doesn't have room for every element
+        :complexity: O(len(items)) for best/worst case, as the elements are copied in one block
+        """
+        count = len(items)
+        if self.length + count > len(self.array):
+            raise Exception("Stack is full")
+        self.array[self.length:self.length + count] = items
+        self.length += count
+
+    def pop_many(self, count: int) -> list:
+        """ Pops count elements from the top of the stack.
+        :return: a list of the popped elements, in the order pop() would return them
+        :pre: stack has at least count elements
+        :raises ValueError: if count is negative
+        :raises Exception: if the stack has less than count elements
+        :complexity: O(count) for best/worst case, as the elements are copied in one block
+        """
+        if count < 0:
+            raise ValueError("Count must not be negative")
+        elif count > self.length:
+            raise Exception("Stack is empty")
+        items = self.array[self.length - count:self.length]
+        items.reverse()
+        self.length -= count
+        return items
+
     def peek(self) -> T:
         """ Returns the element at the top, without popping it from stack.
         :pre: stack is not empty
@@ -101,16 +132,110 @@ class ArrayStack(Stack[T]):
         return self.array[self.length-1]
 
     # self added function
+    def write(self, sink) -> None:
+        """
+        Writes all the elements in the stack to a sink, from the top to the bottom with commas between them,
+        without building a string for the whole stack
+        :param sink: An object with a write(string) method, such as an open file or an io.StringIO
+        :complexity: Best and worst is O(length)
+        """
+        for i in range(self.length - 1, -1, -1):  # Loops through the stack from the top
+            if i < self.length - 1:
+                sink.write(", ")
+            write_value(self.array[i], sink)
+
     def __str__(self) -> str:
         """
         Returns all the elements in the stack as a String.
         :return: A string of all the elements in the stack
-        :complexity: Best and worst is O(length)
+        :complexity: Best and worst is O(length) following write()
+        """
+        return to_string(self)
+
+
+class DynamicArrayStack(ArrayStack[T]):
+    """ Implementation of a stack with an array that grows and shrinks.
+
+    The array doubles when a push finds it full and halves when a pop leaves it a quarter full,
+    so push and pop are amortised O(1) and the stack is never full.
+    """
+    GROWTH_FACTOR = 2
+    SHRINK_RATIO = 4
+
+    def __init__(self, max_capacity: int = ArrayStack.MIN_CAPACITY) -> None:
+        """ Initialises the length and the array with the given starting capacity,
+            which is also the smallest the array shrinks to.
         """
-        lst = []
-        for i in range(len(self)):  # Loops through the stack
-            lst.append(str(self.array[self.length - 1 - i]))  # Appends the elements in the stack to the list
-        return ", ".join(lst)  # Return a string format with commas between each element
+        ArrayStack.__init__(self, max_capacity)
+        self.min_capacity = len(self.array)
+
+    def _resize(self, capacity: int) -> None:
+        """ Moves the elements into a new array of the given capacity.
+        :complexity: O(capacity) for best/worst case to initialise the new array
+        :pre: capacity >= len(self)
+        """
+        self.array = self.array.copy(capacity, self.length)
+
+    def is_full(self) -> bool:
+        """ False, as the array grows when an element is pushed to a full array. """
+        return False
+
+    def push(self, item: T) -> None:
+        """ Pushes an element to the top of the stack, doubling the array if it is full.
+        :complexity: O(1) amortised, O(len(self)) when the array grows
+        """
+        if self.length == len(self.array):
+            self._resize(self.GROWTH_FACTOR * len(self.array))
+        self.array[self.length] = item
+        self.length += 1
+
+    def pop(self) -> T:
+        """ Pops the element at the top of the stack, halving the array once it is a quarter full.
+        :pre: stack is not empty
+        :raises Exception: if the stack is empty
+        :complexity: O(1) amortised, O(len(self)) when the array shrinks
+        """
+        if self.is_empty():
+            raise Exception("Stack is empty")
+        self.length -= 1
+        item = self.array[self.length]
+        self.array[self.length] = None  # Drops the reference so the element can be freed
+        if self.length * self.SHRINK_RATIO <= len(self.array) and len(self.array) > self.min_capacity:
+            self._resize(max(self.min_capacity, len(self.array) // self.GROWTH_FACTOR))
+        return item
+
+    def push_many(self, items: list) -> None:
+        """ Pushes every element of the list in order, growing the array once if they don't fit.
+        :complexity: O(len(items)) amortised, O(len(self) + len(items)) when the array grows
+        """
+        capacity = len(self.array)
+        while capacity < self.length + len(items):
+            capacity *= self.GROWTH_FACTOR
+        if capacity > len(self.array):
+            self._resize(capacity)
+        ArrayStack.push_many(self, items)
+
+    def pop_many(self, count: int) -> list:
+        """ Pops count elements from the top of the stack, shrinking the array once if it is left a quarter full.
+        :return: a list of the popped elements, in the order pop() would return them
+        :pre: stack has at least count elements
+        :raises ValueError: if count is negative
+        :raises Exception: if the stack has less than count elements
+        :complexity: O(count) amortised, O(len(self)) when the array shrinks
+        """
+        items = ArrayStack.pop_many(self, count)
+        self.array[self.length:self.length + count] = [None] * count  # Drops the references
+        capacity = len(self.array)
+        while self.length * self.SHRINK_RATIO <= capacity and capacity > self.min_capacity:
+            capacity = max(self.min_capacity, capacity // self.GROWTH_FACTOR)
+        if capacity < len(self.array):
+            self._resize(capacity)
+        return items
+
+    def clear(self) -> None:
+        """ Clears all elements from the stack and shrinks the array back to its starting capacity. """
+        Stack.clear(self)
+        self.array = ArrayR(self.min_capacity)
 
 
 class TestStack(unittest.TestCase):
@@ -191,12 +316,91 @@ class TestStack(unittest.TestCase):
             for i in range(nitems-1, -1, -1):
                 self.assertEqual(stack.pop(), i)
                 
+    def test_push_many_and_pop_many(self):
+        for stack, length in zip(self.stacks, self.lengths):
+            stack.push_many(list(range(length, length + self.ROOMY)))
+            self.assertEqual(len(stack), length + self.ROOMY)
+            self.assertEqual(stack.peek(), length + self.ROOMY - 1)
+            self.assertEqual(stack.pop_many(self.ROOMY), list(range(length + self.ROOMY - 1, length - 1, -1)))
+            self.assertEqual(len(stack), length)
+        self.assertRaises(Exception, self.empty_stack.pop_many, 1)
+        self.assertRaises(Exception, self.large_stack.push_many, list(range(self.CAPACITY)))
+        self.assertEqual(len(self.large_stack), self.LARGE)
+        self.assertRaises(ValueError, self.roomy_stack.pop_many, -2)
+        self.assertEqual(len(self.roomy_stack), self.ROOMY)
+        self.assertEqual(self.roomy_stack.pop_many(0), [])
+
+    def test_write(self):
+        """ Tests writing to a sink gives the same string as str(), from the top of the stack."""
+        for stack in self.stacks:
+            sink = StringIO()
+            stack.write(sink)
+            self.assertEqual(sink.getvalue(), str(stack))
+        self.assertEqual(str(self.roomy_stack), "4, 3, 2, 1, 0")
+
     def test_clear(self):
         for stack in self.stacks:
             stack.clear()
             self.assertEqual(len(stack), 0)
             self.assertTrue(stack.is_empty())
 
+
+class TestDynamicArrayStack(unittest.TestCase):
+    """ Tests for the growable stack."""
+    START = 2
+    COUNT = 100
+
+    def setUp(self):
+        self.stack = DynamicArrayStack(self.START)
+
+    def test_grow(self):
+        """ Tests pushing past the starting capacity doubles the array."""
+        for i in range(self.COUNT):
+            self.stack.push(i)
+        self.assertEqual(len(self.stack), self.COUNT)
+        self.assertFalse(self.stack.is_full())
+        self.assertEqual(len(self.stack.array), 128)
+        self.assertEqual(self.stack.peek(), self.COUNT - 1)
+
+    def test_push_and_pop(self):
+        for i in range(self.COUNT):
+            self.stack.push(i)
+        for i in range(self.COUNT - 1, -1, -1):
+            self.assertEqual(self.stack.pop(), i)
+        self.assertTrue(self.stack.is_empty())
+        self.assertRaises(Exception, self.stack.pop)
+
+    def test_shrink(self):
+        """ Tests popping shrinks the array, but never below the starting capacity."""
+        for i in range(self.COUNT):
+            self.stack.push(i)
+        while len(self.stack) > 10:
+            self.stack.pop()
+        self.assertLessEqual(len(self.stack.array), 4 * 10)
+        while not self.stack.is_empty():
+            self.stack.pop()
+        self.assertEqual(len(self.stack.array), self.START)
+
+    def test_push_many_and_pop_many(self):
+        """ Tests bulk pushes grow the array once and bulk pops shrink it."""
+        self.stack.push(0)
+        self.stack.push_many(list(range(1, self.COUNT)))
+        self.assertEqual(len(self.stack.array), 128)
+        self.assertEqual(self.stack.pop_many(self.COUNT - 10), list(range(self.COUNT - 1, 9, -1)))
+        self.assertLessEqual(len(self.stack.array), 4 * 10)
+        self.assertRaises(ValueError, self.stack.pop_many, -2)
+        self.assertEqual(len(self.stack), 10)
+        self.assertEqual(self.stack.pop_many(10), list(range(9, -1, -1)))
+        self.assertEqual(len(self.stack.array), self.START)
+
+    def test_clear(self):
+        for i in range(self.COUNT):
+            self.stack.push(i)
+        self.stack.clear()
+        self.assertTrue(self.stack.is_empty())
+        self.assertEqual(len(self.stack.array), self.START)
+
+
 if __name__ == '__main__':
     testtorun = TestStack()
     suite = unittest.TestLoader().loadTestsFromModule(testtorun)
@@ -0,0 +1,33 @@
+"""
+Functions for writing pokemons, sorted list items and containers straight to a file-like sink, such as an open file
+or an io.StringIO, instead of building a string for every element first
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from io import StringIO
+
+
+def write_value(value, sink) -> None:
+    """
+    Writes a value to the sink, streamed through its own write() method if it has one
+    :param value: A pokemon, ListItem, container or any other value, written as str(value) if it can't stream itself
+    :param sink: An object with a write(string) method
+    :complexity: Best and worst is O(1) for a pokemon, otherwise it follows the value's write() or __str__() method
+    """
+    write = getattr(value, "write", None)
+    if write is None:
+        sink.write(str(value))
+    else:
+        write(sink)
+
+
+def to_string(value) -> str:
+    """
+    Returns what value.write() writes, so __str__() methods can be built on their write() method
+    :param value: An object with a write(sink) method
+    :return: A string of everything written
+    :complexity: Same as value.write()
+    """
+    sink = StringIO()
+    value.write(sink)
+    return sink.getvalue()
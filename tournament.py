@@ -0,0 +1,177 @@
+"""
+Class where every allowed team composition battles every other one across a pool of processes
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from batch_battle import BatchBattle
+from poke_team import PokeTeam
+from random_stream import RandomStream
+from multiprocessing import Pool
+
+TEAM_ONE = "1"
+TEAM_TWO = "2"
+DRAW = "Draw"
+
+
+def all_compositions() -> list:
+    """
+    Returns every team composition allowed by PokeTeam.LIMIT and PokeTeam.MISSINGNO_MAX
+    :return: A list of head counts, [C, B, S] without a MissingNo and [C, B, S, M] with MissingNo
+    :complexity: Best and worst is O(LIMIT^3) as every combination of Charmander, Bulbasaur and Squirtle is tried
+    """
+    compositions = []
+    for missi in (0, PokeTeam.MISSINGNO_MAX):
+        for charm in range(PokeTeam.LIMIT + 1):
+            for bulb in range(PokeTeam.LIMIT + 1 - charm):
+                for squir in range(PokeTeam.LIMIT + 1 - charm - bulb):
+                    if missi == 0 and charm + bulb + squir > 0:
+                        compositions.append([charm, bulb, squir])
+                    elif missi > 0 and charm + bulb + squir + missi <= PokeTeam.LIMIT:
+                        compositions.append([charm, bulb, squir, missi])
+    return compositions
+
+
+def play_shard(shard: tuple) -> list:
+    """
+    Plays every matchup in a shard with a RandomStream seeded with the shard's seed, so a shard always produces
+    the same results no matter which process runs it
+    :param shard: A tuple of (seed, matchups, compositions, battles, criterion_team1, criterion_team2), where
+                  matchups is a list of (battle_mode, index of team 1, index of team 2)
+    :return: A list of (battle_mode, index of team 1, index of team 2, team 1 wins, team 2 wins, draws)
+    :complexity: Best and worst is O(len(matchups) * battles * B), where B is the complexity of a single battle
+    """
+    seed, matchups, compositions, battles, criterion_team1, criterion_team2 = shard
+    batch = BatchBattle(TEAM_ONE, TEAM_TWO, rng=RandomStream(seed))
+    results = []
+    for battle_mode, team1, team2 in matchups:
+        result = batch.run(battle_mode, compositions[team1], compositions[team2], battles,
+                           criterion_team1, criterion_team2)
+        results.append((battle_mode, team1, team2,
+                        result.get_wins(TEAM_ONE), result.get_wins(TEAM_TWO), result.get_wins(DRAW)))
+    return results
+
+
+class TournamentResult:
+    def __init__(self, compositions: list, battle_modes: list, battles: int) -> None:
+        """
+        Constructor for TournamentResult, the merged win counts of a tournament
+        :param compositions: A list of the head counts that took part
+        :param battle_modes: A list of the battle modes that were played
+        :param battles: An integer of how many battles were played per matchup
+        :complexity: Best and worst is O(len(battle_modes) * len(compositions)^2) to initialise the matrices
+        """
+        self.compositions = compositions
+        self.battle_modes = battle_modes
+        self.battles = battles
+        size = len(compositions)
+        # wins[battle_mode][i][j] is how many times composition i won as team 1 against composition j as team 2
+        self.wins = {mode: [[0] * size for _ in range(size)] for mode in battle_modes}
+        self.draws = {mode: [[0] * size for _ in range(size)] for mode in battle_modes}
+
+    def merge(self, shard_results: list) -> None:
+        """
+        Adds the results of a played shard to the matrices
+        :param shard_results: A list returned by play_shard()
+        :complexity: Best and worst is O(len(shard_results))
+        """
+        for battle_mode, team1, team2, team1_wins, team2_wins, draws in shard_results:
+            self.wins[battle_mode][team1][team2] += team1_wins
+            self.draws[battle_mode][team1][team2] += draws
+
+    def win_rate(self, battle_mode: int, team1: int, team2: int) -> float:
+        """
+        Returns the fraction of battles composition team1 won as team 1 against composition team2
+        :param battle_mode: An integer of the battle mode
+        :param team1: An integer index of the composition playing as team 1
+        :param team2: An integer index of the composition playing as team 2
+        :return: A float between 0 and 1
+        :complexity: Best and worst is O(1)
+        """
+        return self.wins[battle_mode][team1][team2] / self.battles
+
+    def win_rate_matrix(self, battle_mode: int) -> list:
+        """
+        Returns the win rate of every composition as team 1 against every composition as team 2
+        :param battle_mode: An integer of the battle mode
+        :return: A list of lists of floats, indexed like self.compositions
+        :complexity: Best and worst is O(len(self.compositions)^2)
+        """
+        return [[wins / self.battles for wins in row] for row in self.wins[battle_mode]]
+
+
+class Tournament:
+    def __init__(self, compositions: list = None, battle_modes: list = None, battles: int = 1,
+                 criterion_team1: str = "lvl", criterion_team2: str = "lvl", seed: int = 0,
+                 shard_size: int = 256) -> None:
+        """
+        Constructor for Tournament
+        :param compositions: A list of head counts to play, every allowed composition if None
+        :param battle_modes: A list of battle modes to play, all three if None
+        :param battles: An integer of how many battles to play per matchup
+        :param criterion_team1: A string of the criterion for team 1 in battle mode 2
+        :param criterion_team2: A string of the criterion for team 2 in battle mode 2
+        :param seed: An integer the seed of every shard is derived from
+        :param shard_size: An integer of how many matchups are played per shard
+        :raises ValueError: If battles or shard_size is lesser than or equal to 0,
+                            or if a composition isn't a valid team
+        :complexity: Best and worst is O(len(compositions)) as every composition is checked
+        """
+        if battles <= 0:
+            raise ValueError("Number of battles must be above 0")
+        elif shard_size <= 0:
+            raise ValueError("Shard size must be above 0")
+        self.compositions = all_compositions() if compositions is None else compositions
+        checker = PokeTeam(TEAM_ONE)
+        for composition in self.compositions:
+            if not checker.is_valid_head_count(composition):
+                raise ValueError("Team input {} is invalid".format(composition))
+        self.battle_modes = [0, 1, 2] if battle_modes is None else battle_modes
+        self.battles = battles
+        self.criterion_team1 = criterion_team1
+        self.criterion_team2 = criterion_team2
+        self.seed = seed
+        self.shard_size = shard_size
+
+    def get_shards(self) -> list:
+        """
+        Splits every matchup into shards of shard_size matchups. Shard boundaries and seeds only depend on the
+        tournament's settings, never on the number of processes, so results are reproducible
+        :return: A list of shards that can be passed to play_shard()
+        :complexity: Best and worst is O(len(battle_modes) * len(compositions)^2)
+        """
+        matchups = [(battle_mode, team1, team2)
+                    for battle_mode in self.battle_modes
+                    for team1 in range(len(self.compositions))
+                    for team2 in range(len(self.compositions))]
+        shards = []
+        for shard_index, start in enumerate(range(0, len(matchups), self.shard_size)):
+            shards.append((self.seed + shard_index, matchups[start:start + self.shard_size], self.compositions,
+                           self.battles, self.criterion_team1, self.criterion_team2))
+        return shards
+
+    def run(self, processes: int = None) -> TournamentResult:
+        """
+        Plays every shard on a pool of processes and merges the results
+        :param processes: An integer of worker processes, the number of CPUs if None, or no pool at all if 1
+        :return: A TournamentResult of the merged results
+        :complexity: Best and worst is O(len(battle_modes) * len(compositions)^2 * battles * B / processes),
+                     where B is the complexity of a single battle
+        """
+        result = TournamentResult(self.compositions, self.battle_modes, self.battles)
+        shards = self.get_shards()
+        if processes == 1:
+            # Plays in this process, useful for debugging and profiling
+            for shard in shards:
+                result.merge(play_shard(shard))
+        else:
+            with Pool(processes) as pool:
+                for shard_results in pool.imap_unordered(play_shard, shards):
+                    result.merge(shard_results)
+        return result
+
+
+if __name__ == '__main__':
+    from time import perf_counter
+    start = perf_counter()
+    tournament_result = Tournament().run()
+    print("{} compositions played in {:.2f}s".format(len(tournament_result.compositions), perf_counter() - start))
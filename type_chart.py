@@ -0,0 +1,108 @@
+"""
+Type effectiveness shared by all pokemons and a precomputed table of the hp lost to every attack
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+
+FIRE = 0
+GRASS = 1
+WATER = 2
+NONE = 3
+
+# Every pokemon type is interned to an integer id, the built in types are interned first so their ids are fixed
+TYPE_IDS = {"Fire": FIRE, "Grass": GRASS, "Water": WATER, "None": NONE}
+
+# EFFECTIVENESS[attacker type id][defender type id] is the multiplier applied to the attacker's attack damage
+EFFECTIVENESS = [[1.0, 2.0, 0.5, 1.0],  # Fire attacking Fire, Grass, Water, None
+                 [0.5, 1.0, 2.0, 1.0],  # Grass attacking Fire, Grass, Water, None
+                 [2.0, 0.5, 1.0, 1.0],  # Water attacking Fire, Grass, Water, None
+                 [1.0, 1.0, 1.0, 1.0]]  # None attacking Fire, Grass, Water, None
+
+
+def get_type_id(poke_type: str) -> int:
+    """
+    Returns the id of a pokemon type, interning it if it hasn't been seen before
+    :param poke_type: A string of the pokemon's type
+    :return: An integer id of the type
+    :complexity: Best and worst is O(1) as it looks up or adds an entry in a dictionary
+    """
+    return TYPE_IDS.setdefault(poke_type, len(TYPE_IDS))
+
+
+def get_effectiveness(attacker_type_id: int, defender_type_id: int) -> float:
+    """
+    Returns the multiplier of an attack from one type against another. Types without an entry are neutral
+    :param attacker_type_id: An integer id of the attacking pokemon's type
+    :param defender_type_id: An integer id of the defending pokemon's type
+    :return: A float of 0.5, 1.0 or 2.0
+    :complexity: Best and worst is O(1) as it indexes the matrix
+    """
+    if attacker_type_id < len(EFFECTIVENESS) and defender_type_id < len(EFFECTIVENESS):
+        return EFFECTIVENESS[attacker_type_id][defender_type_id]
+    return 1.0
+
+
+class DamageTable:
+    MAX_LEVEL = 32
+    PROBE_HP = 1000
+
+    def __init__(self, attackers: list, defenders: list) -> None:
+        """
+        Constructor for DamageTable. The hp lost by every defender species at every level to every attacker species
+        at every level is worked out once with the pokemon's own update_health(), so lookups match it exactly
+        :param attackers: A list of pokemon classes that can attack, indexed by their SPECIES_ID
+        :param defenders: A list of pokemon classes that can defend, indexed by their SPECIES_ID. Their update_health()
+                          must be deterministic
+        :complexity: Best and worst is O(len(attackers) * len(defenders) * MAX_LEVEL^2)
+        """
+        self.attacker_count = len(attackers)
+        self.defender_count = len(defenders)
+        self.hp_loss = []
+        for attacker_class in attackers:
+            attacker = attacker_class()
+            for attacker_level in range(1, DamageTable.MAX_LEVEL + 1):
+                attacker.set_level(attacker_level)
+                for defender_class in defenders:
+                    defender = defender_class()
+                    damage = attacker.get_attack_damage() * get_effectiveness(attacker.type_id, defender.type_id)
+                    for defender_level in range(1, DamageTable.MAX_LEVEL + 1):
+                        # Hp is high enough for no attack to make the defender faint, so the whole loss is seen
+                        defender.set_level(defender_level)
+                        defender.set_hp(DamageTable.PROBE_HP)
+                        defender.update_health(damage)
+                        self.hp_loss.append(DamageTable.PROBE_HP - defender.get_hp())
+
+    def get_hp_loss(self, attacker, defender) -> int:
+        """
+        Returns how much hp the defender loses when attacked by the attacker, before being capped at its hp
+        :param attacker: A pokemon object that is attacking
+        :param defender: A pokemon object that is defending
+        :return: An integer of the hp lost, or None if either pokemon or their levels aren't in the table
+        :complexity: Best and worst is O(1) as it indexes the table
+        """
+        attacker_species = attacker.SPECIES_ID
+        defender_species = defender.SPECIES_ID
+        if attacker_species is None or defender_species is None or \
+                attacker_species >= self.attacker_count or defender_species >= self.defender_count or \
+                attacker.level > DamageTable.MAX_LEVEL or defender.level > DamageTable.MAX_LEVEL:
+            return None
+        return self.hp_loss[((attacker_species * DamageTable.MAX_LEVEL + attacker.level - 1) * self.defender_count
+                             + defender_species) * DamageTable.MAX_LEVEL + defender.level - 1]
+
+
+damage_table = None
+
+
+def get_damage_table() -> DamageTable:
+    """
+    Returns the damage table shared by all pokemons, built on first use since it needs the pokemon classes
+    :return: The shared DamageTable
+    :complexity: Best is O(1) once built. Worst is the complexity of building the DamageTable on the first call
+    """
+    global damage_table
+    if damage_table is None:
+        from pokemon import Charmander, Bulbasaur, Squirtle
+        from MissingNo import MissingNo
+        # MissingNo only attacks in the table as its defence is random
+        damage_table = DamageTable([Charmander, Bulbasaur, Squirtle, MissingNo], [Charmander, Bulbasaur, Squirtle])
+    return damage_table
@@ -0,0 +1,240 @@
+"""
+Class where a batch of battles in battle mode 0 or 1 is advanced one exchange at a time with NumPy arrays
+Author: Wah Yang Tan, Po Han Tay, Jun Heng Tan, Guan Yan Tan
+Last Modified: 17.10.2026
+"""
+from pokemon import Charmander, Bulbasaur, Squirtle
+from type_chart import EFFECTIVENESS, FIRE, WATER
+import numpy as np
+import unittest
+
+CHARMANDER = 0
+BULBASAUR = 1
+SQUIRTLE = 2
+DRAW = 0
+
+# Type multiplier of an attacker species (row) against a defender species (column), doubled so that damage
+# stays an integer. Damage in pokemon.py is a float that is always a multiple of 0.5.
+# Species ids follow the Fire, Grass and Water type ids of Charmander, Bulbasaur and Squirtle
+EFFECTIVENESS_X2 = (2 * np.array(EFFECTIVENESS)[FIRE:WATER + 1, FIRE:WATER + 1]).astype(np.int32)
+
+
+def get_attack_damage(species: np.ndarray, level: np.ndarray) -> np.ndarray:
+    """
+    Returns the attack damage of every pokemon, following get_attack_damage() in pokemon.py
+    :complexity: Best and worst is O(len(species))
+    """
+    return np.where(species == CHARMANDER, Charmander.ATTACK + level,
+                    np.where(species == BULBASAUR, Bulbasaur.ATTACK, Squirtle.ATTACK + level // 2))
+
+
+def get_speed(species: np.ndarray, level: np.ndarray) -> np.ndarray:
+    """
+    Returns the speed of every pokemon, following get_speed() in pokemon.py
+    :complexity: Best and worst is O(len(species))
+    """
+    return np.where(species == CHARMANDER, Charmander.SPEED + level,
+                    np.where(species == BULBASAUR, Bulbasaur.SPEED + level // 2, Squirtle.SPEED))
+
+
+def get_threshold_x2(species: np.ndarray, level: np.ndarray) -> np.ndarray:
+    """
+    Returns twice the damage above which every pokemon takes full damage, following update_health() in pokemon.py
+    :complexity: Best and worst is O(len(species))
+    """
+    return np.where(species == CHARMANDER, 2 * Charmander.DEFENCE,
+                    np.where(species == BULBASAUR, 2 * (Bulbasaur.DEFENCE + 5), 4 * (Squirtle.DEFENCE + level)))
+
+
+def get_damage(hp: np.ndarray, attacker: np.ndarray, attacker_level: np.ndarray,
+               defender: np.ndarray, defender_level: np.ndarray) -> np.ndarray:
+    """
+    Returns the hp of every defending pokemon after being attacked, following get_damage() and update_health()
+    in pokemon.py. With the doubled damage D, a full hit takes ceil(D / 2) hp and a blocked hit takes
+    floor(D / 4) hp, which is what int(hp - damage) and hp - damage // 2 give on the float damage
+    :complexity: Best and worst is O(len(hp))
+    """
+    damage_x2 = get_attack_damage(attacker, attacker_level) * EFFECTIVENESS_X2[attacker, defender]
+    loss = np.where(damage_x2 > get_threshold_x2(defender, defender_level), (damage_x2 + 1) // 2, damage_x2 // 4)
+    return np.maximum(hp - loss, 0)
+
+
+class VectorBattle:
+    def __init__(self, battle_mode: int, team1_head_counts: list, team2_head_counts: list) -> None:
+        """
+        Constructor for VectorBattle. Battle i is between team1_head_counts[i] and team2_head_counts[i]
+        :param battle_mode: An integer that determines the type of battle
+        :param team1_head_counts: A list of [C, B, S] head counts for team 1 of every battle
+        :param team2_head_counts: A list of [C, B, S] head counts for team 2 of every battle
+        :raises ValueError: If battle_mode isn't 0 or 1,
+                            or both lists aren't the same length,
+                            or a head count includes a MissingNo, whose randomness can't match the Battle class
+        :complexity: Best and worst is O(B * LIMIT), where B is the number of battles
+        """
+        if battle_mode not in (0, 1):
+            raise ValueError("Battle mode input must be 0 or 1")
+        elif len(team1_head_counts) != len(team2_head_counts):
+            raise ValueError("Both teams must have a head count for every battle")
+        self.battle_mode = battle_mode
+        battles = len(team1_head_counts)
+        width = max(sum(head_count[:3]) for head_count in list(team1_head_counts) + list(team2_head_counts))
+
+        # Index 0 is team 1 and index 1 is team 2
+        self.species = np.zeros((2, battles, width), dtype=np.int32)
+        self.hp = np.zeros((2, battles, width), dtype=np.int32)
+        self.level = np.ones((2, battles, width), dtype=np.int32)
+        self.length = np.zeros((2, battles), dtype=np.int32)
+        self.capacity = np.ones((2, battles), dtype=np.int32)
+        self.front = np.zeros((2, battles), dtype=np.int32)
+        self.exchanges = np.zeros(battles, dtype=np.int32)
+
+        hps = (Charmander().get_hp(), Bulbasaur().get_hp(), Squirtle().get_hp())
+        for team, head_counts in enumerate((team1_head_counts, team2_head_counts)):
+            for battle, head_count in enumerate(head_counts):
+                if len(head_count) == 4 and head_count[3] > 0:
+                    raise ValueError("MissingNo can't be simulated by VectorBattle")
+                # Stacks are pushed Squirtle first so Charmanders are on top, queues are appended Charmander first
+                order = (SQUIRTLE, BULBASAUR, CHARMANDER) if battle_mode == 0 else (CHARMANDER, BULBASAUR, SQUIRTLE)
+                slot = 0
+                for species in order:
+                    for i in range(head_count[species]):
+                        self.species[team, battle, slot] = species
+                        self.hp[team, battle, slot] = hps[species]
+                        slot += 1
+                self.length[team, battle] = slot
+                self.capacity[team, battle] = max(1, slot)
+
+    def step(self) -> int:
+        """
+        Advances every battle that still has pokemons on both teams by one exchange, as one compare_speed() call
+        in the Battle class would
+        :return: An integer of how many battles were advanced
+        :complexity: Best and worst is O(B), where B is the number of battles
+        """
+        active = np.flatnonzero((self.length[0] > 0) & (self.length[1] > 0))
+        if active.size == 0:
+            return 0
+
+        # Take out the pokemon on top of the stack or at the front of the queue of both teams
+        if self.battle_mode == 0:
+            slot = self.length[:, active] - 1
+        else:
+            slot = self.front[:, active]
+        species1 = self.species[0, active, slot[0]]
+        species2 = self.species[1, active, slot[1]]
+        hp1 = self.hp[0, active, slot[0]]
+        hp2 = self.hp[1, active, slot[1]]
+        level1 = self.level[0, active, slot[0]]
+        level2 = self.level[1, active, slot[1]]
+        self.length[:, active] -= 1
+        if self.battle_mode == 1:
+            self.front[:, active] = (slot + 1) % self.capacity[:, active]
+
+        # The faster pokemon attacks first and the slower one only strikes back if it didn't faint,
+        # pokemons with the same speed attack simultaneously
+        speed1 = get_speed(species1, level1)
+        speed2 = get_speed(species2, level2)
+        attacked1 = get_damage(hp1, species2, level2, species1, level1)
+        attacked2 = get_damage(hp2, species1, level1, species2, level2)
+        hp1 = np.where((speed1 > speed2) & (attacked2 == 0), hp1, attacked1)
+        hp2 = np.where((speed2 > speed1) & (attacked1 == 0), hp2, attacked2)
+
+        # If neither fainted, both lose 1 HP
+        neither = (hp1 > 0) & (hp2 > 0)
+        hp1 = np.where(neither, hp1 - 1, hp1)
+        hp2 = np.where(neither, hp2 - 1, hp2)
+
+        # A pokemon that is still alive levels up if its opponent fainted, then returns to its team
+        alive1 = hp1 > 0
+        alive2 = hp2 > 0
+        level1 = level1 + (alive1 & ~alive2)
+        level2 = level2 + (alive2 & ~alive1)
+        for team, alive, species, hp, level in ((0, alive1, species1, hp1, level1),
+                                                (1, alive2, species2, hp2, level2)):
+            battles = active[alive]
+            if self.battle_mode == 0:
+                slot = self.length[team, battles]
+            else:
+                slot = (self.front[team, battles] + self.length[team, battles]) % self.capacity[team, battles]
+            self.species[team, battles, slot] = species[alive]
+            self.hp[team, battles, slot] = hp[alive]
+            self.level[team, battles, slot] = level[alive]
+            self.length[team, battles] += 1
+
+        self.exchanges[active] += 1
+        return active.size
+
+    def run(self) -> np.ndarray:
+        """
+        Advances every battle until one or both teams are empty
+        :return: An array of the winning team of every battle, 1 or 2, or 0 for a draw
+        :complexity: Best and worst is O(B * E), where E is the largest number of exchanges of a battle
+        """
+        while self.step() > 0:
+            pass
+        return self.get_winners()
+
+    def get_winners(self) -> np.ndarray:
+        """
+        Returns the winning team of every battle, following the end of Battle.fight()
+        :return: An array of 1 or 2 for the winning team, or 0 for a draw or an unfinished battle
+        :complexity: Best and worst is O(B)
+        """
+        empty1 = self.length[0] == 0
+        empty2 = self.length[1] == 0
+        return np.where(empty1 & ~empty2, 2, np.where(empty2 & ~empty1, 1, DRAW))
+
+
+class TestVectorBattle(unittest.TestCase):
+    """ Tests for the above class."""
+    WINNERS = {"Draw": DRAW, "Ash": 1, "Gary": 2}
+
+    def setUp(self):
+        # Every composition of 1 to 3 pokemons without MissingNo, and a few of 6, against each other
+        teams = [[charm, bulb, squir] for charm in range(4) for bulb in range(4) for squir in range(4)
+                 if 0 < charm + bulb + squir <= 3]
+        teams += [[2, 2, 2], [6, 0, 0], [1, 3, 2], [0, 1, 5]]
+        self.team1_head_counts = [team1 for team1 in teams for team2 in teams]
+        self.team2_head_counts = [team2 for team1 in teams for team2 in teams]
+
+    def get_members(self, battles: VectorBattle, team: int, battle: int) -> list:
+        """ Returns the [species, hp, level] of a team's pokemons, in the order they will be sent out."""
+        members = []
+        for i in range(battles.length[team, battle]):
+            if battles.battle_mode == 0:
+                slot = battles.length[team, battle] - 1 - i
+            else:
+                slot = (battles.front[team, battle] + i) % battles.capacity[team, battle]
+            members.append([battles.species[team, battle, slot], battles.hp[team, battle, slot],
+                            battles.level[team, battle, slot]])
+        return members
+
+    def test_run(self):
+        """ Tests every battle ends with the winner, exchanges and remaining teams of Battle.headless_battle()."""
+        from battle import Battle
+        for battle_mode in range(2):
+            battles = VectorBattle(battle_mode, self.team1_head_counts, self.team2_head_counts)
+            winners = battles.run()
+            self.assertEqual(battles.step(), 0)
+            for i in range(len(self.team1_head_counts)):
+                battle = Battle("Ash", "Gary")
+                winner = battle.headless_battle(battle_mode, self.team1_head_counts[i], self.team2_head_counts[i])
+                self.assertEqual(winners[i], self.WINNERS[winner])
+                self.assertEqual(battles.exchanges[i], battle.exchanges)
+                for team, poke_team in enumerate((battle.team1, battle.team2)):
+                    self.assertEqual(self.get_members(battles, team, i),
+                                     [[pokemon.SPECIES_ID, pokemon.hp, pokemon.level]
+                                      for pokemon in poke_team.get_members()])
+
+    def test_bad_input(self):
+        """ Tests MissingNo teams, battle mode 2 and head counts of different lengths are rejected."""
+        self.assertRaises(ValueError, VectorBattle, 0, [[1, 1, 1, 1]], [[1, 1, 1]])
+        self.assertRaises(ValueError, VectorBattle, 1, [[1, 1, 1], [1, 1, 1]], [[1, 1, 1], [0, 2, 0, 1]])
+        self.assertRaises(ValueError, VectorBattle, 2, [[1, 1, 1]], [[1, 1, 1]])
+        self.assertRaises(ValueError, VectorBattle, 0, [[1, 1, 1]], [[1, 1, 1], [1, 1, 1]])
+
+
+if __name__ == '__main__':
+    testtorun = TestVectorBattle()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)